@@ -1,8 +1,11 @@
 from fastapi import APIRouter
 
-from app.api import document_controller, retrieval_controller
+from app.api import document_controller, embedding_space_controller, metrics_controller, retrieval_controller, vector_index_controller
 
 router = APIRouter()
 
 router.include_router(document_controller.router, prefix="/documents")
-router.include_router(retrieval_controller.router, prefix="/retrieval")
\ No newline at end of file
+router.include_router(retrieval_controller.router, prefix="/retrieval")
+router.include_router(metrics_controller.router, prefix="/metrics")
+router.include_router(vector_index_controller.router, prefix="/admin/vector-indexes")
+router.include_router(embedding_space_controller.router, prefix="/admin/embedding-spaces")
\ No newline at end of file
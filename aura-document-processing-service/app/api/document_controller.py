@@ -1,12 +1,13 @@
-from fastapi import APIRouter, File, UploadFile, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 import logging
 
+from app.api.multipart_stream import MultipartStream
 from app.application.exceptions.exceptions import AppError
 from app.application.services.document_service import DocumentService
 from app.configuration.dependencies import get_db_session, get_document_service
 from app.domain.dtos.document_response import DocumentResponseSchema
-from app.domain.dtos.document_request import DocumentRequest
+from app.domain.dtos.rechunk_request import RechunkRequest
 
 
 logger = logging.getLogger(__name__)
@@ -16,17 +17,14 @@ router = APIRouter()
 
 class DocumentController:
     async def create(self,
-                              background_tasks: BackgroundTasks,
-                              request: DocumentRequest = Depends(DocumentRequest.as_form),
-                              file: UploadFile = File(...),
+                              request: Request,
                               document_service: DocumentService = Depends(get_document_service),
                               db: Session = Depends(get_db_session)) -> DocumentResponseSchema:
         try:
-            logger.info("Create document request received", extra={
-                "uploaded_filename": getattr(file, "filename", None),
-                "uploaded_content_type": getattr(file, "content_type", None)
-            })
-            document = await document_service.create(request, file, db, background_tasks)
+            # Sin parámetros File/Form: FastAPI no lee el cuerpo y el archivo se sube a medida que llega
+            form = MultipartStream(request)
+            logger.info("Create document request received", extra={"content_length": form.content_length})
+            document = await document_service.create(form.events(), db, content_length=form.content_length)
             logger.info("Create document succeeded", extra={"document_id": getattr(document, "id", None)})
             return document
 
@@ -49,5 +47,51 @@ class DocumentController:
                 },
             )
 
+    async def rechunk(self,
+                      document_id: int,
+                      request: RechunkRequest,
+                      document_service: DocumentService = Depends(get_document_service),
+                      db: Session = Depends(get_db_session)) -> DocumentResponseSchema:
+        try:
+            logger.info("Rechunk document request received", extra={"document_id": document_id})
+            return await document_service.rechunk(document_id, request, db)
+
+        except AppError as e:
+            logger.warning("Application error while rechunking document", extra={
+                "error": e.code,
+                "error_message": e.message
+            })
+            raise HTTPException(
+                status_code=e.status_code,
+                detail={"error": e.code, "message": e.message},
+            )
+        except Exception:
+            logger.exception("Unexpected error while rechunking document")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail={
+                    "error": "InternalServerError",
+                    "message": "Unexpected error while rechunking the document",
+                },
+            )
+
 controller = DocumentController()
-router.post("", response_model=DocumentResponseSchema)(controller.create)
\ No newline at end of file
+router.post("", response_model=DocumentResponseSchema, openapi_extra={
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["chat_id", "file"],
+                    "properties": {
+                        "chat_id": {"type": "integer"},
+                        "file": {"type": "string", "format": "binary"}
+                    }
+                }
+            }
+        }
+    }
+})(controller.create)
+router.post("/{document_id}/rechunk", response_model=DocumentResponseSchema,
+            status_code=status.HTTP_202_ACCEPTED)(controller.rechunk)
\ No newline at end of file
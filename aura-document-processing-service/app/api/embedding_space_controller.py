@@ -0,0 +1,80 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+import logging
+
+from app.application.exceptions.exceptions import AppError
+from app.application.services.embedding_migration_service import EmbeddingMigrationService
+from app.configuration.dependencies import get_db_session, get_embedding_migration_service
+from app.domain.dtos.embedding_space_response import EmbeddingSpaceListResponse, EmbeddingSpaceSchema
+from app.infrastructure.executors.executors import get_io_executor
+
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+class EmbeddingSpaceController:
+    async def list_spaces(self,
+                          migration_service: EmbeddingMigrationService = Depends(get_embedding_migration_service),
+                          db: Session = Depends(get_db_session)) -> EmbeddingSpaceListResponse:
+        try:
+            spaces = await get_io_executor().run(migration_service.list_spaces, db)
+            return EmbeddingSpaceListResponse(spaces=spaces)
+
+        except AppError as e:
+            raise self._http_error("listing embedding spaces", e)
+
+    async def get_space(self,
+                        embedding_model: str,
+                        migration_service: EmbeddingMigrationService = Depends(get_embedding_migration_service),
+                        db: Session = Depends(get_db_session)) -> EmbeddingSpaceSchema:
+        try:
+            return await get_io_executor().run(migration_service.get_space, embedding_model, db)
+
+        except AppError as e:
+            raise self._http_error("fetching embedding space", e)
+
+    async def reembed(self,
+                      embedding_model: str,
+                      migration_service: EmbeddingMigrationService = Depends(get_embedding_migration_service),
+                      db: Session = Depends(get_db_session)) -> EmbeddingSpaceSchema:
+        try:
+            # Sólo lo marca en construcción: lo llena el worker de ingesta mientras las consultas siguen
+            # usando el espacio activo
+            space = await get_io_executor().run(migration_service.start, embedding_model, db)
+        except AppError as e:
+            raise self._http_error("starting re-embedding", e)
+
+        logger.info("Re-embedding scheduled", extra={"embedding_model": embedding_model})
+        return space
+
+    async def activate(self,
+                       embedding_model: str,
+                       migration_service: EmbeddingMigrationService = Depends(get_embedding_migration_service),
+                       db: Session = Depends(get_db_session)) -> EmbeddingSpaceSchema:
+        try:
+            space = await get_io_executor().run(migration_service.activate, embedding_model, db)
+        except AppError as e:
+            raise self._http_error("activating embedding space", e)
+
+        logger.info("Embedding space activated", extra={"embedding_model": embedding_model})
+        return space
+
+    @staticmethod
+    def _http_error(action: str, e: AppError) -> HTTPException:
+        logger.warning(f"Application error while {action}", extra={
+            "error": e.code,
+            "error_message": e.message
+        })
+        return HTTPException(
+            status_code=e.status_code,
+            detail={"error": e.code, "message": e.message},
+        )
+
+controller = EmbeddingSpaceController()
+router.get("", response_model=EmbeddingSpaceListResponse)(controller.list_spaces)
+router.get("/{embedding_model}", response_model=EmbeddingSpaceSchema)(controller.get_space)
+router.post("/{embedding_model}/reembed", response_model=EmbeddingSpaceSchema,
+            status_code=status.HTTP_202_ACCEPTED)(controller.reembed)
+router.post("/{embedding_model}/activate", response_model=EmbeddingSpaceSchema)(controller.activate)
@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.configuration.metrics_registry import metrics
+
+
+router = APIRouter()
+
+
+class MetricsController:
+    async def export(self) -> PlainTextResponse:
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+controller = MetricsController()
+router.get("", response_class=PlainTextResponse)(controller.export)
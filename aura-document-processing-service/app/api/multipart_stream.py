@@ -0,0 +1,107 @@
+import logging
+from typing import AsyncIterator, Dict, List, Optional
+
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.requests import Request
+
+from app.application.exceptions.exceptions import ValidationError
+from app.domain.dtos.multipart_event import MultipartEvent
+
+
+logger = logging.getLogger(__name__)
+
+
+class MultipartStream:
+    """Lee un cuerpo multipart/form-data a medida que llega, sin volcarlo a disco.
+
+    A diferencia de `UploadFile`, que Starlette guarda completo en un archivo
+    temporal antes de llamar al endpoint, aquí cada trozo del cuerpo se parsea
+    en cuanto se recibe y los datos de los archivos se entregan como eventos
+    `file_data`. Los campos de texto se entregan completos como `field`.
+    """
+
+    def __init__(self, request: Request):
+        self.request = request
+        content_type, params = parse_options_header(request.headers.get("content-type", ""))
+        if content_type != b"multipart/form-data" or b"boundary" not in params:
+            raise ValidationError("Expected a multipart/form-data request")
+        self.boundary = params[b"boundary"]
+
+    @property
+    def content_length(self) -> Optional[int]:
+        value = self.request.headers.get("content-length")
+        return int(value) if value and value.isdigit() else None
+
+    async def events(self) -> AsyncIterator[MultipartEvent]:
+        events: List[MultipartEvent] = []
+        headers: Dict[bytes, bytes] = {}
+        header_field = bytearray()
+        header_value = bytearray()
+        part: Dict[str, object] = {}
+        field_value = bytearray()
+
+        def on_part_begin() -> None:
+            headers.clear()
+            part.clear()
+            field_value.clear()
+
+        def on_header_field(data: bytes, start: int, end: int) -> None:
+            header_field.extend(data[start:end])
+
+        def on_header_value(data: bytes, start: int, end: int) -> None:
+            header_value.extend(data[start:end])
+
+        def on_header_end() -> None:
+            headers[bytes(header_field).lower()] = bytes(header_value)
+            header_field.clear()
+            header_value.clear()
+
+        def on_headers_finished() -> None:
+            _, disposition = parse_options_header(headers.get(b"content-disposition", b""))
+            part["name"] = disposition.get(b"name", b"").decode("utf-8")
+            filename = disposition.get(b"filename")
+            part["is_file"] = filename is not None
+            if filename is not None:
+                events.append(MultipartEvent(
+                    kind="file_start",
+                    name=part["name"],
+                    filename=filename.decode("utf-8"),
+                    content_type=headers.get(b"content-type", b"application/octet-stream").decode("latin-1")
+                ))
+
+        def on_part_data(data: bytes, start: int, end: int) -> None:
+            if part.get("is_file"):
+                events.append(MultipartEvent(kind="file_data", name=part["name"], data=bytes(data[start:end])))
+            else:
+                field_value.extend(data[start:end])
+
+        def on_part_end() -> None:
+            if part.get("is_file"):
+                events.append(MultipartEvent(kind="file_end", name=part["name"]))
+            else:
+                events.append(MultipartEvent(kind="field", name=part["name"], value=field_value.decode("utf-8")))
+
+        parser = MultipartParser(self.boundary, {
+            "on_part_begin": on_part_begin,
+            "on_header_field": on_header_field,
+            "on_header_value": on_header_value,
+            "on_header_end": on_header_end,
+            "on_headers_finished": on_headers_finished,
+            "on_part_data": on_part_data,
+            "on_part_end": on_part_end,
+        })
+
+        try:
+            async for chunk in self.request.stream():
+                parser.write(chunk)
+                # Los callbacks se ejecutan dentro de `write`; los eventos se entregan después de cada trozo
+                for event in events:
+                    yield event
+                events.clear()
+            parser.finalize()
+        except MultipartParseError as e:
+            logger.warning("Malformed multipart body", extra={"error": str(e)})
+            raise ValidationError("Malformed multipart/form-data body") from e
+        for event in events:
+            yield event
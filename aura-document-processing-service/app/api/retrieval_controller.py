@@ -20,7 +20,12 @@ class RetrievalController:
                                retrieval_service: RetrievalService = Depends(get_retrieval_service),
                               db: Session = Depends(get_db_session)) -> QuestionResponse:
         try:
-            fragments = retrieval_service.process_question(question_request.question, db)
+            fragments = await retrieval_service.process_question(
+                question_request.question,
+                db,
+                scope=question_request.scope,
+                mode=question_request.mode
+            )
             fragments_response = [
                 FragmentResponse.from_orm(fragment) for fragment in fragments
             ]
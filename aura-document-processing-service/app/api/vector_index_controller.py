@@ -0,0 +1,54 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+import logging
+
+from app.application.exceptions.exceptions import AppError
+from app.configuration.dependencies import get_vector_index_manager
+from app.domain.dtos.vector_index_response import VectorIndexListResponse, VectorIndexRebuildResponse, VectorIndexSchema
+from app.infrastructure.executors.executors import get_io_executor
+from app.infrastructure.persistence.repositories.vector_index_manager import VectorIndexManager
+
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+class VectorIndexController:
+    async def list_indexes(self,
+                           index_manager: VectorIndexManager = Depends(get_vector_index_manager)) -> VectorIndexListResponse:
+        try:
+            indexes = await get_io_executor().run(index_manager.list_indexes)
+            return VectorIndexListResponse(indexes=[VectorIndexSchema(**index) for index in indexes])
+
+        except AppError as e:
+            logger.warning("Application error while listing vector indexes", extra={
+                "error": e.code,
+                "error_message": e.message
+            })
+            raise HTTPException(
+                status_code=e.status_code,
+                detail={"error": e.code, "message": e.message},
+            )
+
+    async def rebuild(self,
+                      embedding_model: str,
+                      background_tasks: BackgroundTasks,
+                      index_manager: VectorIndexManager = Depends(get_vector_index_manager)) -> VectorIndexRebuildResponse:
+        if embedding_model not in index_manager.configured_models():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail={"error": "NotFoundError", "message": f"No vector index configured for {embedding_model}"},
+            )
+
+        background_tasks.add_task(index_manager.rebuild_index, embedding_model)
+        logger.info("Vector index rebuild scheduled", extra={"embedding_model": embedding_model})
+        return VectorIndexRebuildResponse(
+            embedding_model=embedding_model,
+            index=index_manager.index_name(embedding_model),
+            status="scheduled"
+        )
+
+controller = VectorIndexController()
+router.get("", response_model=VectorIndexListResponse)(controller.list_indexes)
+router.post("/{embedding_model}/rebuild", response_model=VectorIndexRebuildResponse,
+            status_code=status.HTTP_202_ACCEPTED)(controller.rebuild)
@@ -32,4 +32,9 @@ class DatabaseError(AppError):
 
 class ConfigError(AppError):
     def __init__(self, message: str = "Invalid configuration", *, code: str | None = None):
-        super().__init__(message, status_code=500, code=code)
\ No newline at end of file
+        super().__init__(message, status_code=500, code=code)
+
+
+class QueueError(AppError):
+    def __init__(self, message: str = "Queue operation failed", *, code: str | None = None):
+        super().__init__(message, status_code=503, code=code)
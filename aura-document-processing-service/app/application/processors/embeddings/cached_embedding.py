@@ -0,0 +1,160 @@
+"""Caché de embeddings direccionada por contenido.
+
+Envuelve cualquier `EmbeddingInterface` y reutiliza los vectores ya calculados
+para un mismo texto. La clave es (nombre del modelo, sha256 del texto), por lo
+que volver a subir un documento, o versiones casi idénticas, sólo vectoriza los
+fragmentos nuevos.
+
+Niveles:
+  - Memoria: LRU acotada por número de entradas, compartida por el proceso.
+  - Persistente: `EmbeddingCacheStore` (disco local o Redis), compartida entre
+    procesos y reinicios.
+
+Métricas:
+  - embedding_cache_hits_total{model, tier}
+  - embedding_cache_misses_total{model}
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.application.processors.embeddings.interfaces.embedding_interface import EmbeddingInterface
+from app.configuration.metrics_registry import metrics
+from app.infrastructure.persistence.caches.embedding_cache_store import EmbeddingCacheStore
+
+
+cache_hits = metrics.counter("embedding_cache_hits_total", "Embeddings served from cache")
+cache_misses = metrics.counter("embedding_cache_misses_total", "Embeddings computed by the model")
+
+
+class EmbeddingCache:
+    """Caché de dos niveles (LRU en memoria + almacén persistente opcional).
+
+    Args:
+        store: Almacén persistente; `None` deja sólo el nivel en memoria.
+        max_memory_entries: Máximo de vectores retenidos en memoria.
+    """
+    def __init__(self, store: Optional[EmbeddingCacheStore], max_memory_entries: int = 50000):
+        self.store = store
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: List[str], model_name: str) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+        if found:
+            cache_hits.inc(len(found), model=model_name, tier="memory")
+
+        pending = [key for key in keys if key not in found]
+        if pending and self.store is not None:
+            stored = self.store.get_many(pending)
+            if stored:
+                cache_hits.inc(len(stored), model=model_name, tier="persistent")
+                self._remember(stored)
+                found.update(stored)
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        self._remember(items)
+        if self.store is not None:
+            self.store.put_many(items)
+
+    def _remember(self, items: Dict[str, np.ndarray]) -> None:
+        with self._lock:
+            for key, vector in items.items():
+                self._memory[key] = vector
+                self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+
+class CachedEmbedding(EmbeddingInterface):
+    """Decorador de `EmbeddingInterface` que sólo envía al modelo los textos no cacheados.
+
+    Args:
+        embedding: Proveedor de embeddings real.
+        model_name: Nombre del modelo usado para particionar la caché.
+        cache: Caché compartida.
+    """
+    def __init__(self, embedding: EmbeddingInterface, model_name: str, cache: EmbeddingCache):
+        self.embedding = embedding
+        self.model_name = model_name
+        self.cache = cache
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Vectoriza documentos reutilizando los vectores cacheados.
+
+        Args:
+            texts: Documentos a vectorizar.
+
+        Returns:
+            Lista de vectores en el mismo orden que `texts`.
+        """
+        return self._lookup(texts).tolist()
+
+    def embed_documents_array(self, texts: List[str]) -> np.ndarray:
+        """Igual que `embed_documents`, pero devuelve una matriz float32 (N×D).
+
+        Args:
+            texts: Documentos a vectorizar.
+
+        Returns:
+            Matriz con un vector por documento, en el mismo orden que `texts`.
+        """
+        return self._lookup(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Vectoriza una consulta delegando en el proveedor real.
+
+        Args:
+            text: Texto de consulta.
+
+        Returns:
+            Vector de embeddings de la consulta.
+        """
+        return self.embedding.embed_query(text)
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Vectoriza varias consultas delegando en el proveedor real.
+
+        Args:
+            texts: Textos de consulta.
+
+        Returns:
+            Lista de vectores (uno por consulta).
+        """
+        return self.embedding.embed_queries(texts)
+
+    def _lookup(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        keys = [self._key(text) for text in texts]
+        found = self.cache.get_many(list(dict.fromkeys(keys)), self.model_name)
+
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+
+        if missing:
+            cache_misses.inc(len(missing), model=self.model_name)
+            vectors = self.embedding.embed_documents_array(list(missing.values()))
+            # Cada vector es una fila (vista) de la matriz del lote, sin conversión por elemento
+            computed = dict(zip(missing.keys(), vectors))
+            self.cache.put_many(computed)
+            found.update(computed)
+
+        return np.stack([found[key] for key in keys])
+
+    def _key(self, text: str) -> str:
+        return f"{self.model_name}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
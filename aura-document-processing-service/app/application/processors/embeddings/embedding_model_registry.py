@@ -0,0 +1,163 @@
+"""
+Registro compartido por proceso de modelos de embeddings.
+
+Los modelos se cargan de forma diferida en el primer uso, bajo un lock por
+clave, y se mantiene una única instancia por (proveedor, modelo, dispositivo)
+en todo el proceso. Los modelos que no se usan durante un tiempo configurable
+pueden descargarse para liberar memoria.
+
+Uso principal:
+    - Evitar cargar en el arranque modelos que nunca se utilizan.
+    - Compartir la misma instancia entre `IngestionService` y `RetrievalService`.
+"""
+import gc
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Tuple
+
+from app.application.processors.embeddings.interfaces.embedding_interface import EmbeddingInterface
+
+
+logger = logging.getLogger(__name__)
+
+RegistryKey = Tuple[str, str, Optional[str]]
+EmbeddingBuilder = Callable[[str, Optional[str]], EmbeddingInterface]
+
+
+@dataclass
+class _RegistryEntry:
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    instance: Optional[EmbeddingInterface] = None
+    last_used: float = 0.0
+
+
+class EmbeddingModelRegistry:
+    """
+    Registro singleton de instancias de embeddings.
+
+    Métodos:
+        get(provider, model_name, device, builder) -> EmbeddingInterface:
+            Devuelve la instancia registrada, cargándola si aún no existe.
+        unload_idle(max_idle_seconds) -> int:
+            Descarga los modelos sin uso durante más de `max_idle_seconds`.
+        unload(provider, model_name, device) -> bool:
+            Descarga un modelo concreto.
+    """
+    _instance: Optional["EmbeddingModelRegistry"] = None
+    _lock: threading.Lock = threading.Lock()
+    _initialized: bool = False
+
+    def __new__(cls) -> "EmbeddingModelRegistry":
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        if self._initialized:
+            return
+
+        with self._lock:
+            if self._initialized:
+                return
+
+            self._entries: Dict[RegistryKey, _RegistryEntry] = {}
+            self._entries_lock = threading.Lock()
+            self._initialized = True
+
+    def get(self,
+            provider: str,
+            model_name: str,
+            device: Optional[str],
+            builder: EmbeddingBuilder) -> EmbeddingInterface:
+        """
+        Obtiene la instancia de embeddings para la clave indicada.
+
+        Args:
+            provider (str): Nombre del proveedor (p. ej. "huggingface").
+            model_name (str): Nombre del modelo.
+            device (Optional[str]): Dispositivo de inferencia, si aplica.
+            builder (EmbeddingBuilder): Función que construye la instancia en el primer uso.
+
+        Returns:
+            EmbeddingInterface: Instancia compartida del proveedor.
+        """
+        key = (provider, model_name, device)
+        with self._entries_lock:
+            entry = self._entries.setdefault(key, _RegistryEntry())
+
+        with entry.lock:
+            if entry.instance is None:
+                logger.info("Loading embedding model", extra={
+                    "provider": provider,
+                    "model_name": model_name,
+                    "device": device
+                })
+                start = time.perf_counter()
+                entry.instance = builder(model_name, device)
+                logger.info("Embedding model loaded", extra={
+                    "provider": provider,
+                    "model_name": model_name,
+                    "device": device,
+                    "load_seconds": round(time.perf_counter() - start, 3)
+                })
+            entry.last_used = time.monotonic()
+            return entry.instance
+
+    def unload(self, provider: str, model_name: str, device: Optional[str] = None) -> bool:
+        """
+        Descarga un modelo concreto del registro.
+
+        Returns:
+            bool: True si el modelo estaba cargado.
+        """
+        with self._entries_lock:
+            entry = self._entries.get((provider, model_name, device))
+        if entry is None:
+            return False
+
+        with entry.lock:
+            if entry.instance is None:
+                return False
+            instance, entry.instance = entry.instance, None
+
+        # Los procesos de un `ProcessPoolEmbedding` no se liberan al perder la referencia
+        try:
+            instance.close()
+        except Exception:
+            logger.warning("Failed closing embedding model", extra={
+                "provider": provider,
+                "model_name": model_name,
+                "device": device
+            }, exc_info=True)
+        del instance
+        gc.collect()
+        logger.info("Embedding model unloaded", extra={
+            "provider": provider,
+            "model_name": model_name,
+            "device": device
+        })
+        return True
+
+    def unload_idle(self, max_idle_seconds: float) -> int:
+        """
+        Descarga los modelos que no se usan desde hace más de `max_idle_seconds`.
+
+        Returns:
+            int: Cantidad de modelos descargados.
+        """
+        now = time.monotonic()
+        with self._entries_lock:
+            candidates = [
+                key for key, entry in self._entries.items()
+                if entry.instance is not None and now - entry.last_used > max_idle_seconds
+            ]
+        return sum(1 for key in candidates if self.unload(*key))
+
+    def loaded(self) -> list[RegistryKey]:
+        """Devuelve las claves de los modelos actualmente cargados."""
+        with self._entries_lock:
+            return [key for key, entry in self._entries.items() if entry.instance is not None]
@@ -3,17 +3,115 @@ Este módulo define una fábrica para instanciar diferentes proveedores de embed
 según el método especificado. Facilita la selección y uso de distintas
 implementaciones de embeddings de manera centralizada y extensible.
 
+Los proveedores se construyen de forma diferida y se comparten a nivel de proceso
+a través de `EmbeddingModelRegistry`, por lo que crear varias fábricas no duplica
+los modelos en memoria. Si `embedding_cache_backend` no es "none", cada proveedor
+se entrega envuelto en `CachedEmbedding`. Por debajo de la caché, cada proveedor
+se envuelve en `LengthBucketedEmbedding` con el presupuesto de tokens por lote del
+método (`embedding_batch_token_budgets`, o `embedding_batch_token_budget` por defecto).
+
+Con `embedding_process_workers` > 0 el proveedor es un `ProcessPoolEmbedding`: el
+modelo se carga en cada proceso worker y no en el proceso que llama. Pensado para
+el worker de ingesta en nodos con muchos núcleos; en la API conviene dejarlo en 0.
+
+`get_query_embedding_cache` entrega la caché de vectores de consulta que usa
+`RetrievalService` (`query_cache_backend`: none, memory, local o redis), que se
+particiona por `EmbeddingsFactory.model_version`.
+
 Uso principal:
     - Selección dinámica de la estrategia de embeddings en función de la configuración o el caso de uso.
     - Simplifica la integración de nuevos proveedores de embeddings en el sistema.
 """
-from app.application.processors.embeddings.huggingface_based_embedding import HuggingfaceBasedEmbedding
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from app.application.exceptions.exceptions import ConfigError
+from app.application.processors.embeddings.cached_embedding import CachedEmbedding, EmbeddingCache
+from app.application.processors.embeddings.embedding_model_registry import EmbeddingModelRegistry
 from app.application.processors.embeddings.interfaces.embedding_interface import EmbeddingInterface
-from typing import Dict
+from app.application.processors.embeddings.length_bucketed_embedding import LengthBucketedEmbedding
+from app.application.processors.embeddings.process_pool_embedding import ProcessPoolEmbedding
+from app.application.processors.embeddings.query_embedding_cache import QueryEmbeddingCache
+from app.configuration.environment_variables import environment_variables
+from app.infrastructure.persistence.caches.embedding_cache_store import (
+    FileEmbeddingCacheStore,
+    MemoryEmbeddingCacheStore,
+    RedisEmbeddingCacheStore
+)
+from app.infrastructure.persistence.caches.redis_client import RedisClient
+
+
+@lru_cache()
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    backend = environment_variables.embedding_cache_backend
+    if backend == "none":
+        return None
+    if backend == "memory":
+        store = None
+    elif backend == "file":
+        store = FileEmbeddingCacheStore(Path(environment_variables.embedding_cache_dir))
+    elif backend == "redis":
+        store = RedisEmbeddingCacheStore(RedisClient(), ttl_seconds=environment_variables.embedding_cache_ttl_seconds)
+    else:
+        raise ConfigError(f"Unsupported embedding cache backend: {backend}")
+    return EmbeddingCache(store, max_memory_entries=environment_variables.embedding_cache_memory_entries)
+
+
+@lru_cache()
+def get_query_embedding_cache() -> Optional[QueryEmbeddingCache]:
+    backend = environment_variables.query_cache_backend
+    ttl_seconds = environment_variables.query_cache_ttl_seconds
+    if backend == "none":
+        return None
+    if backend == "memory":
+        store = None
+    elif backend == "local":
+        store = MemoryEmbeddingCacheStore(ttl_seconds=ttl_seconds, max_entries=environment_variables.query_cache_max_entries)
+    elif backend == "redis":
+        store = RedisEmbeddingCacheStore(RedisClient(), prefix="query-embedding:", ttl_seconds=ttl_seconds)
+    else:
+        raise ConfigError(f"Unsupported query cache backend: {backend}")
+    return QueryEmbeddingCache(store, max_entries=environment_variables.query_cache_max_entries, ttl_seconds=ttl_seconds)
+
+
+@lru_cache()
+def get_batch_token_budgets() -> Dict[str, int]:
+    budgets = {}
+    for entry in environment_variables.embedding_batch_token_budgets.split(","):
+        if not entry.strip():
+            continue
+        method, _, budget = entry.partition("=")
+        try:
+            budgets[method.strip()] = int(budget)
+        except ValueError:
+            raise ConfigError(f"Invalid embedding batch token budget: {entry.strip()}")
+    return budgets
+
+
+def _build_huggingface(model_name: str, device: Optional[str]) -> EmbeddingInterface:
+    from app.application.processors.embeddings.huggingface_based_embedding import HuggingfaceBasedEmbedding
+    return HuggingfaceBasedEmbedding(model_name=model_name, device=device)
+
+
+def _build_ollama(model_name: str, device: Optional[str]) -> EmbeddingInterface:
+    from app.application.processors.embeddings.ollama_based_embedding import OllamaBasedEmbedding
+    return OllamaBasedEmbedding(model=model_name)
+
+
+def _build_onnx(model_name: str, device: Optional[str]) -> EmbeddingInterface:
+    from app.application.processors.embeddings.onnx_based_embedding import OnnxBasedEmbedding
+    return OnnxBasedEmbedding(model_name=model_name)
+
 
-from app.application.processors.embeddings.ollama_based_embedding import OllamaBasedEmbedding
-from app.application.processors.embeddings.sentence_transformer_based_embedding import SentenceTransformerBasedEmbedding
-from app.application.processors.embeddings.spacy_based_embedding import SpacyBasedEmbedding
+def _build_sentence_transformer(model_name: str, device: Optional[str]) -> EmbeddingInterface:
+    from app.application.processors.embeddings.sentence_transformer_based_embedding import SentenceTransformerBasedEmbedding
+    return SentenceTransformerBasedEmbedding(model=model_name)
+
+
+def _build_spacy(model_name: str, device: Optional[str]) -> EmbeddingInterface:
+    from app.application.processors.embeddings.spacy_based_embedding import SpacyBasedEmbedding
+    return SpacyBasedEmbedding(model_name=model_name)
 
 
 class EmbeddingsFactory:
@@ -21,33 +119,91 @@ class EmbeddingsFactory:
     Fábrica para obtener instancias de proveedores de embeddings según el método solicitado.
 
     Métodos:
-        get_embedding(method: str) -> EmbeddingInterface:
+        get_embedding(method: str, model_name: str | None, device: str | None, in_process: bool) -> EmbeddingInterface:
             Devuelve una instancia del proveedor de embeddings correspondiente al método especificado.
 
     Raises:
         ValueError: Si el método solicitado no está soportado.
     """
     def __init__(self):
-        self._embeddings: Dict[str, EmbeddingInterface] = {
-            "huggingface": HuggingfaceBasedEmbedding(),
-            "ollama": OllamaBasedEmbedding(),
-            "sentence_transformer": SentenceTransformerBasedEmbedding(),
-            "spacy": SpacyBasedEmbedding()
+        self._registry = EmbeddingModelRegistry()
+        self._embeddings: Dict[str, Tuple[str, Callable[[str, Optional[str]], EmbeddingInterface]]] = {
+            "huggingface": ("sentence-transformers/all-MiniLM-L6-v2", _build_huggingface),
+            "ollama": ("nomic-embed-text:v1.5", _build_ollama),
+            "onnx": ("sentence-transformers/all-MiniLM-L6-v2", _build_onnx),
+            "sentence_transformer": ("sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2", _build_sentence_transformer),
+            "spacy": ("es_core_news_sm", _build_spacy)
         }
 
-    def get_embedding(self, method: str) -> EmbeddingInterface:
+    def get_embedding(self,
+                      method: str,
+                      model_name: Optional[str] = None,
+                      device: Optional[str] = None,
+                      in_process: bool = False) -> EmbeddingInterface:
         """
         Obtiene el proveedor de embeddings correspondiente al método especificado.
 
         Args:
             method (str): Nombre del método de embeddings.
+            model_name (str | None): Modelo a utilizar; si se omite se usa el del proveedor.
+            device (str | None): Dispositivo de inferencia, si el proveedor lo admite.
+            in_process (bool): Si es True, devuelve el modelo cargado en este proceso, sin caché
+                ni pool de procesos (lo usan los propios workers del pool).
+
+        Returns:
+            EmbeddingInterface: Instancia compartida del proveedor de embeddings.
+
+        Raises:
+            ValueError: Si el método no está soportado.
+        """
+        if method not in self._embeddings:
+            raise ValueError(f"Método de embeddings no soportado: {method}")
+        default_model_name, builder = self._embeddings[method]
+        model_name = model_name or default_model_name
+        workers = environment_variables.embedding_process_workers
+        if workers > 0 and not in_process:
+            # La agrupación por longitud la aplica cada worker sobre su parte del lote
+            embedding = self._registry.get(
+                f"{method}:processes",
+                model_name,
+                device,
+                lambda name, dev: ProcessPoolEmbedding(method, name, dev, workers)
+            )
+        else:
+            embedding = self._registry.get(method, model_name, device, builder)
+            token_budget = get_batch_token_budgets().get(method, environment_variables.embedding_batch_token_budget)
+            if token_budget > 0:
+                embedding = LengthBucketedEmbedding(embedding, model_name, token_budget)
+
+        if in_process:
+            return embedding
+        cache = get_embedding_cache()
+        if cache is None:
+            return embedding
+        return CachedEmbedding(embedding, model_name, cache)
+
+    def model_version(self, method: str, model_name: Optional[str] = None) -> str:
+        """
+        Identifica el modelo que produce los vectores de un método, sin cargarlo.
+
+        Dos llamadas devuelven lo mismo sólo si los vectores son intercambiables: incluye el
+        modelo resuelto (el del proveedor si se omite), la variante numérica del backend y
+        `query_cache_version`, que se incrementa si cambian los pesos bajo el mismo nombre.
+
+        Args:
+            method (str): Nombre del método de embeddings.
+            model_name (str | None): Modelo a utilizar; si se omite se usa el del proveedor.
 
         Returns:
-            EmbeddingInterface: Instancia del proveedor de embeddings.
+            str: Identificador del modelo, p. ej. "onnx/sentence-transformers/all-MiniLM-L6-v2/int8@1".
 
         Raises:
             ValueError: Si el método no está soportado.
         """
         if method not in self._embeddings:
             raise ValueError(f"Método de embeddings no soportado: {method}")
-        return self._embeddings[method]
+        default_model_name, _ = self._embeddings[method]
+        version = f"{method}/{model_name or default_model_name}"
+        if method == "onnx":
+            version += "/int8" if environment_variables.onnx_quantize else "/fp32"
+        return f"{version}@{environment_variables.query_cache_version}"
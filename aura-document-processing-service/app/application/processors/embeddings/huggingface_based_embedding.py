@@ -18,6 +18,8 @@ Notas:
   - Mientras más grande el modelo, mayor costo de cómputo.
 """
 from typing import List
+
+import numpy as np
 from langchain_huggingface import HuggingFaceEmbeddings
 
 from app.application.processors.embeddings.interfaces.embedding_interface import EmbeddingInterface
@@ -48,6 +50,25 @@ class HuggingfaceBasedEmbedding(EmbeddingInterface):
         """
         return self.embeddings_model.embed_documents(texts)
 
+    def embed_documents_array(self, texts: List[str]) -> np.ndarray:
+        """Vectoriza documentos y devuelve la salida del modelo como matriz float32.
+
+        Args:
+            texts: Documentos a vectorizar.
+
+        Returns:
+            Matriz (N×D) con un vector por documento.
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        # Mismo preprocesamiento que `HuggingFaceEmbeddings.embed_documents`, sin el `.tolist()` final
+        vectors = self.embeddings_model._client.encode(
+            [text.replace("\n", " ") for text in texts],
+            convert_to_numpy=True,
+            **self.embeddings_model.encode_kwargs
+        )
+        return np.ascontiguousarray(vectors, dtype=np.float32)
+
     def embed_query(self, text: str) -> List[float]:
         """Vectoriza una consulta individual.
 
@@ -59,3 +80,26 @@ class HuggingfaceBasedEmbedding(EmbeddingInterface):
         """
         return self.embeddings_model.embed_query(text)
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Vectoriza varias consultas en una sola pasada del modelo.
+
+        Args:
+            texts: Textos de consulta.
+
+        Returns:
+            Lista de vectores (uno por consulta).
+        """
+        return self.embeddings_model.embed_documents(texts)
+
+    def token_lengths(self, texts: List[str]) -> List[int]:
+        """Cuenta tokens con el tokenizador del modelo, truncando como lo hace el modelo.
+
+        Args:
+            texts: Textos a medir.
+
+        Returns:
+            Cantidad de tokens de cada texto.
+        """
+        client = self.embeddings_model._client
+        encoded = client.tokenizer(texts, truncation=True, max_length=client.max_seq_length)
+        return [len(ids) for ids in encoded["input_ids"]]
@@ -10,6 +10,8 @@ Uso principal:
 from abc import ABC, abstractmethod
 from typing import List
 
+import numpy as np
+
 class EmbeddingInterface(ABC):
     """
     Interfaz abstracta para proveedores de embeddings.
@@ -20,6 +22,23 @@ class EmbeddingInterface(ABC):
         embed_query(text: str) -> List[float]:
             Calcula embeddings para una consulta individual.
 
+    Métodos opcionales:
+        embed_queries(texts: List[str]) -> List[List[float]]:
+            Calcula embeddings para varias consultas en una sola pasada. Por defecto
+            llama a `embed_query` por cada texto; los proveedores que soportan lotes
+            deberían sobrescribirlo.
+        embed_documents_array(texts: List[str]) -> np.ndarray:
+            Igual que `embed_documents`, pero devuelve una matriz float32 contigua
+            (N×D) sin pasar por listas de floats de Python. Por defecto convierte la
+            salida de `embed_documents`; los proveedores basados en numpy deberían
+            sobrescribirlo.
+        token_lengths(texts: List[str]) -> List[int]:
+            Longitud en tokens de cada texto según el tokenizador del modelo. Por
+            defecto es una estimación a partir de la cantidad de caracteres.
+        close() -> None:
+            Libera los recursos que no recoge el GC (procesos, sesiones). Lo llama
+            `EmbeddingModelRegistry` al descargar la instancia; por defecto no hace nada.
+
     Args:
         texts (List[str]): Documentos a vectorizar.
         text (str): Consulta a vectorizar.
@@ -34,3 +53,17 @@ class EmbeddingInterface(ABC):
     @abstractmethod
     def embed_query(self, text: str) -> List[float]:
         pass
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_documents_array(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.ascontiguousarray(self.embed_documents(texts), dtype=np.float32)
+
+    def token_lengths(self, texts: List[str]) -> List[int]:
+        return [len(text) // 4 + 2 for text in texts]
+
+    def close(self) -> None:
+        pass
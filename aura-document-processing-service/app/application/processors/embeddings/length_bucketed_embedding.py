@@ -0,0 +1,126 @@
+"""Agrupación por longitud para vectorizar lotes con poco padding.
+
+Envuelve cualquier `EmbeddingInterface`: ordena los textos por longitud en
+tokens, los agrupa en lotes cuyo costo con padding (cantidad × longitud máxima)
+no supera un presupuesto de tokens, vectoriza cada lote y devuelve los vectores
+en el orden original. Así los fragmentos cortos no se rellenan hasta la
+longitud del más largo del lote, y los lotes de textos cortos pueden ser
+mucho más grandes que los de textos largos.
+
+Métricas:
+  - embedding_docs_per_second{model, length}: throughput por lote, etiquetado
+    por el rango de longitud en tokens del texto más largo del lote.
+"""
+import time
+from typing import Callable, Iterator, List
+
+import numpy as np
+
+from app.application.processors.embeddings.interfaces.embedding_interface import EmbeddingInterface
+from app.configuration.metrics_registry import metrics
+
+
+docs_per_second = metrics.summary("embedding_docs_per_second", "Embedding throughput per batch by token length")
+
+LENGTH_BINS = (32, 64, 128, 256, 512)
+
+
+def _length_label(tokens: int) -> str:
+    for upper in LENGTH_BINS:
+        if tokens <= upper:
+            return f"<={upper}"
+    return f">{LENGTH_BINS[-1]}"
+
+
+class LengthBucketedEmbedding(EmbeddingInterface):
+    """Proveedor que reparte cada llamada en lotes de longitud homogénea.
+
+    Args:
+        embedding: Proveedor real.
+        model_name: Nombre usado en las métricas.
+        token_budget: Máximo de tokens con padding por lote; 0 desactiva la agrupación.
+    """
+    def __init__(self, embedding: EmbeddingInterface, model_name: str, token_budget: int):
+        self.embedding = embedding
+        self.model_name = model_name
+        self.token_budget = token_budget
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Vectoriza documentos en lotes agrupados por longitud.
+
+        Args:
+            texts: Documentos a vectorizar.
+
+        Returns:
+            Lista de vectores en el mismo orden que `texts`.
+        """
+        return self._embed_bucketed(texts, self.embedding.embed_documents_array).tolist()
+
+    def embed_documents_array(self, texts: List[str]) -> np.ndarray:
+        """Igual que `embed_documents`, pero devuelve una matriz float32 (N×D).
+
+        Args:
+            texts: Documentos a vectorizar.
+
+        Returns:
+            Matriz con un vector por documento, en el mismo orden que `texts`.
+        """
+        return self._embed_bucketed(texts, self.embedding.embed_documents_array)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Vectoriza una consulta delegando en el proveedor real.
+
+        Args:
+            text: Texto de consulta.
+
+        Returns:
+            Vector de embeddings de la consulta.
+        """
+        return self.embedding.embed_query(text)
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Vectoriza varias consultas en lotes agrupados por longitud.
+
+        Args:
+            texts: Textos de consulta.
+
+        Returns:
+            Lista de vectores en el mismo orden que `texts`.
+        """
+        return self._embed_bucketed(texts, self.embedding.embed_queries).tolist()
+
+    def token_lengths(self, texts: List[str]) -> List[int]:
+        return self.embedding.token_lengths(texts)
+
+    def _embed_bucketed(self,
+                        texts: List[str],
+                        embed: Callable[[List[str]], object]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        if self.token_budget <= 0 or len(texts) == 1:
+            return np.ascontiguousarray(embed(texts), dtype=np.float32)
+
+        lengths = self.embedding.token_lengths(texts)
+        order = sorted(range(len(texts)), key=lengths.__getitem__)
+        results = None
+        for bucket in self._buckets(order, lengths):
+            start = time.perf_counter()
+            vectors = np.asarray(embed([texts[i] for i in bucket]), dtype=np.float32)
+            elapsed = time.perf_counter() - start
+            if elapsed > 0:
+                docs_per_second.observe(len(bucket) / elapsed, model=self.model_name, length=_length_label(lengths[bucket[-1]]))
+            if results is None:
+                results = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+            results[bucket] = vectors
+        return results
+
+    def _buckets(self, order: List[int], lengths: List[int]) -> Iterator[List[int]]:
+        # `order` está ordenado de menor a mayor: el último índice agregado es siempre el más largo del lote
+        bucket: List[int] = []
+        for i in order:
+            if bucket and (len(bucket) + 1) * lengths[i] > self.token_budget:
+                yield bucket
+                bucket = []
+            bucket.append(i)
+        if bucket:
+            yield bucket
@@ -51,3 +51,13 @@ class OllamaBasedEmbedding(EmbeddingInterface):
         """
         return self.model.embed_query(text)
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Vectoriza varias consultas en una sola pasada.
+
+        Args:
+            texts: Textos de consulta.
+
+        Returns:
+            Lista de vectores (uno por consulta).
+        """
+        return self.model.embed_documents(texts)
@@ -0,0 +1,196 @@
+"""Embeddings con ONNX Runtime en CPU.
+
+Exporta a ONNX el transformer de un modelo de Sentence Transformers (la
+primera vez; luego se reutiliza el archivo), opcionalmente lo cuantiza a int8
+de forma dinámica y lo ejecuta con `onnxruntime`. Aplica el mismo mean
+pooling y normalización L2 que el modelo original, por lo que los vectores son
+intercambiables con los de `HuggingfaceBasedEmbedding` para el mismo modelo.
+
+Dependencias:
+  - onnxruntime
+  - onnx
+  - transformers
+  - torch (solo para exportar el modelo la primera vez)
+
+Notas:
+  - Pensado para nodos solo-CPU: int8 reduce el tamaño del modelo ~4x y suele
+    duplicar el throughput frente a PyTorch fp32.
+  - `onnx_intra_op_threads` controla los hilos por inferencia (0 = los que
+    decida onnxruntime).
+"""
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import onnxruntime as ort
+from transformers import AutoTokenizer
+
+from app.application.processors.embeddings.interfaces.embedding_interface import EmbeddingInterface
+from app.configuration.environment_variables import environment_variables
+
+
+logger = logging.getLogger(__name__)
+
+MAX_SEQUENCE_LENGTH = 256
+BATCH_SIZE = 32
+
+
+class OnnxBasedEmbedding(EmbeddingInterface):
+    """Proveedor de embeddings que ejecuta el modelo exportado a ONNX.
+
+    Permite elegir el modelo vía `model_name` y si se usa la variante
+    cuantizada a int8 (`onnx_quantize`).
+    """
+    def __init__(self,
+                 model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+                 quantize: Optional[bool] = None,
+                 intra_op_threads: Optional[int] = None):
+        self.model_name = model_name
+        self.quantize = environment_variables.onnx_quantize if quantize is None else quantize
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+
+        model_path = self._ensure_model(Path(environment_variables.onnx_model_dir), model_name, self.quantize)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = (
+            environment_variables.onnx_intra_op_threads if intra_op_threads is None else intra_op_threads
+        )
+        options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Vectoriza una lista de documentos.
+
+        Args:
+            texts: Documentos a vectorizar.
+
+        Returns:
+            Lista de vectores (uno por documento).
+        """
+        return self.embed_documents_array(texts).tolist()
+
+    def embed_documents_array(self, texts: List[str]) -> np.ndarray:
+        """Vectoriza una lista de documentos y devuelve una matriz float32.
+
+        Args:
+            texts: Documentos a vectorizar.
+
+        Returns:
+            Matriz (N×D) con un vector por documento.
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        # Con `LengthBucketedEmbedding` los textos llegan ordenados por longitud, así que cada sub-lote tiene poco padding
+        return np.concatenate([
+            self._encode(texts[start:start + BATCH_SIZE])
+            for start in range(0, len(texts), BATCH_SIZE)
+        ])
+
+    def embed_query(self, text: str) -> List[float]:
+        """Vectoriza una consulta individual.
+
+        Args:
+            text: Texto de consulta.
+
+        Returns:
+            Vector de embeddings de la consulta.
+        """
+        return self._encode([text])[0].tolist()
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Vectoriza varias consultas en una sola pasada del modelo.
+
+        Args:
+            texts: Textos de consulta.
+
+        Returns:
+            Lista de vectores (uno por consulta).
+        """
+        return self.embed_documents(texts)
+
+    def token_lengths(self, texts: List[str]) -> List[int]:
+        """Cuenta tokens con el tokenizador del modelo, con el mismo truncado que `_encode`.
+
+        Args:
+            texts: Textos a medir.
+
+        Returns:
+            Cantidad de tokens de cada texto.
+        """
+        encoded = self.tokenizer(texts, truncation=True, max_length=MAX_SEQUENCE_LENGTH)
+        return [len(ids) for ids in encoded["input_ids"]]
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        encoded = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=MAX_SEQUENCE_LENGTH,
+            return_tensors="np"
+        )
+        inputs = {name: value.astype(np.int64) for name, value in encoded.items() if name in self.input_names}
+        token_embeddings = self.session.run(None, inputs)[0]
+
+        mask = encoded["attention_mask"][..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return (pooled / np.clip(norms, 1e-12, None)).astype(np.float32)
+
+    @staticmethod
+    def _ensure_model(model_dir: Path, model_name: str, quantize: bool) -> Path:
+        target_dir = model_dir / model_name.replace("/", "__")
+        target_dir.mkdir(parents=True, exist_ok=True)
+        fp32_path = target_dir / "model.onnx"
+        int8_path = target_dir / "model.int8.onnx"
+
+        if not fp32_path.exists():
+            logger.info("Exporting embedding model to ONNX", extra={"model_name": model_name})
+            OnnxBasedEmbedding._export(model_name, fp32_path)
+
+        if not quantize:
+            return fp32_path
+
+        if not int8_path.exists():
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            logger.info("Quantizing ONNX embedding model to int8", extra={"model_name": model_name})
+            with tempfile.NamedTemporaryFile(dir=target_dir, suffix=".onnx", delete=False) as tmp:
+                tmp_path = Path(tmp.name)
+            quantize_dynamic(str(fp32_path), str(tmp_path), weight_type=QuantType.QInt8)
+            os.replace(tmp_path, int8_path)
+        return int8_path
+
+    @staticmethod
+    def _export(model_name: str, output_path: Path) -> None:
+        import torch
+        from transformers import AutoModel
+
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModel.from_pretrained(model_name)
+        model.eval()
+
+        sample = tokenizer(["ejemplo de exportación"], return_tensors="pt")
+        input_names = list(sample.keys())
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+        # Se exporta a un archivo temporal y se renombra, para que otro proceso nunca lea un modelo a medias
+        with tempfile.NamedTemporaryFile(dir=output_path.parent, suffix=".onnx", delete=False) as tmp:
+            tmp_path = Path(tmp.name)
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                tuple(sample[name] for name in input_names),
+                str(tmp_path),
+                input_names=input_names,
+                output_names=["last_hidden_state"],
+                dynamic_axes=dynamic_axes,
+                opset_version=17,
+                dynamo=False
+            )
+        os.replace(tmp_path, output_path)
@@ -0,0 +1,212 @@
+"""Embeddings repartidos entre varios procesos.
+
+Para ingestas masivas en nodos con muchos núcleos, un único intérprete con un
+único runtime de torch no aprovecha la máquina. `ProcessPoolEmbedding` reparte
+cada llamada a `embed_documents` entre `embedding_process_workers` procesos;
+cada uno carga el modelo una sola vez al arrancar y lo reutiliza en todas las
+llamadas.
+
+Los vectores no vuelven como listas de floats serializadas: el proceso padre
+reserva un bloque de memoria compartida de ``len(texts) × dimensión`` float32 y
+cada worker escribe sus filas directamente en él; al padre sólo le llega la
+confirmación.
+
+Notas:
+  - Cada worker limita torch/OpenMP a ``núcleos / workers`` hilos para no
+    competir con los demás. Con ONNX conviene fijar `onnx_intra_op_threads`
+    con el mismo criterio.
+  - La agrupación por longitud (`LengthBucketedEmbedding`) se aplica dentro de
+    cada worker, sobre su parte del lote.
+  - Con `ingestion_embed_workers` > 1 varios lotes de ingesta comparten el pool
+    a la vez, lo que mantiene ocupados a los workers mientras el padre persiste.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Optional
+
+import numpy as np
+
+from app.application.processors.embeddings.interfaces.embedding_interface import EmbeddingInterface
+
+
+logger = logging.getLogger(__name__)
+
+# Por debajo de este tamaño el costo de repartir supera al de vectorizar
+MIN_TEXTS_PER_SHARD = 16
+
+_worker_embedding: Optional[EmbeddingInterface] = None
+
+
+def _load_worker_embedding(method: str, model_name: str, device: Optional[str], threads: int) -> None:
+    """Inicializador de cada worker: limita los hilos y carga el modelo una vez."""
+    global _worker_embedding
+    for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[variable] = str(threads)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+    from app.application.processors.embeddings.embeddings_factory import EmbeddingsFactory
+    _worker_embedding = EmbeddingsFactory().get_embedding(method, model_name, device, in_process=True)
+
+
+def _worker_dimension() -> int:
+    return len(_worker_embedding.embed_query("dimension"))
+
+
+def _embed_shard(shm_name: str, rows: int, dimension: int, indices: List[int], texts: List[str], queries: bool) -> int:
+    """Vectoriza una parte del lote y escribe sus filas en la memoria compartida del padre."""
+    vectors = _worker_embedding.embed_queries(texts) if queries else _worker_embedding.embed_documents_array(texts)
+    shm = SharedMemory(name=shm_name)
+    try:
+        output = np.ndarray((rows, dimension), dtype=np.float32, buffer=shm.buf)
+        output[indices] = vectors
+        del output
+    finally:
+        shm.close()
+    return len(indices)
+
+
+class ProcessPoolEmbedding(EmbeddingInterface):
+    """Proveedor que vectoriza en un pool de procesos con un modelo cargado por proceso.
+
+    Args:
+        method: Método de embeddings que cargan los workers (p. ej. "huggingface").
+        model_name: Modelo a cargar en cada worker.
+        device: Dispositivo de inferencia, si el proveedor lo admite.
+        workers: Cantidad de procesos.
+    """
+    def __init__(self, method: str, model_name: str, device: Optional[str], workers: int):
+        self.method = method
+        self.model_name = model_name
+        self.device = device
+        self.workers = max(1, workers)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._dimension: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Vectoriza documentos repartiéndolos entre los procesos.
+
+        Args:
+            texts: Documentos a vectorizar.
+
+        Returns:
+            Lista de vectores en el mismo orden que `texts`.
+        """
+        return self._embed_sharded(texts, queries=False).tolist()
+
+    def embed_documents_array(self, texts: List[str]) -> np.ndarray:
+        """Igual que `embed_documents`, pero devuelve una matriz float32 (N×D).
+
+        Args:
+            texts: Documentos a vectorizar.
+
+        Returns:
+            Matriz con un vector por documento, en el mismo orden que `texts`.
+        """
+        return self._embed_sharded(texts, queries=False)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Vectoriza una consulta en uno de los procesos.
+
+        Args:
+            text: Texto de consulta.
+
+        Returns:
+            Vector de embeddings de la consulta.
+        """
+        return self._embed_sharded([text], queries=True)[0].tolist()
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Vectoriza varias consultas repartiéndolas entre los procesos.
+
+        Args:
+            texts: Textos de consulta.
+
+        Returns:
+            Lista de vectores en el mismo orden que `texts`.
+        """
+        return self._embed_sharded(texts, queries=True).tolist()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def _embed_sharded(self, texts: List[str], queries: bool) -> np.ndarray:
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        pool, dimension = self._get_pool()
+        shard_count = max(1, min(self.workers, len(texts) // MIN_TEXTS_PER_SHARD))
+        # Reparto intercalado sobre el orden por longitud: cada worker recibe una mezcla equivalente de textos cortos y largos
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        shards = [order[k::shard_count] for k in range(shard_count)]
+
+        shm = SharedMemory(create=True, size=len(texts) * dimension * np.dtype(np.float32).itemsize)
+        try:
+            futures: List[Future] = [
+                pool.submit(_embed_shard, shm.name, len(texts), dimension, shard, [texts[i] for i in shard], queries)
+                for shard in shards
+            ]
+            try:
+                for future in futures:
+                    future.result()
+            except BrokenProcessPool:
+                logger.exception("Embedding worker process died", extra={"method": self.method, "model_name": self.model_name})
+                self._discard_pool(pool)
+                raise
+            finally:
+                for future in futures:
+                    future.cancel()
+
+            output = np.ndarray((len(texts), dimension), dtype=np.float32, buffer=shm.buf)
+            # Una sola copia en bloque antes de liberar la memoria compartida
+            vectors = output.copy()
+            del output
+            return vectors
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def _get_pool(self) -> tuple[ProcessPoolExecutor, int]:
+        with self._lock:
+            if self._pool is None:
+                threads = max(1, (os.cpu_count() or 1) // self.workers)
+                logger.info("Starting embedding worker processes", extra={
+                    "method": self.method,
+                    "model_name": self.model_name,
+                    "workers": self.workers,
+                    "threads_per_worker": threads
+                })
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_load_worker_embedding,
+                    initargs=(self.method, self.model_name, self.device, threads)
+                )
+            if self._dimension is None:
+                try:
+                    self._dimension = self._pool.submit(_worker_dimension).result()
+                except BrokenProcessPool:
+                    # El modelo no pudo cargarse en los workers; se reintenta con un pool nuevo en la próxima llamada
+                    self._pool.shutdown(wait=False, cancel_futures=True)
+                    self._pool = None
+                    raise
+            return self._pool, self._dimension
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> None:
+        # El siguiente llamado levanta un pool nuevo en lugar de fallar para siempre
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,119 @@
+"""Micro-batching dinámico de consultas de embeddings.
+
+Agrupa las consultas que llegan de forma concurrente dentro de una ventana
+corta (`max_wait_ms`) o hasta completar `max_batch_size`, las vectoriza en una
+sola pasada del modelo y devuelve a cada petición su vector.
+
+Notas:
+  - La pasada del modelo se ejecuta fuera del event loop, en el executor
+    indicado (por defecto el executor de CPU del proceso).
+  - Sólo hay un lote en vuelo por batcher: mientras se calcula, las nuevas
+    consultas se acumulan para el lote siguiente.
+"""
+import asyncio
+import logging
+from typing import Callable, List, Optional, Tuple
+
+from app.application.processors.embeddings.interfaces.embedding_interface import EmbeddingInterface
+from app.infrastructure.executors.bounded_executor import BoundedExecutor
+from app.infrastructure.executors.executors import get_cpu_executor
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryEmbeddingBatcher:
+    """Agrupa llamadas concurrentes a `embed_query` en lotes.
+
+    Args:
+        embedding_provider: Devuelve el proveedor de embeddings a usar en cada lote.
+        max_batch_size: Máximo de consultas por lote.
+        max_wait_ms: Tiempo máximo de espera desde la primera consulta del lote.
+        executor: Executor donde se ejecuta la pasada del modelo.
+    """
+    def __init__(self,
+                 embedding_provider: Callable[[], EmbeddingInterface],
+                 max_batch_size: int = 32,
+                 max_wait_ms: float = 3.0,
+                 executor: Optional[BoundedExecutor] = None):
+        self.embedding_provider = embedding_provider
+        self.executor = executor or get_cpu_executor()
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def embed_query(self, text: str) -> List[float]:
+        """Vectoriza una consulta compartiendo la pasada del modelo con otras concurrentes.
+
+        Args:
+            text: Texto de consulta.
+
+        Returns:
+            Vector de embeddings de la consulta.
+        """
+        self._ensure_worker()
+        future = self._loop.create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            batch = [(text, future) for text, future in batch if not future.cancelled()]
+            if not batch:
+                continue
+
+            texts = [text for text, _ in batch]
+            try:
+                vectors = await self.executor.run(self._embed, texts)
+            except Exception as e:
+                logger.exception("Failed embedding query batch", extra={"batch_size": len(batch)})
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            logger.debug("Query batch embedded", extra={"batch_size": len(batch)})
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        return self.embedding_provider().embed_queries(texts)
+
+    async def _collect(self) -> List[Tuple[str, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
@@ -0,0 +1,154 @@
+"""Caché de vectores de consulta.
+
+Los usuarios de chat repiten la misma pregunta (o casi la misma) con
+frecuencia; esta caché evita volver a vectorizarla. La clave es (modelo de
+embeddings resuelto y su versión, texto normalizado): Unicode NFKC, minúsculas, espacios colapsados y
+sin signos de puntuación en los extremos, de modo que "¿Qué es X?" y
+"qué es x" comparten vector.
+
+Niveles:
+  - Memoria: LRU acotada por número de entradas y con TTL por entrada.
+  - Compartido (opcional): `EmbeddingCacheStore` con expiración propia (Redis
+    entre workers, o un almacén en memoria acotado como sustituto local en pruebas).
+
+Métricas:
+  - query_embedding_cache_hits_total{model, tier}
+  - query_embedding_cache_misses_total{model}
+  - query_embedding_cache_hit_ratio{model}
+  - query_embedding_cache_saved_seconds_total{model}: tiempo de vectorización
+    ahorrado, estimado con la media móvil de lo que tardan los fallos.
+"""
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.configuration.metrics_registry import metrics
+from app.infrastructure.executors.executors import get_io_executor
+from app.infrastructure.persistence.caches.embedding_cache_store import EmbeddingCacheStore
+
+
+query_cache_hits = metrics.counter("query_embedding_cache_hits_total", "Query embeddings served from cache")
+query_cache_misses = metrics.counter("query_embedding_cache_misses_total", "Query embeddings computed by the model")
+query_cache_hit_ratio = metrics.gauge("query_embedding_cache_hit_ratio", "Fraction of query embeddings served from cache")
+query_cache_saved_seconds = metrics.counter("query_embedding_cache_saved_seconds_total", "Estimated embedding time saved by the query cache")
+
+# Peso de cada nueva medición en la media móvil de la latencia de los fallos
+LATENCY_SMOOTHING = 0.1
+
+_WHITESPACE = re.compile(r"\s+")
+_EDGE_PUNCTUATION = " \t\n?¿!¡.,;:"
+
+
+def normalize_question(question: str) -> str:
+    normalized = unicodedata.normalize("NFKC", question).casefold()
+    return _WHITESPACE.sub(" ", normalized).strip(_EDGE_PUNCTUATION)
+
+
+class QueryEmbeddingCache:
+    """Caché de dos niveles (LRU con TTL en memoria + almacén compartido opcional).
+
+    Args:
+        store: Almacén compartido entre procesos; `None` deja sólo el nivel en memoria.
+        max_entries: Máximo de vectores retenidos en memoria.
+        ttl_seconds: Vida de cada entrada en memoria; 0 las conserva hasta que la LRU las desaloje.
+    """
+    def __init__(self, store: Optional[EmbeddingCacheStore], max_entries: int = 10000, ttl_seconds: float = 3600):
+        self.store = store
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, Tuple[float, List[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._lookups: Dict[str, List[int]] = {}
+        self._miss_seconds: Dict[str, float] = {}
+
+    async def get_or_embed(self,
+                           model: str,
+                           question: str,
+                           embed: Callable[[str], Awaitable[List[float]]]) -> List[float]:
+        """Devuelve el vector cacheado de la pregunta o lo calcula con `embed` y lo guarda.
+
+        Args:
+            model: Modelo de embeddings resuelto con su versión (particiona la caché), ver
+                `EmbeddingsFactory.model_version`.
+            question: Pregunta tal como la envió el usuario.
+            embed: Corrutina que vectoriza la pregunta en caso de fallo.
+
+        Returns:
+            Vector de embeddings de la pregunta.
+        """
+        key = self._key(model, question)
+
+        vector = self._get_memory(key)
+        if vector is not None:
+            self._record_hit(model, "memory")
+            return vector
+
+        if self.store is not None:
+            stored = await get_io_executor().run(self.store.get_many, [key])
+            if key in stored:
+                vector = stored[key].tolist()
+                self._remember(key, vector)
+                self._record_hit(model, "shared")
+                return vector
+
+        start = time.perf_counter()
+        vector = await embed(question)
+        self._record_miss(model, time.perf_counter() - start)
+
+        self._remember(key, vector)
+        if self.store is not None:
+            await get_io_executor().run(self.store.put_many, {key: np.asarray(vector, dtype=np.float32)})
+        return vector
+
+    def _get_memory(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            expires_at, vector = entry
+            if expires_at and expires_at < time.monotonic():
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            return vector
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds > 0 else 0.0
+        with self._lock:
+            self._memory[key] = (expires_at, vector)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _record_hit(self, model: str, tier: str) -> None:
+        query_cache_hits.inc(model=model, tier=tier)
+        with self._lock:
+            saved = self._miss_seconds.get(model, 0.0)
+        if saved:
+            query_cache_saved_seconds.inc(saved, model=model)
+        self._update_ratio(model, hit=True)
+
+    def _record_miss(self, model: str, seconds: float) -> None:
+        query_cache_misses.inc(model=model)
+        with self._lock:
+            previous = self._miss_seconds.get(model)
+            self._miss_seconds[model] = seconds if previous is None else previous + LATENCY_SMOOTHING * (seconds - previous)
+        self._update_ratio(model, hit=False)
+
+    def _update_ratio(self, model: str, hit: bool) -> None:
+        with self._lock:
+            counts = self._lookups.setdefault(model, [0, 0])
+            counts[0] += int(hit)
+            counts[1] += 1
+            ratio = counts[0] / counts[1]
+        query_cache_hit_ratio.set(ratio, model=model)
+
+    @staticmethod
+    def _key(model: str, question: str) -> str:
+        return f"{model}:{hashlib.sha256(normalize_question(question).encode('utf-8')).hexdigest()}"
@@ -14,6 +14,8 @@ Notas:
   - Los modelos se descargan automáticamente al primer uso.
 """
 from typing import List
+
+import numpy as np
 from sentence_transformers import SentenceTransformer
 from app.application.processors.embeddings.interfaces.embedding_interface import EmbeddingInterface
 
@@ -36,7 +38,20 @@ class SentenceTransformerBasedEmbedding(EmbeddingInterface):
         Returns:
             Lista de vectores.
         """
-        return self.model.encode(texts, convert_to_numpy=True).tolist()
+        return self.embed_documents_array(texts).tolist()
+
+    def embed_documents_array(self, texts: List[str]) -> np.ndarray:
+        """Vectoriza múltiples documentos y devuelve una matriz float32.
+
+        Args:
+            texts: Documentos a vectorizar.
+
+        Returns:
+            Matriz (N×D) con un vector por documento.
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.ascontiguousarray(self.model.encode(texts, convert_to_numpy=True), dtype=np.float32)
 
     def embed_query(self, text: str) -> List[float]:
         """Vectoriza una consulta.
@@ -49,3 +64,25 @@ class SentenceTransformerBasedEmbedding(EmbeddingInterface):
         """
         return self.model.encode(text, convert_to_numpy=True).tolist()
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Vectoriza varias consultas en una sola pasada del modelo.
+
+        Args:
+            texts: Textos de consulta.
+
+        Returns:
+            Lista de vectores (uno por consulta).
+        """
+        return self.model.encode(texts, convert_to_numpy=True).tolist()
+
+    def token_lengths(self, texts: List[str]) -> List[int]:
+        """Cuenta tokens con el tokenizador del modelo, truncando como lo hace el modelo.
+
+        Args:
+            texts: Textos a medir.
+
+        Returns:
+            Cantidad de tokens de cada texto.
+        """
+        encoded = self.model.tokenizer(texts, truncation=True, max_length=self.model.max_seq_length)
+        return [len(ids) for ids in encoded["input_ids"]]
@@ -16,6 +16,8 @@ Notas:
   - Algunos modelos requieren descargar vectores: `python -m spacy download ...`.
 """
 from typing import List
+
+import numpy as np
 import spacy
 from app.application.processors.embeddings.interfaces.embedding_interface import EmbeddingInterface
 
@@ -40,6 +42,19 @@ class SpacyBasedEmbedding(EmbeddingInterface):
         """
         return [self.nlp(text).vector.tolist() for text in texts]
 
+    def embed_documents_array(self, texts: List[str]) -> np.ndarray:
+        """Vectoriza múltiples documentos y devuelve una matriz float32.
+
+        Args:
+            texts: Documentos a vectorizar.
+
+        Returns:
+            Matriz (N×D) con un vector por documento.
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.stack([doc.vector for doc in self.nlp.pipe(texts)]).astype(np.float32, copy=False)
+
     def embed_query(self, text: str) -> List[float]:
         """Vectoriza una consulta con el pipeline de spaCy.
 
@@ -51,3 +66,13 @@ class SpacyBasedEmbedding(EmbeddingInterface):
         """
         return self.nlp(text).vector.tolist()
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Vectoriza varias consultas en una sola pasada del pipeline.
+
+        Args:
+            texts: Textos de consulta.
+
+        Returns:
+            Lista de vectores (uno por consulta).
+        """
+        return [doc.vector.tolist() for doc in self.nlp.pipe(texts)]
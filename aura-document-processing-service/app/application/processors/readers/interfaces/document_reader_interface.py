@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
+from typing import Iterator
 
 
 class DocumentReaderInterface(ABC):
@@ -11,4 +12,8 @@ class DocumentReaderInterface(ABC):
     @abstractmethod
     def read(self, file_path: Path) -> str:
         """Extrae texto del archivo."""
-        pass
\ No newline at end of file
+        pass
+
+    def iter_pages(self, file_path: Path) -> Iterator[str]:
+        """Extrae texto página a página; por defecto el archivo completo es una única página."""
+        yield self.read(file_path)
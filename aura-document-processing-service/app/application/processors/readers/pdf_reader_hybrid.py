@@ -0,0 +1,109 @@
+import logging
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+import pypdf
+
+from app.application.processors.readers.interfaces.document_reader_interface import DocumentReaderInterface
+from app.application.processors.readers.pdf_scanned_reader import PDFReaderScanned
+from app.configuration.environment_variables import environment_variables
+
+
+logger = logging.getLogger(__name__)
+
+
+class PDFReaderHybrid(DocumentReaderInterface):
+    """Lector para PDFs digitales, escaneados o mixtos.
+
+    Extrae la capa de texto de cada página con pypdf y envía a OCR solo las
+    páginas cuyo texto extraíble no llega a ``pdf_min_text_chars_per_page``
+    caracteres. El texto final respeta el orden de las páginas.
+
+    `iter_pages` recorre el documento en ventanas de ``ocr_max_in_flight_pages``
+    páginas, de modo que nunca retiene más que una ventana en memoria.
+    """
+
+    def __init__(self, scanned_reader: Optional[PDFReaderScanned] = None):
+        self.scanned_reader = scanned_reader or PDFReaderScanned()
+
+    def can_handle(self, file_path: Path) -> bool:
+        return file_path.suffix.lower() == ".pdf"
+
+    def read(self, file_path: Path) -> str:
+        if not file_path.exists():
+            raise FileNotFoundError(f"El archivo no existe: {file_path}")
+
+        if not self.can_handle(file_path):
+            raise ValueError(f"Formato no soportado por PDFReaderHybrid: {file_path.suffix}")
+
+        try:
+            page_texts = self._extract_text_layer(file_path)
+        except Exception as e:
+            raise IOError(f"Error al leer el archivo PDF {file_path}: {e}")
+
+        ocr_pages = self._apply_ocr(file_path, page_texts)
+        logger.info("PDF text layer inspected", extra={
+            "file": file_path.name,
+            "pages": len(page_texts),
+            "ocr_pages": ocr_pages
+        })
+
+        text_parts = [page_texts[page] for page in sorted(page_texts) if page_texts[page]]
+        if not text_parts:
+            raise ValueError("No se extrajo texto del PDF ni mediante OCR.")
+
+        return "\n\n".join(text_parts)
+
+    def iter_pages(self, file_path: Path) -> Iterator[str]:
+        if not file_path.exists():
+            raise FileNotFoundError(f"El archivo no existe: {file_path}")
+
+        window = max(1, environment_variables.ocr_max_in_flight_pages)
+        try:
+            with open(file_path, "rb") as file:
+                pdf_reader = pypdf.PdfReader(file)
+                page_count = len(pdf_reader.pages)
+                for first_page in range(1, page_count + 1, window):
+                    page_texts = {
+                        page_num: (pdf_reader.pages[page_num - 1].extract_text() or "").strip()
+                        for page_num in range(first_page, min(first_page + window, page_count + 1))
+                    }
+                    self._apply_ocr(file_path, page_texts)
+                    for page_num in sorted(page_texts):
+                        yield page_texts[page_num]
+        except IOError:
+            raise
+        except Exception as e:
+            raise IOError(f"Error al leer el archivo PDF {file_path}: {e}")
+
+    def _apply_ocr(self, file_path: Path, page_texts: Dict[int, str]) -> int:
+        """Reemplaza en `page_texts` el texto de las páginas con poca capa de texto por su OCR.
+
+        Returns:
+            Cantidad de páginas enviadas a OCR.
+        """
+        min_chars = environment_variables.pdf_min_text_chars_per_page
+        scanned_pages = [page for page, text in page_texts.items() if len(text) < min_chars]
+        if not scanned_pages:
+            return 0
+
+        try:
+            ocr_texts = self.scanned_reader.read_pages(file_path, scanned_pages)
+        except Exception as e:
+            raise IOError(
+                f"Error al aplicar OCR al archivo PDF {file_path}. "
+                f"¿Está Tesseract/Poppler instalado y configurado? Error: {e}"
+            )
+        for page, text in zip(scanned_pages, ocr_texts):
+            # Si el OCR no mejora la capa de texto, se conserva la original
+            if len(text) > len(page_texts[page]):
+                page_texts[page] = text
+        return len(scanned_pages)
+
+    @staticmethod
+    def _extract_text_layer(file_path: Path) -> Dict[int, str]:
+        with open(file_path, "rb") as file:
+            pdf_reader = pypdf.PdfReader(file)
+            return {
+                page_num: (page.extract_text() or "").strip()
+                for page_num, page in enumerate(pdf_reader.pages, 1)
+            }
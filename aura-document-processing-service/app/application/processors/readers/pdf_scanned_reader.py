@@ -1,12 +1,147 @@
+import logging
 import os
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from pdf2image import convert_from_path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from pdf2image import convert_from_path, pdfinfo_from_path
 import pytesseract
 
 from app.application.processors.readers.interfaces.document_reader_interface import DocumentReaderInterface
+from app.configuration.environment_variables import environment_variables
+from app.configuration.metrics_registry import metrics
+from app.infrastructure.executors.executors import get_ocr_process_pool
+
+
+logger = logging.getLogger(__name__)
+
+RSS_SAMPLE_INTERVAL_SECONDS = 0.1
+
+ocr_pages = metrics.counter("ocr_pages_total", "Pages processed by OCR")
+ocr_pages_per_second = metrics.summary("ocr_pages_per_second", "OCR throughput per document")
+ocr_peak_rss = metrics.gauge("ocr_peak_rss_bytes", "Peak total RSS of the OCR workers and their poppler/tesseract children during the last document")
+
+
+def _process_rss_bytes(pid: int) -> int:
+    # RSS actual: columna 2 de /proc/<pid>/statm, en páginas
+    try:
+        with open(f"/proc/{pid}/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _children_by_parent() -> Dict[int, List[int]]:
+    children: Dict[int, List[int]] = defaultdict(list)
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return children
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as stat:
+                # El nombre del proceso va entre paréntesis y puede contener espacios: el ppid sigue al último ')'
+                ppid = int(stat.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children[ppid].append(int(entry))
+    return children
+
+
+def _process_tree_rss_bytes(root_pids: Iterable[int]) -> int:
+    """RSS sumado de los procesos indicados y todos sus descendientes (0 fuera de Linux)."""
+    children = _children_by_parent()
+    total = 0
+    pending = list(root_pids)
+    seen = set()
+    while pending:
+        pid = pending.pop()
+        if pid in seen:
+            continue
+        seen.add(pid)
+        total += _process_rss_bytes(pid)
+        pending.extend(children.get(pid, ()))
+    return total
+
+
+class _PoolRssSampler:
+    """Muestrea en segundo plano el RSS total del pool de OCR y guarda el máximo observado.
+
+    Suma los workers del pool y sus hijos (pdftoppm, tesseract), así que las
+    tareas que corren en paralelo cuentan juntas. El pool es compartido: si
+    otro documento se procesa a la vez, su memoria también entra en el pico.
+    """
+
+    def __init__(self, pool: ProcessPoolExecutor, interval: float = RSS_SAMPLE_INTERVAL_SECONDS):
+        self.pool = pool
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="ocr-rss-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+    def sample(self) -> None:
+        # `_processes` es interno de ProcessPoolExecutor pero es la única forma de conocer los pids de los workers
+        worker_pids = list((getattr(self.pool, "_processes", None) or {}).keys())
+        if worker_pids:
+            self.peak_bytes = max(self.peak_bytes, _process_tree_rss_bytes(worker_pids))
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self.interval)
+
+
+def _ocr_pages(file_path: str,
+               first_page: int,
+               last_page: int,
+               dpi: int,
+               language: str,
+               poppler_path: Optional[str],
+               tesseract_cmd: Optional[str]) -> List[str]:
+    """Rasteriza y aplica OCR a un rango de páginas dentro del proceso worker.
+
+    Solo el rango pedido se convierte a imagen, así que la memoria del worker
+    queda acotada por ``last_page - first_page + 1`` páginas.
+    """
+    if tesseract_cmd:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+    images = convert_from_path(
+        file_path,
+        dpi=dpi,
+        first_page=first_page,
+        last_page=last_page,
+        poppler_path=poppler_path
+    )
+    texts = []
+    for image in images:
+        texts.append(pytesseract.image_to_string(image, lang=language).strip())
+        image.close()
+    return texts
 
 
 class PDFReaderScanned(DocumentReaderInterface):
+    """Lector OCR para PDFs escaneados.
+
+    Divide el documento en rangos de ``ocr_pages_per_task`` páginas que se
+    rasterizan y reconocen en el pool de procesos de OCR. Nunca hay más de
+    ``ocr_max_in_flight_pages`` páginas enviadas sin recoger, lo que acota la
+    memoria pico independientemente del tamaño del documento; los resultados
+    se recogen en orden de página.
+    """
+
     def __init__(self, tesseract_path=None, poppler_path=None):
         self.tesseract_path = tesseract_path or r"C:\Program Files\Tesseract-OCR\tesseract.exe"
         self.poppler_path = poppler_path or r"C:\Program Files\poppler-25.07.0\Library\bin"
@@ -24,14 +159,8 @@ class PDFReaderScanned(DocumentReaderInterface):
         if not self.can_handle(file_path):
             raise ValueError(f"Formato no soportado por PDFReaderScanned: {file_path.suffix}")
 
-        all_text = []
         try:
-            pages = convert_from_path(str(file_path), dpi=300, poppler_path=self.poppler_path)
-
-            for i, page in enumerate(pages, start=1):
-                text = pytesseract.image_to_string(page, lang="spa")
-                if text.strip():
-                    all_text.append(text.strip())
+            all_text = [text for text in self.read_pages(file_path) if text]
 
             if not all_text:
                 raise ValueError("No se extrajo texto mediante OCR.")
@@ -43,3 +172,74 @@ class PDFReaderScanned(DocumentReaderInterface):
                 f"Error al aplicar OCR al archivo PDF {file_path}. "
                 f"¿Está Tesseract/Poppler instalado y configurado? Error: {e}"
             )
+
+    def read_pages(self, file_path: Path, pages: Optional[List[int]] = None) -> List[str]:
+        """Aplica OCR a las páginas indicadas (1-based, todas por defecto) y devuelve su texto en orden."""
+        return list(self.iter_pages(file_path, pages))
+
+    def iter_pages(self, file_path: Path, pages: Optional[List[int]] = None) -> Iterator[str]:
+        """Igual que `read_pages`, pero entrega cada página en cuanto su rango termina."""
+        poppler_path = self.poppler_path if os.path.exists(self.poppler_path) else None
+        tesseract_cmd = self.tesseract_path if os.path.exists(self.tesseract_path) else None
+        if pages is None:
+            page_count = pdfinfo_from_path(str(file_path), poppler_path=poppler_path)["Pages"]
+            pages = list(range(1, page_count + 1))
+
+        ranges = self._page_ranges(pages, environment_variables.ocr_pages_per_task)
+        max_in_flight_tasks = max(1, environment_variables.ocr_max_in_flight_pages // environment_variables.ocr_pages_per_task)
+        pool = get_ocr_process_pool()
+
+        start = time.perf_counter()
+        page_total = 0
+        in_flight = deque()
+        next_range = 0
+        sampler = _PoolRssSampler(pool)
+        sampler.start()
+        try:
+            while next_range < len(ranges) or in_flight:
+                while next_range < len(ranges) and len(in_flight) < max_in_flight_tasks:
+                    first_page, last_page = ranges[next_range]
+                    in_flight.append(pool.submit(
+                        _ocr_pages,
+                        str(file_path),
+                        first_page,
+                        last_page,
+                        environment_variables.ocr_dpi,
+                        environment_variables.ocr_language,
+                        poppler_path,
+                        tesseract_cmd
+                    ))
+                    next_range += 1
+
+                range_texts = in_flight.popleft().result()
+                page_total += len(range_texts)
+                yield from range_texts
+        finally:
+            # Si el consumidor abandona la iteración no se siguen procesando páginas
+            for future in in_flight:
+                future.cancel()
+            sampler.stop()
+
+        peak_rss = sampler.peak_bytes
+        elapsed = time.perf_counter() - start
+        pages_per_second = page_total / elapsed if elapsed > 0 else 0.0
+        ocr_pages.inc(page_total)
+        ocr_pages_per_second.observe(pages_per_second)
+        ocr_peak_rss.set(peak_rss)
+        logger.info("OCR completed", extra={
+            "file": file_path.name,
+            "pages": page_total,
+            "pages_per_second": round(pages_per_second, 2),
+            "peak_rss_mb": round(peak_rss / (1024 * 1024), 1)
+        })
+
+    @staticmethod
+    def _page_ranges(pages: List[int], pages_per_task: int) -> List[Tuple[int, int]]:
+        """Agrupa páginas consecutivas en rangos de como mucho ``pages_per_task`` páginas."""
+        ranges: List[Tuple[int, int]] = []
+        for page in sorted(pages):
+            if ranges and page == ranges[-1][1] + 1 and page - ranges[-1][0] < pages_per_task:
+                ranges[-1] = (ranges[-1][0], page)
+            else:
+                ranges.append((page, page))
+        return ranges
@@ -3,16 +3,15 @@ from typing import List
 
 from app.application.processors.readers.docx_reader import DOCXReader
 from app.application.processors.readers.interfaces.document_reader_interface import DocumentReaderInterface
-from app.application.processors.readers.pdf_reader_digital import PDFReaderDigital
-from app.application.processors.readers.pdf_scanned_reader import PDFReaderScanned
+from app.application.processors.readers.pdf_reader_hybrid import PDFReaderHybrid
 from app.application.processors.readers.txt_reader import TXTReader
+from app.configuration.environment_variables import environment_variables
 
 
 class ReaderFactory:
     def __init__(self):
         self._readers: List[DocumentReaderInterface] = [
-            PDFReaderDigital(),
-            PDFReaderScanned(),
+            PDFReaderHybrid(),
             DOCXReader(),
             TXTReader()
         ]
@@ -25,3 +24,11 @@ class ReaderFactory:
             except Exception:
                 continue
         raise ValueError(f"No se encontró lector compatible para el archivo: {file_path}")
+
+    @staticmethod
+    def settings_key() -> str:
+        # Configuración que cambia el texto extraído: umbral de capa de texto y parámetros del OCR
+        return (
+            f"pdf{environment_variables.pdf_min_text_chars_per_page}"
+            f"-ocr{environment_variables.ocr_dpi}-{environment_variables.ocr_language}"
+        )
@@ -1,7 +1,12 @@
 from abc import ABC, abstractmethod
+from typing import Iterable, Iterator
 
 
 class TextCleanerInterface(ABC):
     @abstractmethod
     def clean_text(self, text: str) -> str:
         pass
+
+    def clean_pages(self, pages: Iterable[str]) -> Iterator[str]:
+        for page in pages:
+            yield self.clean_text(page)
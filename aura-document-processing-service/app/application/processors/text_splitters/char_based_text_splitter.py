@@ -13,12 +13,22 @@ Notas:
   - No requiere modelos ni tokenizadores externos.
 """
 
+from functools import lru_cache
 from langchain_text_splitters import CharacterTextSplitter
 from typing import List
 
 from app.application.processors.text_splitters.interfaces.text_splitter_interface import TextSplitterInterface
 
 
+@lru_cache(maxsize=8)
+def _build_splitter(size: int, overlap: int) -> CharacterTextSplitter:
+    return CharacterTextSplitter(
+        chunk_size=size,
+        chunk_overlap=overlap,
+        separator="\n"
+    )
+
+
 class CharBasedTextSplitter(TextSplitterInterface):
     """Splitter basado en conteo de caracteres.
 
@@ -36,9 +46,4 @@ class CharBasedTextSplitter(TextSplitterInterface):
         Returns:
             Lista de fragmentos de texto.
         """
-        splitter = CharacterTextSplitter(
-            chunk_size=size,
-            chunk_overlap=overlap,
-            separator="\n"
-        )
-        return splitter.split_text(text)
\ No newline at end of file
+        return _build_splitter(size, overlap).split_text(text)
\ No newline at end of file
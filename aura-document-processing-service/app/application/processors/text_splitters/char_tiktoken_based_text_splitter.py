@@ -14,12 +14,26 @@ Notes:
   - A diferencia del enfoque por caracteres, respeta límites de tokens.
 """
 
+from functools import lru_cache
 from langchain_text_splitters import CharacterTextSplitter
 from typing import List
 
 from app.application.processors.text_splitters.interfaces.text_splitter_interface import TextSplitterInterface
 
 
+ENCODING_NAME = "cl100k_base"
+
+
+@lru_cache(maxsize=8)
+def _build_splitter(size: int, overlap: int, encoding_name: str = ENCODING_NAME) -> CharacterTextSplitter:
+    return CharacterTextSplitter.from_tiktoken_encoder(
+        encoding_name=encoding_name,
+        chunk_size=size,
+        chunk_overlap=overlap,
+        separator="\n"
+    )
+
+
 class CharTiktokenBasedTextSplitter(TextSplitterInterface):
     """Splitter basado en `tiktoken` para conteo real de tokens.
 
@@ -37,10 +51,4 @@ class CharTiktokenBasedTextSplitter(TextSplitterInterface):
         Returns:
             Lista de fragmentos de texto.
         """
-        splitter = CharacterTextSplitter.from_tiktoken_encoder(
-            encoding_name="cl100k_base",
-            chunk_size=size,
-            chunk_overlap=overlap,
-            separator="\n"
-        )
-        return splitter.split_text(text)
\ No newline at end of file
+        return _build_splitter(size, overlap).split_text(text)
\ No newline at end of file
@@ -13,6 +13,7 @@ Notes:
   - Útil cuando se trabaja con modelos/embeddings de Hugging Face.
 """
 
+from functools import lru_cache
 from langchain_text_splitters import CharacterTextSplitter
 from transformers import GPT2TokenizerFast
 from typing import List
@@ -20,6 +21,24 @@ from typing import List
 from app.application.processors.text_splitters.interfaces.text_splitter_interface import TextSplitterInterface
 
 
+TOKENIZER_NAME = "gpt2"
+
+
+@lru_cache()
+def _load_tokenizer(tokenizer_name: str) -> GPT2TokenizerFast:
+    return GPT2TokenizerFast.from_pretrained(tokenizer_name)
+
+
+@lru_cache(maxsize=8)
+def _build_splitter(size: int, overlap: int, tokenizer_name: str = TOKENIZER_NAME) -> CharacterTextSplitter:
+    return CharacterTextSplitter.from_huggingface_tokenizer(
+        _load_tokenizer(tokenizer_name),
+        chunk_size=size,
+        chunk_overlap=overlap,
+        separator="\n"
+    )
+
+
 class HuggingfaceBasedTextSplitter(TextSplitterInterface):
     """Splitter que usa tokenizadores Hugging Face para contar tokens.
 
@@ -37,11 +56,4 @@ class HuggingfaceBasedTextSplitter(TextSplitterInterface):
         Returns:
             Lista de fragmentos de texto.
         """
-        tokenizer = GPT2TokenizerFast.from_pretrained("gpt2")
-        splitter = CharacterTextSplitter.from_huggingface_tokenizer(
-            tokenizer,
-            chunk_size=size,
-            chunk_overlap=overlap,
-            separator="\n"
-        )
-        return splitter.split_text(text)
+        return _build_splitter(size, overlap).split_text(text)
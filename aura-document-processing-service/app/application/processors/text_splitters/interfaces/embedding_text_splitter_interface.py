@@ -0,0 +1,49 @@
+"""
+Define la interfaz para divisores de texto que calculan embeddings durante la
+segmentación y pueden entregar el vector de cada fragmento junto con su texto.
+
+Uso principal:
+    - Evitar que la ingesta vuelva a vectorizar fragmentos cuyo embedding ya
+      se obtuvo al decidir los puntos de corte.
+"""
+
+from abc import abstractmethod
+from typing import Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from app.application.processors.text_splitters.interfaces.text_splitter_interface import TextSplitterInterface, locate_chunks
+from app.application.processors.text_splitters.text_chunk import TextChunk
+
+
+class EmbeddingTextSplitterInterface(TextSplitterInterface):
+    """
+    Interfaz abstracta para divisores de texto basados en embeddings.
+
+    Atributos:
+        embedding_method (str): Método de `EmbeddingsFactory` con el que se calculan los vectores.
+        model_name (str): Modelo de embeddings usado.
+
+    Métodos abstractos:
+        split_and_embed(text: str, size: int, overlap: int) -> Tuple[List[str], np.ndarray]:
+            Divide el texto y devuelve los fragmentos con una fila float32 (vector) por fragmento.
+
+    Métodos:
+        split_and_embed_pages(pages: Iterable[str], size: int, overlap: int) -> Iterator[Tuple[TextChunk, np.ndarray]]:
+            Igual que `split_and_embed`, página a página y con procedencia.
+    """
+    embedding_method: str
+    model_name: str
+
+    @abstractmethod
+    def split_and_embed(self, text: str, size: int, overlap: int) -> Tuple[List[str], np.ndarray]:
+        pass
+
+    def split_and_embed_pages(self,
+                              pages: Iterable[str],
+                              size: int,
+                              overlap: int) -> Iterator[Tuple[TextChunk, np.ndarray]]:
+        for page_number, page in enumerate(pages, start=1):
+            chunks, vectors = self.split_and_embed(page, size=size, overlap=overlap)
+            for chunk, vector, start_offset in zip(chunks, vectors, locate_chunks(page, chunks)):
+                yield TextChunk(text=chunk, page_number=page_number, start_offset=start_offset), vector
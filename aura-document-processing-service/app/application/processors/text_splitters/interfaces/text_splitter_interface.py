@@ -9,7 +9,9 @@ Uso principal:
 """
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterable, Iterator, List, Optional
+
+from app.application.processors.text_splitters.text_chunk import TextChunk
 
 
 class TextSplitterInterface(ABC):
@@ -20,6 +22,10 @@ class TextSplitterInterface(ABC):
         split_text(text: str, size: int, overlap: int) -> List[str]:
             Divide el texto en fragmentos según los parámetros especificados.
 
+    Métodos:
+        split_pages(pages: Iterable[str], size: int, overlap: int) -> Iterator[TextChunk]:
+            Divide página a página y entrega cada fragmento con su página y desplazamiento.
+
     Args:
         text (str): Texto a dividir.
         size (int): Tamaño máximo de cada fragmento.
@@ -30,4 +36,24 @@ class TextSplitterInterface(ABC):
     """
     @abstractmethod
     def split_text(self, text: str, size: int, overlap: int) -> List[str]:
-        pass
\ No newline at end of file
+        pass
+
+    def split_pages(self, pages: Iterable[str], size: int, overlap: int) -> Iterator[TextChunk]:
+        for page_number, page in enumerate(pages, start=1):
+            chunks = self.split_text(page, size=size, overlap=overlap)
+            for chunk, start_offset in zip(chunks, locate_chunks(page, chunks)):
+                yield TextChunk(text=chunk, page_number=page_number, start_offset=start_offset)
+
+
+def locate_chunks(page: str, chunks: List[str]) -> Iterator[Optional[int]]:
+    """Ubica cada fragmento dentro de su página, buscando a partir del fragmento anterior."""
+    cursor = 0
+    for chunk in chunks:
+        index = page.find(chunk, cursor)
+        if index < 0:
+            index = page.find(chunk)
+        if index < 0:
+            yield None
+            continue
+        cursor = index + 1
+        yield index
@@ -14,12 +14,25 @@ Notes:
   - No depende de embeddings para lograr cortes naturales.
 """
 
+from functools import lru_cache
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from typing import List
 
 from app.application.processors.text_splitters.interfaces.text_splitter_interface import TextSplitterInterface
 
 
+MODEL_NAME = "gpt-4"
+
+
+@lru_cache(maxsize=8)
+def _build_splitter(size: int, overlap: int, model_name: str = MODEL_NAME) -> RecursiveCharacterTextSplitter:
+    return RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+        model_name=model_name,
+        chunk_size=size,
+        chunk_overlap=overlap
+    )
+
+
 class RecursiveBasedTextSplitter(TextSplitterInterface):
     """Splitter recursivo con compatibilidad de tokenización.
 
@@ -37,9 +50,4 @@ class RecursiveBasedTextSplitter(TextSplitterInterface):
         Returns:
             Lista de fragmentos de texto.
         """
-        splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
-            model_name="gpt-4",
-            chunk_size=size,
-            chunk_overlap=overlap
-        )
-        return splitter.split_text(text)
+        return _build_splitter(size, overlap).split_text(text)
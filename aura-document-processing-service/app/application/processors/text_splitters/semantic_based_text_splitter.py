@@ -5,9 +5,9 @@ oraciones (via embeddings) para determinar puntos de corte naturales, generando
 fragmentos coherentes a nivel contextual.
 
 Dependencies:
-  - langchain-experimental
   - langchain-huggingface
   - sentence-transformers
+  - numpy
   - torch
 
 Notes:
@@ -15,21 +15,42 @@ Notes:
   - Ideal para RAG, búsqueda semántica y resúmenes contextuales.
   - Más costoso que enfoques por tokens o caracteres, pero produce cortes
     más significativos.
+  - El modelo de embeddings se obtiene de `EmbeddingsFactory`, por lo que se
+    comparte con la vectorización de la ingesta en lugar de cargarse de nuevo.
+  - Sigue el algoritmo de `SemanticChunker` (ventana de una oración a cada
+    lado, corte por percentil de distancias), pero conserva los embeddings de
+    las ventanas para derivar de ellos el vector de cada fragmento.
 """
 
-from langchain_experimental.text_splitter import SemanticChunker
-from langchain_huggingface import HuggingFaceEmbeddings
-from typing import Literal, List
+import re
+from typing import List, Tuple
 
-from app.application.processors.text_splitters.interfaces.text_splitter_interface import TextSplitterInterface
+import numpy as np
 
+from app.application.processors.embeddings.embeddings_factory import EmbeddingsFactory
+from app.application.processors.text_splitters.interfaces.embedding_text_splitter_interface import EmbeddingTextSplitterInterface
+from app.configuration.environment_variables import environment_variables
 
-class SemanticBasedTextSplitter(TextSplitterInterface):
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+SENTENCE_SPLIT_REGEX = r"(?<=[.?!])\s+"
+BUFFER_SIZE = 1
+BREAKPOINT_PERCENTILE = 95
+
+
+class SemanticBasedTextSplitter(EmbeddingTextSplitterInterface):
     """Splitter que corta por rupturas semánticas detectadas por embeddings.
 
-    Utiliza un `SemanticChunker` con embeddings Hugging Face para encontrar
-    breakpoints donde decae la coherencia entre oraciones.
+    Vectoriza cada oración junto con sus vecinas, corta donde la distancia
+    coseno entre ventanas contiguas supera el percentil configurado y obtiene
+    el vector de cada fragmento promediando los de sus ventanas. Los fragmentos
+    con más de `semantic_pool_max_sentences` oraciones se vuelven a vectorizar
+    completos (0 desactiva el re-encode).
     """
+    embedding_method = "huggingface"
+    model_name = MODEL_NAME
+
     def split_text(self, text: str, size: int = 100, overlap: int = 20) -> List[str]:
         """Divide texto detectando caídas de similitud semántica.
 
@@ -41,12 +62,58 @@ class SemanticBasedTextSplitter(TextSplitterInterface):
         Returns:
             Lista de fragmentos de texto.
         """
-        breakpoint_type: Literal["percentile", "standard_deviation", "interquartile", "gradient"] = "percentile"
-        model_name: str = "sentence-transformers/all-MiniLM-L6-v2"
-
-        embeddings = HuggingFaceEmbeddings(model_name=model_name)
-        splitter = SemanticChunker(
-            embeddings,
-            breakpoint_threshold_type=breakpoint_type
-        )
-        return splitter.split_text(text)
+        chunks, _ = self.split_and_embed(text, size, overlap)
+        return chunks
+
+    def split_and_embed(self, text: str, size: int = 100, overlap: int = 20) -> Tuple[List[str], np.ndarray]:
+        """Divide texto por rupturas semánticas y devuelve el vector de cada fragmento.
+
+        Args:
+            text: Texto de entrada a fragmentar.
+            size: Parámetro de compatibilidad; no se aplica directamente.
+            overlap: Parámetro de compatibilidad; no se aplica directamente.
+
+        Returns:
+            Tupla (fragmentos, vectores) con una fila float32 por fragmento.
+        """
+        sentences = [sentence for sentence in re.split(SENTENCE_SPLIT_REGEX, text) if sentence.strip()]
+        if not sentences:
+            return [], np.empty((0, 0), dtype=np.float32)
+
+        embedding = EmbeddingsFactory().get_embedding(self.embedding_method, self.model_name)
+        windows = [
+            " ".join(sentences[max(0, i - BUFFER_SIZE):i + BUFFER_SIZE + 1])
+            for i in range(len(sentences))
+        ]
+        window_vectors = embedding.embed_documents_array(windows)
+
+        groups = self._group_sentences(window_vectors)
+        chunks = [" ".join(sentences[start:end]) for start, end in groups]
+        vectors = np.stack([window_vectors[start:end].mean(axis=0) for start, end in groups])
+
+        max_sentences = environment_variables.semantic_pool_max_sentences
+        if max_sentences > 0:
+            reencode = [i for i, (start, end) in enumerate(groups) if end - start > max_sentences]
+            if reencode:
+                vectors[reencode] = embedding.embed_documents_array([chunks[i] for i in reencode])
+
+        return chunks, vectors
+
+    @staticmethod
+    def _group_sentences(window_vectors: np.ndarray) -> List[Tuple[int, int]]:
+        """Devuelve los rangos [inicio, fin) de oraciones que forman cada fragmento."""
+        if len(window_vectors) == 1:
+            return [(0, 1)]
+
+        norms = np.linalg.norm(window_vectors, axis=1)
+        norms[norms == 0] = 1.0
+        normalized = window_vectors / norms[:, None]
+        distances = 1.0 - np.sum(normalized[:-1] * normalized[1:], axis=1)
+        threshold = np.percentile(distances, BREAKPOINT_PERCENTILE)
+
+        groups, start = [], 0
+        for index in np.flatnonzero(distances > threshold):
+            groups.append((start, int(index) + 1))
+            start = int(index) + 1
+        groups.append((start, len(window_vectors)))
+        return groups
@@ -6,20 +6,60 @@ consistencia entre segmentación y vectorización.
 
 Dependencies:
   - langchain-text-splitters
-  - sentence-transformers
-  - torch
+  - transformers
+  - huggingface-hub
 
 Notes:
   - Evita desalineaciones entre cortes y límites reales de tokenización.
   - Adecuado cuando se usan embeddings de Sentence Transformers.
+  - Sólo carga el tokenizador y el `max_seq_length` del modelo, no sus pesos:
+    `SentenceTransformersTokenTextSplitter` cargaba el modelo completo y lo
+    mantenía vivo en la caché, fuera del alcance de `EmbeddingModelRegistry`.
 """
 
-from langchain_text_splitters import SentenceTransformersTokenTextSplitter
+import json
+from functools import lru_cache
+from huggingface_hub import hf_hub_download
+from langchain_text_splitters import Tokenizer, split_text_on_tokens
+from transformers import AutoTokenizer, PreTrainedTokenizerBase
 from typing import List
 
 from app.application.processors.text_splitters.interfaces.text_splitter_interface import TextSplitterInterface
 
 
+MODEL_NAME = "sentence-transformers/all-mpnet-base-v2"
+MAX_ENCODE_LENGTH = 2 ** 32
+
+
+@lru_cache()
+def _load_tokenizer(model_name: str) -> PreTrainedTokenizerBase:
+    return AutoTokenizer.from_pretrained(model_name)
+
+
+@lru_cache()
+def _max_seq_length(model_name: str) -> int:
+    # Sentence Transformers toma el límite de sentence_bert_config.json; sin él, vale el del tokenizador
+    try:
+        with open(hf_hub_download(model_name, "sentence_bert_config.json")) as config:
+            return int(json.load(config)["max_seq_length"])
+    except Exception:
+        return _load_tokenizer(model_name).model_max_length
+
+
+@lru_cache(maxsize=8)
+def _build_tokenizer(size: int, overlap: int, model_name: str = MODEL_NAME) -> Tokenizer:
+    max_tokens = _max_seq_length(model_name)
+    if size > max_tokens:
+        raise ValueError(f"El límite de tokens del modelo '{model_name}' es {max_tokens}; se pidieron {size} por fragmento.")
+    tokenizer = _load_tokenizer(model_name)
+
+    def encode(text: str) -> List[int]:
+        # Sin los tokens de inicio y fin, como `SentenceTransformersTokenTextSplitter`
+        return tokenizer.encode(text, max_length=MAX_ENCODE_LENGTH, truncation="do_not_truncate")[1:-1]
+
+    return Tokenizer(chunk_overlap=overlap, tokens_per_chunk=size, decode=tokenizer.decode, encode=encode)
+
+
 class SentenceTransformerBasedTextSplitter(TextSplitterInterface):
     """Splitter que usa la tokenización del modelo de Sentence Transformers.
 
@@ -37,10 +77,4 @@ class SentenceTransformerBasedTextSplitter(TextSplitterInterface):
         Returns:
             Lista de fragmentos de texto.
         """
-        model_name: str = "sentence-transformers/all-mpnet-base-v2"
-        splitter = SentenceTransformersTokenTextSplitter(
-            tokens_per_chunk=size,
-            chunk_overlap=overlap,
-            model_name=model_name,
-        )
-        return splitter.split_text(text)
+        return split_text_on_tokens(text=text, tokenizer=_build_tokenizer(size, overlap))
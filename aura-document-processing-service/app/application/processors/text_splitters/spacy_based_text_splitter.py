@@ -14,12 +14,25 @@ Notes:
   - Requiere descargar el modelo spaCy del idioma correspondiente.
 """
 
+from functools import lru_cache
 from langchain_text_splitters import SpacyTextSplitter
 from typing import List
 
 from app.application.processors.text_splitters.interfaces.text_splitter_interface import TextSplitterInterface
 
 
+PIPELINE = "es_core_news_sm"
+
+
+@lru_cache(maxsize=4)
+def _build_splitter(size: int, overlap: int, pipeline: str = PIPELINE) -> SpacyTextSplitter:
+    return SpacyTextSplitter(
+        chunk_size=size,
+        chunk_overlap=overlap,
+        pipeline=pipeline
+    )
+
+
 class SpacyBasedTextSplitter(TextSplitterInterface):
     """Splitter que respeta límites de oraciones usando spaCy.
 
@@ -27,7 +40,6 @@ class SpacyBasedTextSplitter(TextSplitterInterface):
     lingüísticos definidos por el pipeline de spaCy.
     """
     def split_text(self, text: str, size: int = 200, overlap: int = 20) -> List[str]:
-        pipeline: str = "es_core_news_sm"
         """Divide texto respetando límites de oración con spaCy.
 
         Args:
@@ -38,9 +50,4 @@ class SpacyBasedTextSplitter(TextSplitterInterface):
         Returns:
             Lista de fragmentos de texto.
         """
-        splitter = SpacyTextSplitter(
-            chunk_size=size,
-            chunk_overlap=overlap,
-            pipeline=pipeline
-        )
-        return splitter.split_text(text)
+        return _build_splitter(size, overlap).split_text(text)
@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class TextChunk:
+    """Fragmento de texto con su procedencia dentro del documento.
+
+    Atributos:
+        text: Contenido del fragmento.
+        page_number: Página de origen (1-based).
+        start_offset: Posición del primer carácter dentro del texto limpio de la página,
+            o None si no pudo ubicarse (p. ej. el splitter normalizó el texto).
+    """
+    text: str
+    page_number: int
+    start_offset: Optional[int]
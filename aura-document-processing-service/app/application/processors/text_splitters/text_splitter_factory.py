@@ -3,6 +3,12 @@ Este módulo define una fábrica para instanciar diferentes divisores de texto (
 según el método especificado. Facilita la selección y uso de distintos algoritmos de segmentación 
 de texto de manera centralizada y extensible.
 
+Cada splitter construye sus tokenizadores y su configuración de forma diferida
+en la primera llamada y los reutiliza a nivel de proceso, con una instancia por
+(método, tamaño, solapamiento, modelo). Los que necesitan un modelo de
+embeddings lo piden a `EmbeddingsFactory` en cada llamada, de modo que la
+descarga por inactividad de `EmbeddingModelRegistry` sí libera su memoria.
+
 Uso principal:
     - Selección dinámica de la estrategia de división de texto en función de la configuración o el caso de uso.
     - Simplifica la integración de nuevos splitters en el sistema.
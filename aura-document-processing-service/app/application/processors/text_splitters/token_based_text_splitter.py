@@ -12,12 +12,21 @@ Notes:
   - Adecuado para pipelines que consumen modelos basados en tokens.
 """
 
+from functools import lru_cache
 from langchain_text_splitters import TokenTextSplitter
 from typing import List
 
 from app.application.processors.text_splitters.interfaces.text_splitter_interface import TextSplitterInterface
 
 
+@lru_cache(maxsize=8)
+def _build_splitter(size: int, overlap: int) -> TokenTextSplitter:
+    return TokenTextSplitter(
+        chunk_size=size,
+        chunk_overlap=overlap
+    )
+
+
 class TokenBasedTextSplitter(TextSplitterInterface):
     """Splitter que trocea texto por número de tokens.
 
@@ -35,8 +44,4 @@ class TokenBasedTextSplitter(TextSplitterInterface):
         Returns:
             Lista de fragmentos de texto.
         """
-        splitter = TokenTextSplitter(
-            chunk_size=size,
-            chunk_overlap=overlap
-        )
-        return splitter.split_text(text)
+        return _build_splitter(size, overlap).split_text(text)
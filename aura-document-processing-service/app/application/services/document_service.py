@@ -1,81 +1,145 @@
 import logging
+import os
 import tempfile
-import shutil
+import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Dict
-from fastapi import UploadFile, BackgroundTasks
+from typing import AsyncIterator, Dict, Optional
+from pydantic import ValidationError as PydanticValidationError
 from sqlalchemy.orm import Session
 
-from app.application.services.ingestion_service import IngestionService
+from app.application.processors.embeddings.embeddings_factory import EmbeddingsFactory
+from app.application.processors.readers.reader_factory import ReaderFactory
 from app.configuration.environment_variables import environment_variables
+from app.domain.constants.document_status import DocumentStatus
 from app.domain.constants.document_type import DocumentType
-from app.application.exceptions.exceptions import UnsupportedFileTypeError, ValidationError, StorageError, DatabaseError
+from app.application.exceptions.exceptions import NotFoundError, UnsupportedFileTypeError, ValidationError, DatabaseError
 from app.domain.dtos.document_request import DocumentRequest
+from app.domain.dtos.ingestion_job import IngestionJob, IngestionPipeline
+from app.domain.dtos.multipart_event import MultipartEvent
+from app.domain.dtos.rechunk_request import RechunkRequest
 from app.domain.models.document import Document
 from app.domain.dtos.document_response import DocumentResponseSchema
+from app.infrastructure.executors.executors import get_io_executor
+from app.infrastructure.messaging.interfaces.ingestion_queue_interface import IngestionQueueInterface
 from app.infrastructure.persistence.repositories.document_repository import DocumentRepository
+from app.infrastructure.persistence.repositories.embedding_space_repository import EmbeddingSpaceRepository
+from app.infrastructure.persistence.repositories.fragment_repository import FragmentRepository
 from app.infrastructure.persistence.storages.file_storage_repository import FileStorageRepository
+from app.infrastructure.persistence.storages.streaming_upload import StreamingUpload
 
 
 logger = logging.getLogger(__name__)
 
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
 
 class DocumentService:
     def __init__(self,
                  document_repository: DocumentRepository,
+                 fragment_repository: FragmentRepository,
                  file_storage_repository: FileStorageRepository,
-                 ingestion_service: IngestionService):
-        self.ingestion_service = ingestion_service
+                 space_repository: EmbeddingSpaceRepository,
+                 ingestion_queue: IngestionQueueInterface):
+        self.ingestion_queue = ingestion_queue
         self.document_repository = document_repository
+        self.fragment_repository = fragment_repository
         self.file_storage_repository = file_storage_repository
+        self.space_repository = space_repository
+        self.embedding_factory = EmbeddingsFactory()
 
     async def create(self,
-                              request: DocumentRequest,
-                              file: UploadFile,
-                              db: Session,
-                     background_tasks: BackgroundTasks) -> DocumentResponseSchema:
-        document_type = self._validate_type(file)
-        self._validate_size(file)
-
-        temp_dir = Path(tempfile.gettempdir()) / "uploads"
-        temp_dir.mkdir(parents=True, exist_ok=True)
-        temp_path = temp_dir / file.filename
+                     form: AsyncIterator[MultipartEvent],
+                     db: Session,
+                     content_length: Optional[int] = None) -> DocumentResponseSchema:
+        self._validate_size(content_length)
 
-        with temp_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        logger.info(f"Archivo temporal guardado en: {temp_path}")
+        io_executor = get_io_executor()
+        fields: Dict[str, str] = {}
+        upload: Optional[StreamingUpload] = None
+        document_type: Optional[DocumentType] = None
+        file_name: Optional[str] = None
+        path: Optional[str] = None
 
+        # El cuerpo se sube a MinIO a medida que llega: las partes completas se envían mientras se reciben las siguientes
         try:
-            logger.info("Uploading file to storage")
-            path = self.file_storage_repository.upload(file, temp_path)
-            logger.info("File uploaded to storage", extra={"path": path})
-        except StorageError:
+            async for event in form:
+                if event.kind == "field":
+                    fields[event.name] = event.value
+                elif event.kind == "file_start":
+                    if event.name != "file" or upload is not None:
+                        raise ValidationError("Exactly one file must be sent in the 'file' field")
+                    document_type = self._validate_type(event.content_type)
+                    file_name = event.filename
+                    upload = await io_executor.run(
+                        self.file_storage_repository.start_upload,
+                        file_name,
+                        event.content_type,
+                        self._temp_path(file_name) if self.ingestion_queue.shares_local_files else None
+                    )
+                elif event.kind == "file_data" and upload is not None:
+                    part = upload.feed(event.data)
+                    if part is not None:
+                        await io_executor.run(upload.upload_part, part)
+                elif event.kind == "file_end" and upload is not None:
+                    path = await io_executor.run(upload.complete)
+
+            if upload is None:
+                logger.warning("No file provided in request")
+                raise ValidationError("No file provided")
+            if path is None:
+                raise ValidationError("Incomplete file upload")
+            request = self._validate_request(fields)
+        except Exception:
+            if upload is not None:
+                await io_executor.run(self._discard_upload, upload, path)
             raise
 
+        logger.info("File uploaded to storage", extra={
+            "path": path,
+            "size": upload.size,
+            "sha256": upload.sha256,
+            "chat_id": request.chat_id
+        })
+
+        # Los documentos nuevos se vectorizan en el espacio activo cuando el worker procesa el trabajo;
+        # la clave con el activo de ahora sólo sirve para reutilizar una ingesta idéntica
+        pipeline = IngestionPipeline()
+        resolved = await io_executor.run(self._resolve_pipeline, pipeline, db)
         document = Document(
-            file_name=file.filename,
+            file_name=file_name,
             type=document_type,
             path=path,
+            content_sha256=upload.sha256,
+            pipeline_key=self._pipeline_key(resolved),
             created_by=1,
             created_at=datetime.now()
         )
 
         try:
             logger.info("Persisting document to database")
-            db_document = self.document_repository.create(document, db)
+            db_document = await io_executor.run(self.document_repository.create, document, db)
             logger.info("Document persisted", extra={"document_id": db_document.id})
         except DatabaseError:
             raise
 
-        background_tasks.add_task(
-            self.ingestion_service.process_document,
-            db_document,
-            db,
-            temp_path
+        if await io_executor.run(self._reuse_ingestion, db_document, resolved, db):
+            if upload.local_path is not None:
+                await io_executor.run(self._remove_temp_file, upload.local_path)
+            return DocumentResponseSchema(
+                id=db_document.id,
+                file_name=db_document.file_name,
+                status=db_document.status
+            )
+
+        job = IngestionJob(
+            document_id=db_document.id,
+            file_key=path,
+            local_path=str(upload.local_path) if upload.local_path else None,
+            **pipeline.model_dump()
         )
-        logger.info(f"Proceso de ingesta lanzado en background para documento {db_document.id}")
+        await io_executor.run(self.ingestion_queue.publish, job)
+        logger.info(f"Trabajo de ingesta encolado para documento {db_document.id}")
 
         return DocumentResponseSchema(
             id=db_document.id,
@@ -83,24 +147,120 @@ class DocumentService:
             status=db_document.status
         )
 
-    def _validate_type(self, file) -> DocumentType:
+    async def rechunk(self, document_id: int, request: RechunkRequest, db: Session) -> DocumentResponseSchema:
+        io_executor = get_io_executor()
+        document = await io_executor.run(self.document_repository.get_by_id, document_id, db)
+        if document is None:
+            raise NotFoundError(f"Document {document_id} not found")
+
+        pipeline = IngestionPipeline(**request.model_dump())
+        try:
+            pipeline_key = self._pipeline_key(await io_executor.run(self._resolve_pipeline, pipeline, db))
+        except ValueError as e:
+            raise ValidationError(str(e))
+        if document.status == DocumentStatus.done and document.pipeline_key == pipeline_key:
+            logger.info("Document already ingested with this pipeline", extra={"document_id": document_id})
+        else:
+            # Dos trabajos sobre el mismo documento reemplazarían sus fragmentos a la vez: sólo encola
+            # quien consigue pasarlo a pendiente
+            if not await io_executor.run(self.document_repository.mark_pending, document.id, db):
+                raise ValidationError(f"Document {document_id} ingestion is still in progress")
+            await io_executor.run(db.refresh, document)
+            # El trabajo parte del artefacto de extracción si existe; si no, del original en el storage
+            job = IngestionJob(document_id=document.id, file_key=document.path, **pipeline.model_dump())
+            await io_executor.run(self.ingestion_queue.publish, job)
+            logger.info("Rechunk job enqueued", extra={"document_id": document_id, "pipeline_key": pipeline_key})
+
+        return DocumentResponseSchema(
+            id=document.id,
+            file_name=document.file_name,
+            status=document.status
+        )
+
+    def _resolve_pipeline(self, pipeline: IngestionPipeline, db: Session) -> IngestionPipeline:
+        # Igual que el worker: sin método explícito, el del espacio activo
+        if pipeline.embedding_type is not None:
+            return pipeline
+        active_model = self.space_repository.get_active_model(db)
+        return pipeline.model_copy(update={
+            "embedding_type": active_model or environment_variables.embedding_active_model
+        })
+
+    def _pipeline_key(self, pipeline: IngestionPipeline) -> str:
+        # La misma clave que registra el worker al terminar la ingesta (`IngestionService.pipeline_key`)
+        return pipeline.key(self.embedding_factory.model_version(pipeline.embedding_type), ReaderFactory.settings_key())
+
+    def _temp_path(self, file_name: str) -> Path:
+        temp_dir = Path(tempfile.gettempdir()) / "uploads"
+        temp_dir.mkdir(parents=True, exist_ok=True)
+        return temp_dir / f"{uuid.uuid4()}{Path(file_name).suffix}"
+
+    def _reuse_ingestion(self, document: Document, pipeline: IngestionPipeline, db: Session) -> bool:
+        # El mismo contenido ya ingerido con la misma configuración produce los mismos fragmentos: se copian en SQL
+        source = self.document_repository.get_ingested_by_content(document.content_sha256, self._pipeline_key(pipeline), db)
+        if source is None:
+            return False
+
+        try:
+            self.fragment_repository.clone_document_fragments(source.id, document.id, document.created_by, db, commit=False)
+            document.status = DocumentStatus.done
+            self.document_repository.update(document, db)
+        except DatabaseError:
+            logger.warning("Failed reusing ingestion, falling back to a new one", extra={
+                "document_id": document.id,
+                "source_document_id": source.id
+            })
+            document.status = DocumentStatus.pending
+            return False
+
+        logger.info("Ingestion reused from identical document", extra={
+            "document_id": document.id,
+            "source_document_id": source.id
+        })
+        return True
+
+    def _discard_upload(self, upload: StreamingUpload, path: Optional[str]) -> None:
+        # Un objeto ya completado puede estar compartido con otros documentos (misma clave de contenido): no se borra
+        if path is None:
+            upload.abort()
+        if upload.local_path is not None:
+            self._remove_temp_file(upload.local_path)
+
+    def _remove_temp_file(self, temp_path: Path) -> None:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"No se pudo eliminar el archivo temporal {temp_path}: {e}")
+
+    def _validate_request(self, fields: Dict[str, str]) -> DocumentRequest:
+        try:
+            return DocumentRequest(**fields)
+        except PydanticValidationError as e:
+            errors = "; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+            )
+            logger.warning("Invalid document request fields", extra={"fields": list(fields), "errors": errors})
+            raise ValidationError(f"Invalid form fields: {errors}") from e
+
+    def _validate_type(self, content_type: Optional[str]) -> DocumentType:
         mapping: Dict[str, DocumentType] = {
             "application/vnd.openxmlformats-officedocument.wordprocessingml.document": DocumentType.docx,
             "application/pdf": DocumentType.pdf,
         }
-        if file is None:
-            logger.warning("No file provided in request")
-            raise ValidationError("No file provided")
-        if file.content_type not in mapping:
-            logger.warning("Unsupported content type", extra={"content_type": file.content_type})
+        if content_type not in mapping:
+            logger.warning("Unsupported content type", extra={"content_type": content_type})
             raise UnsupportedFileTypeError("Only PDF and DOCX files are supported")
-        return mapping[file.content_type]
+        return mapping[content_type]
 
-    def _validate_size(self, file):
+    def _validate_size(self, content_length: Optional[int]):
+        # El límite exacto lo aplica `StreamingUpload` sobre los bytes del archivo; aquí sólo se
+        # rechazan de entrada los cuerpos que no pueden caber ni descontando el overhead multipart
         max_bytes = environment_variables.max_file_size_mb * 1024 * 1024
-        if hasattr(file, "size") and file.size and file.size > max_bytes:
+        if content_length and content_length > max_bytes + MULTIPART_OVERHEAD_BYTES:
             logger.warning("File exceeds max size", extra={
-                "size": getattr(file, "size", None),
+                "size": content_length,
                 "max_bytes": max_bytes
             })
             raise ValidationError(f"File exceeds max size ({environment_variables.max_file_size_mb} MB)")
@@ -0,0 +1,213 @@
+import logging
+import threading
+import time
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.application.exceptions.exceptions import NotFoundError, ValidationError
+from app.application.processors.embeddings.embeddings_factory import EmbeddingsFactory
+from app.configuration.environment_variables import environment_variables
+from app.configuration.metrics_registry import metrics
+from app.domain.constants.embedding_dimensions import EMBEDDING_DIMENSIONS
+from app.domain.constants.embedding_space_status import EmbeddingSpaceStatus
+from app.domain.dtos.embedding_space_response import EmbeddingSpaceSchema
+from app.domain.models.embedding_space import EmbeddingSpace
+from app.infrastructure.persistence.repositories.database_client import DatabaseClient
+from app.infrastructure.persistence.repositories.embedding_space_repository import EmbeddingSpaceRepository
+from app.infrastructure.persistence.repositories.fragment_repository import FragmentRepository
+from app.infrastructure.persistence.repositories.vector_index_manager import VectorIndexManager
+
+
+logger = logging.getLogger(__name__)
+
+reembedded_fragments = metrics.counter("embedding_migration_fragments_total", "Fragments re-embedded into a new embedding space")
+
+
+class EmbeddingMigrationService:
+    def __init__(self,
+                 database_client: DatabaseClient,
+                 space_repository: EmbeddingSpaceRepository,
+                 fragment_repository: FragmentRepository,
+                 index_manager: VectorIndexManager):
+        self.database_client = database_client
+        self.space_repository = space_repository
+        self.fragment_repository = fragment_repository
+        self.index_manager = index_manager
+        self.embedding_factory = EmbeddingsFactory()
+
+    def list_spaces(self, db: Session) -> List[EmbeddingSpaceSchema]:
+        self.space_repository.ensure_active(environment_variables.embedding_active_model, db)
+        return [self._describe(space, db) for space in self.space_repository.get_all(db)]
+
+    def get_space(self, embedding_model: str, db: Session) -> EmbeddingSpaceSchema:
+        space = self.space_repository.get_by_model(self._validate_model(embedding_model), db)
+        if space is None:
+            raise NotFoundError(f"No embedding space for {embedding_model}")
+        return self._describe(space, db)
+
+    def start(self, embedding_model: str, db: Session) -> EmbeddingSpaceSchema:
+        self._validate_model(embedding_model)
+        self.space_repository.ensure_active(environment_variables.embedding_active_model, db)
+        space = self.space_repository.start_building(embedding_model, db)
+        if space is None:
+            current = self.space_repository.get_by_model(embedding_model, db)
+            state = "active" if current is not None and current.active else "already building"
+            raise ValidationError(f"Embedding space {embedding_model} is {state}")
+        # El worker de ingesta toma los espacios en construcción (`run_pending`)
+        logger.info("Re-embedding scheduled", extra={"embedding_model": embedding_model})
+        return self._describe(space, db)
+
+    def activate(self, embedding_model: str, db: Session) -> EmbeddingSpaceSchema:
+        space = self.space_repository.get_by_model(self._validate_model(embedding_model), db)
+        if space is None:
+            raise NotFoundError(f"No embedding space for {embedding_model}")
+        if space.status != EmbeddingSpaceStatus.ready:
+            raise ValidationError(f"Embedding space {embedding_model} is not ready ({space.status.value})")
+
+        total, embedded = self.space_repository.count_progress(embedding_model, db)
+        if embedded < total:
+            raise ValidationError(f"Embedding space {embedding_model} still has {total - embedded} fragments to re-embed")
+
+        self.space_repository.activate(embedding_model, db)
+        db.refresh(space)
+        return self._describe(space, db)
+
+    def run_pending(self, stop: Optional[threading.Event] = None) -> None:
+        """Llena los espacios en construcción, incluidos los que quedaron a medias al detenerse un worker."""
+        sessions = self.database_client.get_session()
+        db = next(sessions)
+        try:
+            models = self.space_repository.get_models_by_status([EmbeddingSpaceStatus.building], db)
+        finally:
+            sessions.close()
+
+        for embedding_model in models:
+            if stop is not None and stop.is_set():
+                return
+            try:
+                self.run(embedding_model, stop)
+            except Exception:
+                # Ya quedó registrado y marcado como fallido; no impide llenar los demás
+                continue
+
+    def embed_document(self, document_id: int, ingested_model: str, db: Session) -> None:
+        """Escribe los fragmentos recién ingeridos de un documento en los demás espacios en construcción o listos.
+
+        Se llama con los fragmentos ya confirmados: un espacio que empiece a construirse después los
+        recoge en su propia pasada, y el que ya se estaba llenando (o el recién activado) no queda
+        con huecos que sólo cubriría otra re-vectorización completa.
+        """
+        models = [
+            model for model in self.space_repository.get_models_by_status(
+                [EmbeddingSpaceStatus.building, EmbeddingSpaceStatus.ready], db
+            )
+            if model != ingested_model
+        ]
+        if not models:
+            return
+
+        rows = self.fragment_repository.get_contents_by_document_id(document_id, db)
+        batch_size = environment_variables.embedding_migration_batch_size
+        for embedding_model in models:
+            embedding = self.embedding_factory.get_embedding(embedding_model)
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                vectors = embedding.embed_documents_array([row.content for row in batch])
+                self.fragment_repository.create_embeddings(embedding_model, [row.id for row in batch], vectors, db)
+            logger.info("Document embedded into embedding space", extra={
+                "document_id": document_id,
+                "embedding_model": embedding_model,
+                "count": len(rows)
+            })
+
+    def run(self, embedding_model: str, stop: Optional[threading.Event] = None) -> None:
+        engine = self.database_client.engine.execution_options(isolation_level="AUTOCOMMIT")
+        with engine.connect() as lock_connection:
+            if not self.space_repository.try_lock(embedding_model, lock_connection):
+                logger.info("Re-embedding already running", extra={"embedding_model": embedding_model})
+                return
+
+            sessions = self.database_client.get_session()
+            db = next(sessions)
+            try:
+                processed = self._backfill(embedding_model, db, stop)
+                if stop is not None and stop.is_set():
+                    # Sigue en construcción: la próxima ejecución retoma lo que falte
+                    logger.info("Re-embedding interrupted", extra={"embedding_model": embedding_model, "count": processed})
+                    return
+                # El índice se construye con el espacio ya lleno: mucho más rápido que mantenerlo durante la carga
+                self.index_manager.ensure_model_indexes(embedding_model)
+                self.space_repository.finish(embedding_model, EmbeddingSpaceStatus.ready, db)
+                logger.info("Re-embedding finished", extra={"embedding_model": embedding_model, "count": processed})
+            except Exception:
+                logger.exception("Re-embedding failed", extra={"embedding_model": embedding_model})
+                self.space_repository.finish(embedding_model, EmbeddingSpaceStatus.failed, db)
+                raise
+            finally:
+                sessions.close()
+                self.space_repository.unlock(embedding_model, lock_connection)
+
+    def _backfill(self, embedding_model: str, db: Session, stop: Optional[threading.Event] = None) -> int:
+        embedding = self.embedding_factory.get_embedding(embedding_model)
+        batch_size = environment_variables.embedding_migration_batch_size
+        max_rate = environment_variables.embedding_migration_max_fragments_per_second
+
+        processed = 0
+        after_id = 0
+        while stop is None or not stop.is_set():
+            rows = self.fragment_repository.get_pending_embeddings(embedding_model, after_id, batch_size, db)
+            if not rows:
+                if after_id == 0:
+                    return processed
+                # Una pasada más desde el principio recoge lo ingerido con el modelo anterior mientras tanto
+                after_id = 0
+                continue
+
+            start = time.perf_counter()
+            vectors = embedding.embed_documents_array([row.content for row in rows])
+            self.fragment_repository.create_embeddings(embedding_model, [row.id for row in rows], vectors, db)
+            self.space_repository.record_progress(embedding_model, len(rows), db)
+            reembedded_fragments.inc(len(rows), embedding_model=embedding_model)
+            processed += len(rows)
+            after_id = rows[-1].id
+
+            # Ritmo acotado para no quitarle CPU/GPU a la ingesta ni a las consultas
+            if max_rate > 0:
+                delay = max(0.0, len(rows) / max_rate - (time.perf_counter() - start))
+                if stop is not None:
+                    stop.wait(delay)
+                else:
+                    time.sleep(delay)
+        return processed
+
+    def _describe(self, space: EmbeddingSpace, db: Session) -> EmbeddingSpaceSchema:
+        total, embedded = self.space_repository.count_progress(space.embedding_model, db)
+        rate = None
+        eta = None
+        if space.started_at and space.updated_at and space.processed_fragments:
+            elapsed = (space.updated_at - space.started_at).total_seconds()
+            if elapsed > 0:
+                rate = space.processed_fragments / elapsed
+        if space.status == EmbeddingSpaceStatus.building and rate:
+            eta = max(0, total - embedded) / rate
+
+        return EmbeddingSpaceSchema(
+            embedding_model=space.embedding_model,
+            status=space.status,
+            active=space.active,
+            total_fragments=total,
+            embedded_fragments=embedded,
+            progress=embedded / total if total else 1.0,
+            fragments_per_second=rate,
+            eta_seconds=eta,
+            started_at=space.started_at,
+            finished_at=space.finished_at,
+            activated_at=space.activated_at
+        )
+
+    @staticmethod
+    def _validate_model(embedding_model: str) -> str:
+        if embedding_model not in EMBEDDING_DIMENSIONS:
+            raise NotFoundError(f"Unknown embedding model: {embedding_model}")
+        return embedding_model
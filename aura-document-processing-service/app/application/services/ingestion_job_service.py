@@ -0,0 +1,106 @@
+import logging
+import os
+import tempfile
+import uuid
+from pathlib import Path
+
+from app.application.exceptions.exceptions import NotFoundError
+from app.application.services.embedding_migration_service import EmbeddingMigrationService
+from app.application.services.ingestion_service import IngestionService
+from app.configuration.environment_variables import environment_variables
+from app.domain.constants.document_status import DocumentStatus
+from app.domain.dtos.ingestion_job import IngestionJob
+from app.infrastructure.messaging.interfaces.ingestion_queue_interface import IngestionQueueInterface
+from app.infrastructure.persistence.repositories.database_client import DatabaseClient
+from app.infrastructure.persistence.repositories.document_repository import DocumentRepository
+from app.infrastructure.persistence.repositories.embedding_space_repository import EmbeddingSpaceRepository
+from app.infrastructure.persistence.storages.file_storage_repository import FileStorageRepository
+
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionJobService:
+    def __init__(self,
+                 database_client: DatabaseClient,
+                 document_repository: DocumentRepository,
+                 file_storage_repository: FileStorageRepository,
+                 ingestion_service: IngestionService,
+                 space_repository: EmbeddingSpaceRepository,
+                 migration_service: EmbeddingMigrationService):
+        self.database_client = database_client
+        self.document_repository = document_repository
+        self.file_storage_repository = file_storage_repository
+        self.ingestion_service = ingestion_service
+        self.space_repository = space_repository
+        self.migration_service = migration_service
+
+    def handle(self, job: IngestionJob) -> None:
+        sessions = self.database_client.get_session()
+        db = next(sessions)
+        try:
+            document = self.document_repository.get_by_id(job.document_id, db)
+            if document is None:
+                raise NotFoundError(f"Document {job.document_id} not found")
+
+            # Sin método explícito se usa el espacio activo al procesar, no al encolar: un trabajo
+            # que esperó en la cola durante una activación no escribe en el espacio anterior
+            if job.embedding_type is None:
+                active_model = self.space_repository.get_active_model(db)
+                job = job.model_copy(update={
+                    "embedding_type": active_model or environment_variables.embedding_active_model
+                })
+
+            logger.info("Processing ingestion job", extra={
+                "document_id": job.document_id,
+                "attempt": job.attempt,
+                "embedding_model": job.embedding_type
+            })
+            try:
+                # Con el texto ya extraído (mismo contenido y limpiador) no hace falta el original
+                extracted_pages = self.ingestion_service.load_artifact(document, job.cleaner_type)
+                if extracted_pages is not None:
+                    logger.info("Ingesting from extraction artifact", extra={"document_id": job.document_id})
+                    self._discard_local_file(job)
+                self.ingestion_service.process_document(
+                    document,
+                    db,
+                    self._resolve_local_file(job) if extracted_pages is None else None,
+                    cleaner_type=job.cleaner_type,
+                    splitter_type=job.splitter_type,
+                    embedding_type=job.embedding_type,
+                    split_size=job.split_size,
+                    split_overlap=job.split_overlap,
+                    extracted_pages=extracted_pages,
+                )
+                self.migration_service.embed_document(document.id, job.embedding_type, db)
+            except Exception as e:
+                if not IngestionQueueInterface.should_retry(job, e):
+                    document.status = DocumentStatus.failed
+                    self.document_repository.update(document, db)
+                raise
+
+            document.status = DocumentStatus.done
+            document.pipeline_key = self.ingestion_service.pipeline_key(job)
+            self.document_repository.update(document, db)
+        finally:
+            sessions.close()
+
+    def _resolve_local_file(self, job: IngestionJob) -> Path:
+        if job.local_path and Path(job.local_path).exists():
+            return Path(job.local_path)
+
+        temp_dir = Path(tempfile.gettempdir()) / "ingestion"
+        temp_dir.mkdir(parents=True, exist_ok=True)
+        local_path = temp_dir / f"{uuid.uuid4()}{Path(job.file_key).suffix}"
+        return self.file_storage_repository.download_to(job.file_key, local_path)
+
+    def _discard_local_file(self, job: IngestionJob) -> None:
+        if not job.local_path:
+            return
+        try:
+            os.remove(job.local_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"No se pudo eliminar el archivo temporal {job.local_path}: {e}")
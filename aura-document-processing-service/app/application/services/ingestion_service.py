@@ -1,84 +1,210 @@
 import logging
 import os
+from dataclasses import dataclass
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+import numpy as np
 from sqlalchemy.orm import Session
 
 from app.application.processors.embeddings.embeddings_factory import EmbeddingsFactory
 from app.application.processors.readers.reader_factory import ReaderFactory
 from app.application.processors.text_cleaners.text_cleaner_factory import TextCleanerFactory
+from app.application.processors.text_splitters.interfaces.embedding_text_splitter_interface import EmbeddingTextSplitterInterface
+from app.application.processors.text_splitters.text_chunk import TextChunk
 from app.application.processors.text_splitters.text_splitter_factory import TextSplitterFactory
-from app.application.exceptions.exceptions import DatabaseError
+from app.application.exceptions.exceptions import DatabaseError, StorageError
+from app.configuration.environment_variables import environment_variables
+from app.domain.dtos.ingestion_job import IngestionPipeline
 from app.domain.models.document import Document
 from app.domain.models.fragment import Fragment
+from app.infrastructure.executors.staged_pipeline import PipelineStage, StagedPipeline
 from app.infrastructure.persistence.repositories.document_repository import DocumentRepository
 from app.infrastructure.persistence.repositories.fragment_repository import FragmentRepository
+from app.infrastructure.persistence.storages.extraction_artifact_repository import ExtractionArtifactRepository
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+EmbeddedChunk = Tuple[TextChunk, Optional[np.ndarray]]
+
+
+@dataclass
+class _IngestionRun:
+    """Lo que las etapas del pipeline necesitan saber del documento que se está ingiriendo."""
+    document: Document
+    db: Session
+    embedding_type: str
+    split_size: int
+    created_at: datetime
+    fragment_count: int = 0
+
 
 class IngestionService:
     def __init__(self,
                  document_repository: DocumentRepository,
-                 fragment_repository: FragmentRepository):
+                 fragment_repository: FragmentRepository,
+                 artifact_repository: ExtractionArtifactRepository):
         self.document_repository = document_repository
         self.fragment_repository = fragment_repository
+        self.artifact_repository = artifact_repository
         self.reader_factory = ReaderFactory()
         self.cleaner_factory = TextCleanerFactory()
         self.splitter_factory = TextSplitterFactory()
         self.embedding_factory = EmbeddingsFactory()
+        # Los pools de cada etapa se comparten entre todos los documentos que se ingieren a la vez;
+        # la persistencia es ordenada porque todos los lotes de un documento usan su misma sesión
+        self.pipeline = StagedPipeline(
+            "ingestion",
+            [
+                PipelineStage("embed", self._embed_batch, environment_variables.ingestion_embed_workers),
+                PipelineStage("persist", self._persist_batch, environment_variables.ingestion_persist_workers, ordered=True),
+            ],
+            max_in_flight=environment_variables.ingestion_pipeline_max_in_flight,
+            source_stage="read",
+            source_workers=environment_variables.ingestion_read_workers
+        )
+
+    def pipeline_key(self, pipeline: IngestionPipeline) -> str:
+        """Clave con la que se registra en el documento la configuración con que lo ingiere este proceso."""
+        return pipeline.key(self.embedding_factory.model_version(pipeline.embedding_type), ReaderFactory.settings_key())
 
     def process_document(
         self,
         document: Document,
         db: Session,
-        local_file_path: Path,
+        local_file_path: Optional[Path],
         cleaner_type: str = "basic",
         splitter_type: str = "recursive",
         embedding_type: str = "huggingface",
         split_size: int = 500,
         split_overlap: int = 50,
+        extracted_pages: Optional[List[str]] = None,
     ) -> None:
+        extracted: Optional[List[str]] = None
         try:
             logger.info(f"Iniciando proceso de ingesta para documento {document.id}")
-            reader = self.reader_factory.get_reader(local_file_path)
-            raw_text = reader.read(local_file_path)
+            splitter = self.splitter_factory.get_splitter(splitter_type)
 
-            cleaner = self.cleaner_factory.get_cleaner(cleaner_type)
-            clean_text = cleaner.clean_text(raw_text)
+            if extracted_pages is not None:
+                # Re-división desde el artefacto de extracción: ni lectura del original ni OCR
+                pages: Iterable[str] = extracted_pages
+            else:
+                reader = self.reader_factory.get_reader(local_file_path)
+                cleaner = self.cleaner_factory.get_cleaner(cleaner_type)
+                # Las páginas fluyen por lector, limpiador, splitter y embeddings sin materializar el documento;
+                # sólo se retiene el texto limpio (mucho menor que el original) para guardarlo como artefacto
+                extracted = []
+                pages = self._collect(cleaner.clean_pages(reader.iter_pages(local_file_path)), extracted)
+            if isinstance(splitter, EmbeddingTextSplitterInterface) and splitter.embedding_method == embedding_type:
+                # El splitter ya vectorizó el texto para decidir los cortes; se reutilizan esos vectores
+                chunks = splitter.split_and_embed_pages(pages, size=split_size, overlap=split_overlap)
+            else:
+                chunks = ((chunk, None) for chunk in splitter.split_pages(pages, size=split_size, overlap=split_overlap))
+            run = _IngestionRun(document, db, embedding_type, split_size, created_at=datetime.now())
+            batches = (
+                (run, batch)
+                for batch in self._batched(chunks, environment_variables.ingestion_stream_batch_size)
+            )
 
-            splitter = self.splitter_factory.get_splitter(splitter_type)
-            splits = splitter.split_text(clean_text, size=split_size, overlap=split_overlap)
-
-            embedding = self.embedding_factory.get_embedding(embedding_type)
-            vectors = embedding.embed_documents(splits)
-
-            for idx in range(len(splits)):
-                fragment = Fragment(
-                    document_id=document.id,
-                    vector=vectors[idx],
-                    embedding_model=embedding_type,
-                    content=splits[idx],
-                    fragment_index=idx,
-                    chunk_size=split_size,
-                    created_by=document.created_by,
-                    created_at=datetime.now(),
-                )
-                self.fragment_repository.create(fragment, db)
+            # Un reintento reemplaza los fragmentos de un intento anterior dentro de la misma transacción
+            self.fragment_repository.delete_by_document_id(document.id, db, commit=False)
+
+            # Lectura/división, embeddings y persistencia se solapan, cada una en su pool:
+            # el lote N se persiste mientras N+1 se vectoriza y N+2 se lee
+            for _ in self.pipeline.run(batches):
+                pass
+            with self.pipeline.timed("commit"):
+                db.commit()
 
             logger.info(
-                f"Documento {document.id} procesado con éxito con {len(splits)} fragmentos."
+                f"Documento {document.id} procesado con éxito con {run.fragment_count} fragmentos."
             )
+            if extracted is not None:
+                self._save_artifact(document, cleaner_type, extracted)
 
         except Exception as e:
+            db.rollback()
             logger.exception(f"Error procesando documento {document.id}")
             raise DatabaseError("Error en la ingesta del documento") from e
 
         finally:
             # Limpieza del archivo temporal
             try:
-                if os.path.exists(local_file_path):
+                if local_file_path is not None and os.path.exists(local_file_path):
                     os.remove(local_file_path)
                     logger.info(f"Archivo temporal eliminado: {local_file_path}")
             except Exception as e:
                 logger.warning(f"No se pudo eliminar el archivo temporal {local_file_path}: {e}")
+
+    def load_artifact(self, document: Document, cleaner_type: str) -> Optional[List[str]]:
+        if not document.content_sha256:
+            return None
+        try:
+            return self.artifact_repository.load(document.content_sha256, cleaner_type)
+        except StorageError:
+            # Sin artefacto legible se vuelve a extraer desde el original
+            logger.warning("Extraction artifact unavailable", extra={"document_id": document.id}, exc_info=True)
+            return None
+
+    def _save_artifact(self, document: Document, cleaner_type: str, pages: List[str]) -> None:
+        if not document.content_sha256:
+            return
+        try:
+            self.artifact_repository.save(document.content_sha256, cleaner_type, pages)
+        except StorageError:
+            # Los fragmentos ya están persistidos; sin artefacto sólo se pierde el atajo de re-división
+            logger.warning("Failed storing extraction artifact", extra={"document_id": document.id}, exc_info=True)
+
+    def close(self) -> None:
+        self.pipeline.shutdown(wait=False)
+
+    def _embed_batch(self, item: Tuple[_IngestionRun, List[EmbeddedChunk]]) -> Tuple[_IngestionRun, List[EmbeddedChunk]]:
+        run, batch = item
+        pending = [idx for idx, (_, vector) in enumerate(batch) if vector is None]
+        if not pending:
+            return run, batch
+
+        embedding = self.embedding_factory.get_embedding(run.embedding_type)
+        # Matriz float32 (N×D): cada fragmento recibe una fila, que llega tal cual al COPY binario
+        vectors = embedding.embed_documents_array([batch[idx][0].text for idx in pending])
+        embedded = list(batch)
+        for idx, vector in zip(pending, vectors):
+            embedded[idx] = (batch[idx][0], vector)
+        return run, embedded
+
+    def _persist_batch(self, item: Tuple[_IngestionRun, List[EmbeddedChunk]]) -> int:
+        run, batch = item
+        fragments = [
+            Fragment(
+                document_id=run.document.id,
+                vector=vector,
+                embedding_model=run.embedding_type,
+                content=chunk.text,
+                fragment_index=run.fragment_count + idx,
+                chunk_size=run.split_size,
+                page_number=chunk.page_number,
+                start_offset=chunk.start_offset,
+                created_by=run.document.created_by,
+                created_at=run.created_at,
+            )
+            for idx, (chunk, vector) in enumerate(batch)
+        ]
+        # Etapa ordenada: los lotes de un documento llegan de a uno y en orden, nunca a la vez sobre la sesión
+        self.fragment_repository.create_many(fragments, run.db, commit=False)
+        run.fragment_count += len(fragments)
+        return len(fragments)
+
+    @staticmethod
+    def _collect(items: Iterable[T], collected: List[T]) -> Iterator[T]:
+        for item in items:
+            collected.append(item)
+            yield item
+
+    @staticmethod
+    def _batched(items: Iterable[T], size: int) -> Iterator[List[T]]:
+        iterator = iter(items)
+        while batch := list(islice(iterator, size)):
+            yield batch
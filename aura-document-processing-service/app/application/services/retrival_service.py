@@ -1,9 +1,16 @@
 from sqlalchemy.orm import Session
 import logging
-from typing import List
+import time
+from typing import Dict, List, Optional
 
-from app.application.processors.embeddings.embeddings_factory import EmbeddingsFactory
+from app.application.processors.embeddings.embeddings_factory import EmbeddingsFactory, get_query_embedding_cache
+from app.application.processors.embeddings.query_embedding_batcher import QueryEmbeddingBatcher
+from app.configuration.environment_variables import environment_variables
+from app.domain.constants.retrieval_mode import RetrievalMode
+from app.domain.dtos.retrieval_scope import RetrievalScope
 from app.domain.models.fragment import Fragment
+from app.infrastructure.executors.executors import get_io_executor
+from app.infrastructure.persistence.repositories.embedding_space_repository import EmbeddingSpaceRepository
 from app.infrastructure.persistence.repositories.fragment_repository import FragmentRepository
 from app.application.exceptions.exceptions import DatabaseError
 
@@ -12,27 +19,52 @@ logger = logging.getLogger(__name__)
 
 
 class RetrievalService:
-    def __init__(self, fragment_repository: FragmentRepository):
+    def __init__(self, fragment_repository: FragmentRepository, space_repository: EmbeddingSpaceRepository):
         self.fragment_repository = fragment_repository
+        self.space_repository = space_repository
+        self._active_model: Optional[str] = None
+        self._active_model_expires_at = 0.0
         self.embedding_factory = EmbeddingsFactory()
+        self._batchers: Dict[str, QueryEmbeddingBatcher] = {}
+        self.query_cache = get_query_embedding_cache()
 
-    def process_question(
+    async def process_question(
         self,
         question: str,
         db: Session,
-        embedding_type: str = "huggingface",
+        embedding_type: Optional[str] = None,
         k: int = 5,
+        scope: Optional[RetrievalScope] = None,
+        mode: Optional[RetrievalMode] = None,
     ) -> List[Fragment]:
         try:
-            embedding_model = self.embedding_factory.get_embedding(embedding_type)
-            question_vector = embedding_model.embed_query(question)
+            mode = mode or RetrievalMode(environment_variables.retrieval_mode)
+            if embedding_type is None:
+                embedding_type = await self._get_active_model(db)
 
-            logger.info("Embedding generado", extra={"embedding_type": embedding_type})
+            question_vector = None
+            # La búsqueda léxica no necesita vectorizar la pregunta
+            if mode != RetrievalMode.lexical:
+                batcher = self._get_batcher(embedding_type)
+                if self.query_cache is None:
+                    question_vector = await batcher.embed_query(question)
+                else:
+                    # La clave es el modelo resuelto y no el método: cambiar el modelo por defecto no sirve vectores viejos
+                    question_vector = await self.query_cache.get_or_embed(
+                        self.embedding_factory.model_version(embedding_type), question, batcher.embed_query
+                    )
 
-            fragments = self.fragment_repository.get_most_similar(
+                logger.info("Embedding generado", extra={"embedding_type": embedding_type})
+
+            fragments = await get_io_executor().run(
+                self.fragment_repository.get_most_similar,
                 query_vector=question_vector,
                 k=k,
-                db=db
+                db=db,
+                embedding_model=embedding_type,
+                scope=scope,
+                query_text=question,
+                mode=mode
             )
 
             logger.info("Fragmentos relevantes recuperados", extra={"count": len(fragments)})
@@ -41,3 +73,23 @@ class RetrievalService:
         except Exception as e:
             logger.exception("Error en el proceso de recuperación")
             raise DatabaseError("Error al procesar la recuperación de fragmentos") from e
+
+    async def _get_active_model(self, db: Session) -> str:
+        # El cambio de espacio activo es atómico en la base; cada worker lo observa como mucho
+        # `embedding_space_refresh_seconds` después, sin consultar la tabla en cada pregunta
+        if self._active_model is None or time.monotonic() >= self._active_model_expires_at:
+            active = await get_io_executor().run(self.space_repository.get_active_model, db)
+            self._active_model = active or environment_variables.embedding_active_model
+            self._active_model_expires_at = time.monotonic() + environment_variables.embedding_space_refresh_seconds
+        return self._active_model
+
+    def _get_batcher(self, embedding_type: str) -> QueryEmbeddingBatcher:
+        batcher = self._batchers.get(embedding_type)
+        if batcher is None:
+            batcher = QueryEmbeddingBatcher(
+                lambda: self.embedding_factory.get_embedding(embedding_type),
+                max_batch_size=environment_variables.query_batch_max_size,
+                max_wait_ms=environment_variables.query_batch_max_wait_ms
+            )
+            self._batchers[embedding_type] = batcher
+        return batcher
@@ -1,14 +1,26 @@
 from functools import lru_cache
+from pathlib import Path
 from typing import Generator
 from fastapi import Depends
 from sqlalchemy.orm import Session
 
+from app.application.exceptions.exceptions import ConfigError
 from app.application.services.document_service import DocumentService
+from app.application.services.embedding_migration_service import EmbeddingMigrationService
+from app.application.services.ingestion_job_service import IngestionJobService
 from app.application.services.ingestion_service import IngestionService
 from app.application.services.retrival_service import RetrievalService
+from app.configuration.environment_variables import environment_variables
+from app.infrastructure.messaging.inline_ingestion_queue import InlineIngestionQueue
+from app.infrastructure.messaging.interfaces.ingestion_queue_interface import IngestionQueueInterface
+from app.infrastructure.messaging.rabbitmq_ingestion_queue import RabbitMQIngestionQueue
+from app.infrastructure.messaging.sqlite_ingestion_queue import SQLiteIngestionQueue
 from app.infrastructure.persistence.repositories.database_client import DatabaseClient
 from app.infrastructure.persistence.repositories.document_repository import DocumentRepository
+from app.infrastructure.persistence.repositories.embedding_space_repository import EmbeddingSpaceRepository
 from app.infrastructure.persistence.repositories.fragment_repository import FragmentRepository
+from app.infrastructure.persistence.repositories.vector_index_manager import VectorIndexManager
+from app.infrastructure.persistence.storages.extraction_artifact_repository import ExtractionArtifactRepository
 from app.infrastructure.persistence.storages.file_storage_repository import FileStorageRepository
 from app.infrastructure.persistence.storages.minio_client import MinioClient
 
@@ -22,42 +34,101 @@ def get_db_session(db_client: DatabaseClient = Depends(get_database_client)) ->
     yield from db_client.get_session()
 
 
+@lru_cache()
 def get_document_repository() -> DocumentRepository:
     return DocumentRepository()
 
 
+@lru_cache()
 def get_fragment_repository() -> FragmentRepository:
     return FragmentRepository()
 
 
+@lru_cache()
+def get_embedding_space_repository() -> EmbeddingSpaceRepository:
+    return EmbeddingSpaceRepository()
+
+
+@lru_cache()
+def get_vector_index_manager() -> VectorIndexManager:
+    return VectorIndexManager(get_database_client())
+
+
+@lru_cache()
+def get_embedding_migration_service() -> EmbeddingMigrationService:
+    return EmbeddingMigrationService(
+        database_client=get_database_client(),
+        space_repository=get_embedding_space_repository(),
+        fragment_repository=get_fragment_repository(),
+        index_manager=get_vector_index_manager()
+    )
+
+
 @lru_cache()
 def get_minio_client() -> MinioClient:
     return MinioClient()
 
+@lru_cache()
 def get_file_storage_repository() -> FileStorageRepository:
     return FileStorageRepository(get_minio_client())
 
+@lru_cache()
+def get_extraction_artifact_repository() -> ExtractionArtifactRepository:
+    return ExtractionArtifactRepository(get_minio_client())
+
 @lru_cache()
 def get_ingestion_service(
     document_repository: DocumentRepository = Depends(get_document_repository),
-    fragment_repository: FragmentRepository = Depends(get_fragment_repository)
+    fragment_repository: FragmentRepository = Depends(get_fragment_repository),
+    artifact_repository: ExtractionArtifactRepository = Depends(get_extraction_artifact_repository)
 ) -> IngestionService:
-    return IngestionService(document_repository, fragment_repository)
+    return IngestionService(document_repository, fragment_repository, artifact_repository)
+
+@lru_cache()
+def get_ingestion_job_service() -> IngestionJobService:
+    return IngestionJobService(
+        database_client=get_database_client(),
+        document_repository=get_document_repository(),
+        file_storage_repository=get_file_storage_repository(),
+        ingestion_service=get_ingestion_service(
+            document_repository=get_document_repository(),
+            fragment_repository=get_fragment_repository(),
+            artifact_repository=get_extraction_artifact_repository()
+        ),
+        space_repository=get_embedding_space_repository(),
+        migration_service=get_embedding_migration_service()
+    )
+
+@lru_cache()
+def get_ingestion_queue() -> IngestionQueueInterface:
+    backend = environment_variables.ingestion_queue_backend
+    if backend == "rabbitmq":
+        return RabbitMQIngestionQueue()
+    if backend == "sqlite":
+        return SQLiteIngestionQueue(Path(environment_variables.ingestion_sqlite_path))
+    if backend == "inline":
+        return InlineIngestionQueue(get_ingestion_job_service().handle)
+    raise ConfigError(f"Unsupported ingestion queue backend: {backend}")
 
 @lru_cache()
 def get_document_service(
     document_repository: DocumentRepository = Depends(get_document_repository),
+    fragment_repository: FragmentRepository = Depends(get_fragment_repository),
     file_storage_repository: FileStorageRepository = Depends(get_file_storage_repository),
-    ingestion_service: IngestionService = Depends(get_ingestion_service)
+    space_repository: EmbeddingSpaceRepository = Depends(get_embedding_space_repository),
+    ingestion_queue: IngestionQueueInterface = Depends(get_ingestion_queue)
 ) -> DocumentService:
     return DocumentService(
         document_repository=document_repository,
+        fragment_repository=fragment_repository,
         file_storage_repository=file_storage_repository,
-        ingestion_service=ingestion_service
+        space_repository=space_repository,
+        ingestion_queue=ingestion_queue
     )
 
 @lru_cache()
 def get_retrieval_service(
-    fragment_repository: FragmentRepository = Depends(get_fragment_repository)
+    fragment_repository: FragmentRepository = Depends(get_fragment_repository),
+    space_repository: EmbeddingSpaceRepository = Depends(get_embedding_space_repository)
 ) -> RetrievalService:
-    return RetrievalService(fragment_repository)
+    return RetrievalService(fragment_repository, space_repository)
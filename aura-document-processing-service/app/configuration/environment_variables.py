@@ -1,4 +1,4 @@
-from pydantic.v1 import BaseSettings
+from pydantic.v1 import BaseSettings, validator
 
 
 class EnvironmentVariables(BaseSettings):
@@ -14,10 +14,105 @@ class EnvironmentVariables(BaseSettings):
     minio_secret_key: str
     minio_secure: bool = False
 
+    redis_host: str = "localhost"
+    redis_port: int = 6379
+    redis_db: int = 0
+    redis_password: str | None = None
+
+    rabbitmq_host: str = "localhost"
+    rabbitmq_port: int = 5672
+    rabbitmq_user: str = "guest"
+    rabbitmq_password: str = "guest"
+    rabbitmq_vhost: str = "/"
+    rabbitmq_heartbeat_seconds: int = 60
+
     max_file_size_mb: int = 20
+    upload_part_size_mb: int = 8
+    upload_max_parallel_parts: int = 4
+    upload_part_workers: int = 16
+    ingestion_queue_backend: str = "inline"
+    ingestion_queue_name: str = "ingestion"
+    ingestion_sqlite_path: str = "/tmp/aura/ingestion-queue.sqlite3"
+    ingestion_max_retries: int = 5
+    ingestion_retry_base_seconds: float = 10.0
+    ingestion_retry_max_seconds: float = 600.0
+    ingestion_job_timeout_seconds: int = 3600
+    ingestion_worker_concurrency: int = 1
+    fragment_copy_threshold: int = 256
+    ingestion_stream_batch_size: int = 512
+    ingestion_read_workers: int = 2
+    ingestion_embed_workers: int = 1
+    ingestion_persist_workers: int = 2
+    ingestion_pipeline_max_in_flight: int = 4
+    embedding_model_idle_seconds: int = 0
+    embedding_model_sweep_interval_seconds: int = 60
+    embedding_cache_backend: str = "file"
+    embedding_cache_dir: str = "/tmp/aura/embedding-cache"
+    embedding_cache_memory_entries: int = 50000
+    embedding_cache_ttl_seconds: int = 0
+    embedding_batch_token_budget: int = 8192
+    embedding_batch_token_budgets: str = ""
+    embedding_process_workers: int = 0
+    semantic_pool_max_sentences: int = 0
+    onnx_model_dir: str = "/tmp/aura/onnx-models"
+    onnx_quantize: bool = True
+    onnx_intra_op_threads: int = 0
+    query_batch_max_size: int = 32
+    query_batch_max_wait_ms: float = 3.0
+    query_cache_backend: str = "memory"
+    query_cache_max_entries: int = 10000
+    query_cache_ttl_seconds: int = 3600
+    query_cache_version: str = "1"
+    embedding_active_model: str = "huggingface"
+    embedding_space_refresh_seconds: float = 5.0
+    embedding_migration_batch_size: int = 256
+    embedding_migration_max_fragments_per_second: float = 0.0
+    embedding_migration_poll_seconds: float = 30.0
+
+    cpu_executor_workers: int = 2
+    cpu_executor_queue: int = 64
+    io_executor_workers: int = 16
+    io_executor_queue: int = 256
+    pdf_min_text_chars_per_page: int = 50
+    ocr_workers: int = 0
+    ocr_dpi: int = 300
+    ocr_language: str = "spa"
+    ocr_pages_per_task: int = 2
+    ocr_max_in_flight_pages: int = 8
+
+    vector_index_type: str = "hnsw"
+    vector_index_models: str = "huggingface"
+    vector_index_ensure_on_startup: bool = True
+    hnsw_m: int = 16
+    hnsw_ef_construction: int = 64
+    hnsw_ef_search: int = 40
+    hnsw_iterative_scan: str = "relaxed_order"
+    ivfflat_lists: int = 100
+    ivfflat_min_rows: int = 10000
+    ivfflat_probes: int = 10
+    ivfflat_iterative_scan: str = "relaxed_order"
+    scoped_exact_search_threshold: int = 20000
+    retrieval_mode: str = "vector"
+    hybrid_candidates: int = 50
+    hybrid_rrf_k: int = 60
     environment: str = "development"
 
     class Config:
         env_file = ".env"
 
+    @validator("ocr_pages_per_task")
+    def _validate_ocr_pages_per_task(cls, value: int) -> int:
+        # Divide `ocr_max_in_flight_pages` y define el tamaño de cada rango de páginas
+        if value < 1:
+            raise ValueError(f"must be >= 1, got {value}")
+        return value
+
+    @validator("ocr_max_in_flight_pages")
+    def _validate_ocr_max_in_flight_pages(cls, value: int, values: dict) -> int:
+        # Con menos páginas en vuelo que páginas por tarea, cada tarea excedería el tope de memoria
+        pages_per_task = values.get("ocr_pages_per_task")
+        if pages_per_task is not None and value < pages_per_task:
+            raise ValueError(f"must be >= ocr_pages_per_task ({pages_per_task}), got {value}")
+        return value
+
 environment_variables = EnvironmentVariables()
@@ -0,0 +1,143 @@
+import threading
+from typing import Dict, Optional, Tuple
+
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _render_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in key) + "}"
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._lock = threading.Lock()
+        self._values: Dict[LabelKey, float] = {}
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(_label_key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = dict(self._values)
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+        lines += [f"{self.name}{_render_labels(key)} {value}" for key, value in sorted(values.items())]
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Summary(_Metric):
+    kind = "summary"
+
+    def __init__(self, name: str, description: str):
+        super().__init__(name, description)
+        self._counts: Dict[LabelKey, int] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + value
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            return self._counts.get(_label_key(labels), 0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            sums, counts = dict(self._values), dict(self._counts)
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+        for key in sorted(sums):
+            lines.append(f"{self.name}_sum{_render_labels(key)} {sums[key]}")
+            lines.append(f"{self.name}_count{_render_labels(key)} {counts[key]}")
+        return lines
+
+
+class MetricsRegistry:
+    _instance: Optional["MetricsRegistry"] = None
+    _lock: threading.Lock = threading.Lock()
+    _initialized: bool = False
+
+    def __new__(cls) -> "MetricsRegistry":
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        if self._initialized:
+            return
+
+        with self._lock:
+            if self._initialized:
+                return
+
+            self._metrics: Dict[str, _Metric] = {}
+            self._metrics_lock = threading.Lock()
+            self._initialized = True
+
+    def counter(self, name: str, description: str) -> Counter:
+        return self._get_or_create(Counter, name, description)
+
+    def gauge(self, name: str, description: str) -> Gauge:
+        return self._get_or_create(Gauge, name, description)
+
+    def summary(self, name: str, description: str) -> Summary:
+        return self._get_or_create(Summary, name, description)
+
+    def render(self) -> str:
+        with self._metrics_lock:
+            metrics = list(self._metrics.values())
+        lines: list[str] = []
+        for metric in sorted(metrics, key=lambda m: m.name):
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+    def _get_or_create(self, kind: type, name: str, description: str):
+        with self._metrics_lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = kind(name, description)
+                self._metrics[name] = metric
+            elif not isinstance(metric, kind):
+                raise ValueError(f"Metric {name} already registered as {metric.kind}")
+            return metric
+
+
+metrics = MetricsRegistry()
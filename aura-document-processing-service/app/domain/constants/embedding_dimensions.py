@@ -0,0 +1,10 @@
+from typing import Dict
+
+
+EMBEDDING_DIMENSIONS: Dict[str, int] = {
+    "huggingface": 384,
+    "ollama": 768,
+    "onnx": 384,
+    "sentence_transformer": 384,
+    "spacy": 96
+}
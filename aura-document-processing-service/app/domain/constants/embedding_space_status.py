@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class EmbeddingSpaceStatus(str, Enum):
+    building = "building"
+    ready = "ready"
+    failed = "failed"
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class RetrievalMode(str, Enum):
+    vector = "vector"
+    lexical = "lexical"
+    hybrid = "hybrid"
@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+from app.domain.constants.embedding_space_status import EmbeddingSpaceStatus
+
+
+class EmbeddingSpaceSchema(BaseModel):
+    embedding_model: str = Field(...)
+    status: EmbeddingSpaceStatus = Field(...)
+    active: bool = Field(...)
+    total_fragments: int = Field(...)
+    embedded_fragments: int = Field(...)
+    progress: float = Field(...)
+    fragments_per_second: Optional[float] = Field(None)
+    eta_seconds: Optional[float] = Field(None)
+    started_at: Optional[datetime] = Field(None)
+    finished_at: Optional[datetime] = Field(None)
+    activated_at: Optional[datetime] = Field(None)
+
+
+class EmbeddingSpaceListResponse(BaseModel):
+    spaces: List[EmbeddingSpaceSchema] = Field(...)
@@ -0,0 +1,26 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class IngestionPipeline(BaseModel):
+    cleaner_type: str = Field("basic")
+    splitter_type: str = Field("recursive")
+    # None: el espacio de embeddings activo cuando el worker procesa el trabajo
+    embedding_type: Optional[str] = Field(None)
+    split_size: int = Field(500)
+    split_overlap: int = Field(50)
+
+    def key(self, embedding_model: str, reader_settings: str) -> str:
+        # Dos ingestas con la misma clave producen los mismos fragmentos y vectores para el mismo contenido:
+        # además de los parámetros incluye el modelo resuelto del método de embeddings y la configuración de lectura/OCR
+        return (
+            f"{self.cleaner_type}:{self.splitter_type}:{self.embedding_type}:{self.split_size}:{self.split_overlap}"
+            f":{embedding_model}:{reader_settings}"
+        )
+
+
+class IngestionJob(IngestionPipeline):
+    document_id: int = Field(...)
+    file_key: str = Field(...)
+    local_path: Optional[str] = Field(None)
+    attempt: int = Field(0)
@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class MultipartEvent:
+    """Evento de un formulario multipart leído en streaming.
+
+    Atributos:
+        kind: "field" (campo completo), "file_start", "file_data" o "file_end".
+        name: Nombre del campo del formulario.
+        value: Valor del campo (sólo "field").
+        filename: Nombre del archivo subido (sólo "file_start").
+        content_type: Content-Type de la parte (sólo "file_start").
+        data: Trozo del archivo (sólo "file_data").
+    """
+    kind: str
+    name: str
+    value: Optional[str] = None
+    filename: Optional[str] = None
+    content_type: Optional[str] = None
+    data: bytes = b""
@@ -1,6 +1,12 @@
+from typing import Optional
 from fastapi import Form
 from pydantic import BaseModel, Field
 
+from app.domain.constants.retrieval_mode import RetrievalMode
+from app.domain.dtos.retrieval_scope import RetrievalScope
+
 
 class QuestionRequest(BaseModel):
-    question: str = Field(...)
\ No newline at end of file
+    question: str = Field(...)
+    scope: Optional[RetrievalScope] = Field(None)
+    mode: Optional[RetrievalMode] = Field(None)
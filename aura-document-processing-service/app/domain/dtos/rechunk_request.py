@@ -0,0 +1,5 @@
+from app.domain.dtos.ingestion_job import IngestionPipeline
+
+
+class RechunkRequest(IngestionPipeline):
+    """Configuración con la que volver a dividir y vectorizar un documento ya ingerido."""
@@ -0,0 +1,17 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+class RetrievalScope(BaseModel):
+    individual_chat_id: Optional[int] = Field(None)
+    group_chat_id: Optional[int] = Field(None)
+    document_collection_id: Optional[int] = Field(None)
+    document_ids: Optional[List[int]] = Field(None)
+
+    def is_empty(self) -> bool:
+        return (
+            self.individual_chat_id is None
+            and self.group_chat_id is None
+            and self.document_collection_id is None
+            and not self.document_ids
+        )
@@ -0,0 +1,20 @@
+from typing import List
+from pydantic import BaseModel, Field
+
+
+class VectorIndexSchema(BaseModel):
+    name: str = Field(...)
+    method: str = Field(...)
+    valid: bool = Field(...)
+    size_bytes: int = Field(...)
+    definition: str = Field(...)
+
+
+class VectorIndexListResponse(BaseModel):
+    indexes: List[VectorIndexSchema] = Field(...)
+
+
+class VectorIndexRebuildResponse(BaseModel):
+    embedding_model: str = Field(...)
+    index: str = Field(...)
+    status: str = Field(...)
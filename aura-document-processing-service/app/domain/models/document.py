@@ -15,6 +15,8 @@ class Document(Base):
     type = Column(Enum(DocumentType), nullable=False)
     status = Column(Enum(DocumentStatus), default=DocumentStatus.pending)
     path = Column(String(255), nullable=True)
+    content_sha256 = Column(String(64), nullable=True)
+    pipeline_key = Column(String(255), nullable=True)
 
     created_by = Column(Integer, nullable=False)
     created_at = Column(DateTime, server_default=func.now())
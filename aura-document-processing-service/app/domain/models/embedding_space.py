@@ -0,0 +1,19 @@
+from sqlalchemy import Column, String, Enum, DateTime, Boolean, BigInteger
+
+from app.domain.constants.embedding_space_status import EmbeddingSpaceStatus
+from app.domain.models.base import Base
+
+
+class EmbeddingSpace(Base):
+    __tablename__ = "embedding_space"
+
+    embedding_model = Column(String(255), primary_key=True)
+
+    status = Column(Enum(EmbeddingSpaceStatus), nullable=False)
+    active = Column(Boolean, nullable=False, default=False)
+    processed_fragments = Column(BigInteger, nullable=False, default=0)
+
+    started_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    activated_at = Column(DateTime, nullable=True)
@@ -1,6 +1,8 @@
 from pgvector.sqlalchemy import VECTOR
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Computed, Integer, String, DateTime, Text, ForeignKey
 
 from app.domain.models.base import Base
 
@@ -12,11 +14,15 @@ class Fragment(Base):
 
     document_id = Column(Integer, ForeignKey("document.id", ondelete="CASCADE"), nullable=False)
 
-    vector = Column(VECTOR(dim=384), nullable=True)
+    vector = Column(VECTOR(), nullable=True)
     embedding_model = Column(String(255), nullable=True)
     content = Column(Text, nullable=False)
+    # Configuración 'spanish', en línea con los valores por defecto de OCR (spa) y spaCy (es_core_news_sm)
+    content_tsv = deferred(Column(TSVECTOR, Computed("to_tsvector('spanish', content)", persisted=True)))
     fragment_index = Column(Integer, nullable=False)
     chunk_size = Column(Integer, nullable=False)
+    page_number = Column(Integer, nullable=True)
+    start_offset = Column(Integer, nullable=True)
 
     created_by = Column(Integer, nullable=False)
     created_at = Column(DateTime, server_default=func.now())
@@ -0,0 +1,16 @@
+from pgvector.sqlalchemy import VECTOR
+from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+
+from app.domain.models.base import Base
+
+
+class FragmentEmbedding(Base):
+    __tablename__ = "fragment_embedding"
+
+    embedding_model = Column(String(255), primary_key=True)
+    fragment_id = Column(Integer, ForeignKey("fragment.id", ondelete="CASCADE"), primary_key=True, index=True)
+
+    vector = Column(VECTOR(), nullable=False)
+
+    created_at = Column(DateTime, server_default=func.now())
@@ -0,0 +1,78 @@
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from app.configuration.metrics_registry import metrics
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+queue_depth = metrics.gauge("executor_queue_depth", "Tasks submitted to the executor that have not started yet")
+active_tasks = metrics.gauge("executor_active_tasks", "Tasks currently running in the executor")
+wait_seconds = metrics.summary("executor_wait_seconds", "Time between submitting a task and the task starting")
+run_seconds = metrics.summary("executor_run_seconds", "Time spent running tasks in the executor")
+
+
+class BoundedExecutor:
+    """Thread pool with a bounded number of in-flight tasks, awaitable from the event loop.
+
+    At most ``max_workers`` tasks run at once and at most ``max_queue`` more wait for
+    a worker; further callers are suspended (without blocking the loop) until a slot
+    frees up. Queue depth and wait time are exported as metrics labelled by ``name``.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-executor")
+        self._slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        self._slots_lock = threading.Lock()
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        submitted_at = time.perf_counter()
+        queue_depth.inc(executor=self.name)
+        dequeued = threading.Event()
+        dequeue_lock = threading.Lock()
+
+        def dequeue() -> None:
+            with dequeue_lock:
+                if not dequeued.is_set():
+                    dequeued.set()
+                    queue_depth.dec(executor=self.name)
+
+        def call() -> T:
+            started_at = time.perf_counter()
+            dequeue()
+            wait_seconds.observe(started_at - submitted_at, executor=self.name)
+            active_tasks.inc(executor=self.name)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                active_tasks.dec(executor=self.name)
+                run_seconds.observe(time.perf_counter() - started_at, executor=self.name)
+
+        try:
+            async with self._slot(loop):
+                return await loop.run_in_executor(self._executor, call)
+        finally:
+            dequeue()
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        logger.info("Executor shut down", extra={"executor": self.name})
+
+    def _slot(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        with self._slots_lock:
+            semaphore = self._slots.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.max_workers + self.max_queue)
+                self._slots[loop] = semaphore
+            return semaphore
@@ -0,0 +1,54 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+
+from app.configuration.environment_variables import environment_variables
+from app.infrastructure.executors.bounded_executor import BoundedExecutor
+
+
+@lru_cache()
+def get_cpu_executor() -> BoundedExecutor:
+    return BoundedExecutor(
+        "cpu",
+        max_workers=environment_variables.cpu_executor_workers,
+        max_queue=environment_variables.cpu_executor_queue
+    )
+
+
+@lru_cache()
+def get_io_executor() -> BoundedExecutor:
+    return BoundedExecutor(
+        "io",
+        max_workers=environment_variables.io_executor_workers,
+        max_queue=environment_variables.io_executor_queue
+    )
+
+
+def _limit_worker_threads() -> None:
+    # Tesseract usa OpenMP; con un proceso por página, varios hilos por proceso solo compiten por los núcleos
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+
+
+@lru_cache()
+def get_ocr_process_pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=environment_variables.ocr_workers or os.cpu_count() or 1,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_limit_worker_threads
+    )
+
+
+@lru_cache()
+def get_upload_part_executor() -> ThreadPoolExecutor:
+    # Pool propio: las subidas esperan a sus partes desde el executor de I/O y no deben competir con él
+    return ThreadPoolExecutor(
+        max_workers=environment_variables.upload_part_workers,
+        thread_name_prefix="upload-part"
+    )
+
+
+def shutdown_executors() -> None:
+    for provider in (get_cpu_executor, get_io_executor, get_ocr_process_pool, get_upload_part_executor):
+        if provider.cache_info().currsize:
+            provider().shutdown(wait=False)
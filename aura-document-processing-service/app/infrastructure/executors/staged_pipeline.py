@@ -0,0 +1,241 @@
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Set
+
+from app.configuration.metrics_registry import metrics
+
+
+logger = logging.getLogger(__name__)
+
+stage_seconds = metrics.summary("pipeline_stage_seconds", "Time spent per item in each pipeline stage")
+in_flight_items = metrics.gauge("pipeline_in_flight_items", "Items read from the source and not yet returned to the caller")
+
+_SOURCE_DONE = object()
+
+
+@dataclass(frozen=True)
+class PipelineStage:
+    name: str
+    fn: Callable[[Any], Any]
+    workers: int = 1
+    # Los elementos de una misma ejecución pasan por la etapa de a uno y en el orden de la fuente
+    ordered: bool = False
+
+
+class _SourceFailure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class _RunSequence:
+    """Turnos de una ejecución en sus etapas ordenadas: el elemento N entra cuando sale el N-1.
+
+    Si un elemento falla en la etapa, los siguientes ya no entran: la ejecución
+    va a fallar en ese elemento y nada debe seguir usando su estado.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next: Dict[str, int] = defaultdict(int)
+        self._waiting: Dict[str, Dict[int, Callable[[], None]]] = defaultdict(dict)
+        self._failed: Set[str] = set()
+
+    def enter(self, stage: str, index: int, start: Callable[[], None]) -> None:
+        with self._lock:
+            if stage in self._failed:
+                return
+            if index != self._next[stage]:
+                self._waiting[stage][index] = start
+                return
+        start()
+
+    def leave(self, stage: str, index: int, succeeded: bool = True) -> None:
+        with self._lock:
+            if not succeeded:
+                self._failed.add(stage)
+                self._waiting[stage].clear()
+                return
+            self._next[stage] = index + 1
+            start = self._waiting[stage].pop(index + 1, None)
+        if start is not None:
+            start()
+
+
+class StagedPipeline:
+    """Pipeline concurrente por etapas con colas acotadas.
+
+    La fuente de cada `run` (p. ej. lectura y división) se itera en el pool de
+    la etapa `source_stage`, de `source_workers` hilos, y cada elemento pasa
+    por las etapas en orden; cada etapa tiene su propio pool de hilos,
+    compartido por todas las ejecuciones concurrentes del pipeline. Una
+    ejecución nunca tiene más de `max_in_flight` elementos leídos y sin
+    devolver, lo que acota la cola de cada etapa y aplica backpressure sobre
+    la fuente. Las etapas `ordered` procesan los elementos de una ejecución de
+    a uno y en el orden de la fuente (p. ej. la persistencia sobre una misma
+    sesión). Los resultados se devuelven en el orden de la fuente, en el hilo
+    que itera `run`.
+    """
+
+    def __init__(self,
+                 name: str,
+                 stages: List[PipelineStage],
+                 max_in_flight: int,
+                 source_stage: str = "source",
+                 source_workers: int = 1):
+        self.name = name
+        self.stages = stages
+        self.max_in_flight = max(1, max_in_flight)
+        self.source_stage = source_stage
+        self._source_pool = ThreadPoolExecutor(
+            max_workers=max(1, source_workers),
+            thread_name_prefix=f"{name}-{source_stage}"
+        )
+        self._pools = {
+            stage.name: ThreadPoolExecutor(max_workers=max(1, stage.workers), thread_name_prefix=f"{name}-{stage.name}")
+            for stage in stages
+        }
+
+    def run(self, source: Iterable[Any]) -> Iterator[Any]:
+        items: queue.Queue = queue.Queue(maxsize=self.max_in_flight)
+        stop = threading.Event()
+        self._source_pool.submit(self._produce, source, items, stop)
+
+        sequence = _RunSequence()
+        in_flight: Deque[Future] = deque()
+        submitted = 0
+        source_done = False
+        source_error: Optional[BaseException] = None
+        try:
+            while not source_done or in_flight:
+                while not source_done and len(in_flight) < self.max_in_flight:
+                    try:
+                        # Con resultados pendientes no se bloquea esperando a la fuente
+                        entry = items.get(block=not in_flight)
+                    except queue.Empty:
+                        break
+                    if entry is _SOURCE_DONE:
+                        source_done = True
+                    elif isinstance(entry, _SourceFailure):
+                        # Se termina lo ya enviado antes de fallar: ninguna etapa queda corriendo sobre el estado
+                        # de la ejecución (p. ej. su sesión) mientras el llamador maneja el error
+                        source_done = True
+                        source_error = entry.error
+                    else:
+                        in_flight.append(self._submit(entry, sequence, submitted))
+                        in_flight_items.inc(pipeline=self.name)
+                        submitted += 1
+
+                if in_flight:
+                    future = in_flight.popleft()
+                    in_flight_items.dec(pipeline=self.name)
+                    yield future.result()
+            if source_error is not None:
+                raise source_error
+        finally:
+            stop.set()
+            for future in in_flight:
+                future.cancel()
+                in_flight_items.dec(pipeline=self.name)
+
+    @contextmanager
+    def timed(self, stage: str):
+        """Registra la duración de una etapa que se ejecuta fuera del pipeline (p. ej. en el consumidor)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stage_seconds.observe(time.perf_counter() - start, pipeline=self.name, stage=stage)
+
+    def shutdown(self, wait: bool = True) -> None:
+        # Las fuentes detenidas dejan de leer en cuanto su consumidor sale de `run`
+        self._source_pool.shutdown(wait=wait, cancel_futures=True)
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait, cancel_futures=True)
+        logger.info("Pipeline shut down", extra={"pipeline": self.name})
+
+    def _produce(self, source: Iterable[Any], items: queue.Queue, stop: threading.Event) -> None:
+        iterator = iter(source)
+        try:
+            while not stop.is_set():
+                with self.timed(self.source_stage):
+                    item = next(iterator, _SOURCE_DONE)
+                self._put(items, item, stop)
+                if item is _SOURCE_DONE:
+                    return
+        except BaseException as e:
+            logger.exception("Pipeline source failed", extra={"pipeline": self.name})
+            self._put(items, _SourceFailure(e), stop)
+        finally:
+            # Un consumidor que abandona cierra la fuente en este hilo: los lectores liberan lo que tengan en curso
+            close = getattr(iterator, "close", None)
+            if stop.is_set() and close is not None:
+                with suppress(Exception):
+                    close()
+
+    @staticmethod
+    def _put(items: queue.Queue, entry: Any, stop: threading.Event) -> None:
+        while not stop.is_set():
+            try:
+                items.put(entry, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _submit(self, item: Any, sequence: _RunSequence, index: int) -> Future:
+        result: Future = Future()
+
+        def run_stage(stage_index: int, value: Any) -> None:
+            stage = self.stages[stage_index]
+
+            def start() -> None:
+                if result.cancelled():
+                    if stage.ordered:
+                        sequence.leave(stage.name, index, succeeded=False)
+                    return
+                try:
+                    future = self._pools[stage.name].submit(self._run_stage, stage, value)
+                except RuntimeError as e:
+                    with suppress(InvalidStateError):
+                        result.set_exception(e)
+                    if stage.ordered:
+                        sequence.leave(stage.name, index, succeeded=False)
+                    return
+                future.add_done_callback(lambda done: on_done(stage_index, done))
+
+            if stage.ordered:
+                sequence.enter(stage.name, index, start)
+            else:
+                start()
+
+        def on_done(stage_index: int, done: Future) -> None:
+            stage = self.stages[stage_index]
+            if stage.ordered:
+                sequence.leave(stage.name, index, succeeded=not done.cancelled() and done.exception() is None)
+            if result.cancelled():
+                return
+            # El consumidor puede cancelar `result` en cualquier momento; ese caso se descarta
+            with suppress(InvalidStateError):
+                if done.cancelled():
+                    result.cancel()
+                elif done.exception() is not None:
+                    result.set_exception(done.exception())
+                elif stage_index + 1 < len(self.stages):
+                    run_stage(stage_index + 1, done.result())
+                else:
+                    result.set_result(done.result())
+
+        if self.stages:
+            run_stage(0, item)
+        else:
+            result.set_result(item)
+        return result
+
+    def _run_stage(self, stage: PipelineStage, value: Any) -> Any:
+        with self.timed(stage.name):
+            return stage.fn(value)
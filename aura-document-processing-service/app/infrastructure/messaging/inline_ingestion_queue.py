@@ -0,0 +1,54 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app.application.exceptions.exceptions import ConfigError
+from app.configuration.environment_variables import environment_variables
+from app.domain.dtos.ingestion_job import IngestionJob
+from app.infrastructure.messaging.interfaces.ingestion_queue_interface import IngestionQueueInterface, IngestionJobHandler
+
+
+logger = logging.getLogger(__name__)
+
+
+class InlineIngestionQueue(IngestionQueueInterface):
+    """In-process stand-in: runs jobs on a local thread pool with the same retry policy.
+
+    Jobs are not durable and are lost if the process stops; meant for development and
+    tests where no broker is available.
+    """
+
+    shares_local_files = True
+
+    def __init__(self, handler: IngestionJobHandler):
+        self.handler = handler
+        self._executor = ThreadPoolExecutor(
+            max_workers=environment_variables.ingestion_worker_concurrency,
+            thread_name_prefix="ingestion-inline"
+        )
+
+    def publish(self, job: IngestionJob) -> None:
+        self._executor.submit(self._run, job)
+        logger.info("Ingestion job scheduled in process", extra={"document_id": job.document_id})
+
+    def consume(self, handler: IngestionJobHandler) -> None:
+        raise ConfigError("The inline ingestion queue runs jobs in the API process and has no standalone consumer")
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: IngestionJob) -> None:
+        try:
+            self.handler(job)
+        except Exception as e:
+            logger.exception("Ingestion job failed", extra={"document_id": job.document_id, "attempt": job.attempt})
+            if self.should_retry(job, e):
+                timer = threading.Timer(
+                    self.retry_delay_seconds(job.attempt),
+                    self.publish,
+                    args=(job.model_copy(update={"attempt": job.attempt + 1}),)
+                )
+                timer.daemon = True
+                timer.start()
+            else:
+                logger.error("Ingestion job failed permanently", extra={"document_id": job.document_id})
@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+
+from app.application.exceptions.exceptions import NotFoundError
+from app.configuration.environment_variables import environment_variables
+from app.domain.dtos.ingestion_job import IngestionJob
+
+
+IngestionJobHandler = Callable[[IngestionJob], None]
+
+
+class IngestionQueueInterface(ABC):
+    # Indica si el consumidor corre en el mismo proceso y puede leer el archivo temporal del upload.
+    shares_local_files: bool = False
+
+    @abstractmethod
+    def publish(self, job: IngestionJob) -> None:
+        """Encola un trabajo de ingesta de forma durable."""
+        pass
+
+    @abstractmethod
+    def consume(self, handler: IngestionJobHandler) -> None:
+        """Procesa trabajos indefinidamente; confirma los exitosos y reintenta los fallidos."""
+        pass
+
+    def close(self) -> None:
+        pass
+
+    @staticmethod
+    def retry_delay_seconds(attempt: int) -> float:
+        delay = environment_variables.ingestion_retry_base_seconds * (2 ** attempt)
+        return min(delay, environment_variables.ingestion_retry_max_seconds)
+
+    @staticmethod
+    def should_retry(job: IngestionJob, error: Optional[BaseException] = None) -> bool:
+        # Un documento borrado no va a aparecer en un reintento
+        if isinstance(error, NotFoundError):
+            return False
+        return job.attempt < environment_variables.ingestion_max_retries
@@ -0,0 +1,172 @@
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import pika
+from pika.adapters.blocking_connection import BlockingChannel
+from pika.exceptions import AMQPError
+
+from app.application.exceptions.exceptions import QueueError
+from app.configuration.environment_variables import environment_variables
+from app.domain.dtos.ingestion_job import IngestionJob
+from app.infrastructure.messaging.interfaces.ingestion_queue_interface import IngestionQueueInterface, IngestionJobHandler
+
+
+logger = logging.getLogger(__name__)
+
+
+class RabbitMQIngestionQueue(IngestionQueueInterface):
+    """Durable ingestion queue on RabbitMQ.
+
+    Jobs are persistent messages on a durable queue and are acknowledged only after the
+    handler finishes. A failed job is republished to ``<queue>.retry.<delay_ms>``, a
+    queue whose TTL dead-letters it back to the main queue once the backoff expires;
+    jobs that exhaust their retries are parked in ``<queue>.failed``. Handlers run on
+    worker threads so long OCR jobs do not block the connection's heartbeats.
+    """
+
+    def __init__(self):
+        self.queue_name = environment_variables.ingestion_queue_name
+        self.failed_queue_name = f"{self.queue_name}.failed"
+        self._publish_lock = threading.Lock()
+        self._publish_connection: Optional[pika.BlockingConnection] = None
+        self._publish_channel: Optional[BlockingChannel] = None
+        self._consumer: Optional[tuple[pika.BlockingConnection, BlockingChannel]] = None
+
+    def publish(self, job: IngestionJob) -> None:
+        with self._publish_lock:
+            for attempt in range(2):
+                try:
+                    channel = self._get_publish_channel()
+                    self._publish(channel, self.queue_name, job)
+                    logger.info("Ingestion job published", extra={"document_id": job.document_id})
+                    return
+                except AMQPError as e:
+                    self._reset_publish_connection()
+                    if attempt:
+                        logger.exception("Failed publishing ingestion job")
+                        raise QueueError("Failed to enqueue ingestion job") from e
+
+    def consume(self, handler: IngestionJobHandler) -> None:
+        concurrency = environment_variables.ingestion_worker_concurrency
+        connection = self._connect()
+        channel = connection.channel()
+        self._declare(channel)
+        channel.basic_qos(prefetch_count=concurrency)
+
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="ingestion-worker")
+
+        def on_message(ch, method, properties, body):
+            executor.submit(self._handle, connection, ch, method.delivery_tag, body, handler)
+
+        channel.basic_consume(queue=self.queue_name, on_message_callback=on_message)
+        self._consumer = (connection, channel)
+        logger.info("Consuming ingestion jobs", extra={"queue": self.queue_name, "concurrency": concurrency})
+        try:
+            channel.start_consuming()
+        finally:
+            self._consumer = None
+            executor.shutdown(wait=True)
+            # Los acks pendientes de los hilos se ejecutan antes de cerrar la conexión
+            if connection.is_open:
+                connection.process_data_events(time_limit=0)
+                connection.close()
+
+    def close(self) -> None:
+        if self._consumer is not None:
+            connection, channel = self._consumer
+            connection.add_callback_threadsafe(channel.stop_consuming)
+        with self._publish_lock:
+            self._reset_publish_connection()
+
+    def _handle(self, connection, channel, delivery_tag, body, handler: IngestionJobHandler) -> None:
+        try:
+            job = IngestionJob.model_validate_json(body)
+        except Exception:
+            logger.exception("Discarding malformed ingestion job")
+            connection.add_callback_threadsafe(functools.partial(channel.basic_nack, delivery_tag, requeue=False))
+            return
+
+        try:
+            handler(job)
+            settle = functools.partial(channel.basic_ack, delivery_tag)
+        except Exception as e:
+            logger.exception("Ingestion job failed", extra={"document_id": job.document_id, "attempt": job.attempt})
+            settle = functools.partial(self._retry_or_park, channel, delivery_tag, job, e)
+
+        connection.add_callback_threadsafe(settle)
+
+    def _retry_or_park(self, channel: BlockingChannel, delivery_tag: int, job: IngestionJob, error: Exception) -> None:
+        if self.should_retry(job, error):
+            delay_ms = int(self.retry_delay_seconds(job.attempt) * 1000)
+            retry_queue = self._declare_retry_queue(channel, delay_ms)
+            self._publish(channel, retry_queue, job.model_copy(update={"attempt": job.attempt + 1}))
+            logger.info("Ingestion job scheduled for retry", extra={
+                "document_id": job.document_id,
+                "attempt": job.attempt + 1,
+                "delay_ms": delay_ms
+            })
+        else:
+            self._publish(channel, self.failed_queue_name, job)
+            logger.error("Ingestion job failed permanently", extra={"document_id": job.document_id})
+        channel.basic_ack(delivery_tag)
+
+    def _declare(self, channel: BlockingChannel) -> None:
+        channel.queue_declare(queue=self.queue_name, durable=True)
+        channel.queue_declare(queue=self.failed_queue_name, durable=True)
+
+    def _declare_retry_queue(self, channel: BlockingChannel, delay_ms: int) -> str:
+        name = f"{self.queue_name}.retry.{delay_ms}"
+        channel.queue_declare(queue=name, durable=True, arguments={
+            "x-message-ttl": delay_ms,
+            "x-dead-letter-exchange": "",
+            "x-dead-letter-routing-key": self.queue_name,
+        })
+        return name
+
+    @staticmethod
+    def _publish(channel: BlockingChannel, queue: str, job: IngestionJob) -> None:
+        channel.basic_publish(
+            exchange="",
+            routing_key=queue,
+            body=job.model_dump_json(),
+            properties=pika.BasicProperties(content_type="application/json", delivery_mode=pika.DeliveryMode.Persistent),
+            mandatory=True
+        )
+
+    def _get_publish_channel(self) -> BlockingChannel:
+        if self._publish_channel is None or self._publish_channel.is_closed:
+            self._reset_publish_connection()
+            self._publish_connection = self._connect()
+            self._publish_channel = self._publish_connection.channel()
+            self._publish_channel.confirm_delivery()
+            self._declare(self._publish_channel)
+        return self._publish_channel
+
+    def _reset_publish_connection(self) -> None:
+        try:
+            if self._publish_connection is not None and self._publish_connection.is_open:
+                self._publish_connection.close()
+        except AMQPError:
+            logger.warning("Error closing RabbitMQ publish connection", exc_info=True)
+        self._publish_connection = None
+        self._publish_channel = None
+
+    @staticmethod
+    def _connect() -> pika.BlockingConnection:
+        try:
+            return pika.BlockingConnection(pika.ConnectionParameters(
+                host=environment_variables.rabbitmq_host,
+                port=environment_variables.rabbitmq_port,
+                virtual_host=environment_variables.rabbitmq_vhost,
+                credentials=pika.PlainCredentials(
+                    environment_variables.rabbitmq_user,
+                    environment_variables.rabbitmq_password
+                ),
+                heartbeat=environment_variables.rabbitmq_heartbeat_seconds,
+            ))
+        except AMQPError as e:
+            logger.exception("Failed to connect to RabbitMQ")
+            raise QueueError("Failed to connect to RabbitMQ") from e
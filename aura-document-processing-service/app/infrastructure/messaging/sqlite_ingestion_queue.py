@@ -0,0 +1,133 @@
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Optional, Tuple
+
+from app.application.exceptions.exceptions import QueueError
+from app.configuration.environment_variables import environment_variables
+from app.domain.dtos.ingestion_job import IngestionJob
+from app.infrastructure.messaging.interfaces.ingestion_queue_interface import IngestionQueueInterface, IngestionJobHandler
+
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteIngestionQueue(IngestionQueueInterface):
+    """File-backed ingestion queue for local runs and tests.
+
+    Same contract as the RabbitMQ queue: jobs survive restarts, a claimed job is
+    invisible to other consumers until ``ingestion_job_timeout_seconds`` elapses
+    (so a crashed worker's job is picked up again), failures are retried with
+    exponential backoff and exhausted jobs end in status ``failed``.
+    """
+
+    def __init__(self, path: Path, poll_interval_seconds: float = 1.0):
+        self.path = path
+        self.poll_interval_seconds = poll_interval_seconds
+        self._stopped = threading.Event()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS ingestion_job (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    available_at REAL NOT NULL,
+                    locked_until REAL,
+                    last_error TEXT
+                )
+            """)
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_ingestion_job_status ON ingestion_job (status, available_at)"
+            )
+
+    def publish(self, job: IngestionJob) -> None:
+        try:
+            with closing(self._connect()) as connection:
+                connection.execute(
+                    "INSERT INTO ingestion_job (payload, status, available_at) VALUES (?, 'queued', ?)",
+                    (job.model_dump_json(), time.time())
+                )
+            logger.info("Ingestion job published", extra={"document_id": job.document_id})
+        except sqlite3.Error as e:
+            logger.exception("Failed publishing ingestion job")
+            raise QueueError("Failed to enqueue ingestion job") from e
+
+    def consume(self, handler: IngestionJobHandler) -> None:
+        concurrency = environment_variables.ingestion_worker_concurrency
+        workers = [
+            threading.Thread(target=self._work, args=(handler,), name=f"ingestion-worker-{i}", daemon=True)
+            for i in range(concurrency)
+        ]
+        logger.info("Consuming ingestion jobs", extra={"queue": str(self.path), "concurrency": concurrency})
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    def close(self) -> None:
+        self._stopped.set()
+
+    def _work(self, handler: IngestionJobHandler) -> None:
+        while not self._stopped.is_set():
+            claimed = self._claim()
+            if claimed is None:
+                self._stopped.wait(self.poll_interval_seconds)
+                continue
+
+            job_id, job = claimed
+            try:
+                handler(job)
+            except Exception as e:
+                logger.exception("Ingestion job failed", extra={"document_id": job.document_id, "attempt": job.attempt})
+                self._retry_or_fail(job_id, job, e)
+            else:
+                self._update(job_id, "UPDATE ingestion_job SET status = 'done', locked_until = NULL WHERE id = ?", (job_id,))
+
+    def _claim(self) -> Optional[Tuple[int, IngestionJob]]:
+        now = time.time()
+        with closing(self._connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute("""
+                SELECT id, payload FROM ingestion_job
+                WHERE (status = 'queued' AND available_at <= ?)
+                   OR (status = 'processing' AND locked_until < ?)
+                ORDER BY available_at
+                LIMIT 1
+            """, (now, now)).fetchone()
+            if row is None:
+                connection.execute("COMMIT")
+                return None
+            connection.execute(
+                "UPDATE ingestion_job SET status = 'processing', locked_until = ? WHERE id = ?",
+                (now + environment_variables.ingestion_job_timeout_seconds, row[0])
+            )
+            connection.execute("COMMIT")
+        return row[0], IngestionJob.model_validate_json(row[1])
+
+    def _retry_or_fail(self, job_id: int, job: IngestionJob, error: Exception) -> None:
+        if self.should_retry(job, error):
+            retried = job.model_copy(update={"attempt": job.attempt + 1})
+            self._update(job_id, """
+                UPDATE ingestion_job
+                SET status = 'queued', payload = ?, available_at = ?, locked_until = NULL, last_error = ?
+                WHERE id = ?
+            """, (retried.model_dump_json(), time.time() + self.retry_delay_seconds(job.attempt), str(error), job_id))
+        else:
+            self._update(job_id, """
+                UPDATE ingestion_job SET status = 'failed', locked_until = NULL, last_error = ? WHERE id = ?
+            """, (str(error), job_id))
+            logger.error("Ingestion job failed permanently", extra={"document_id": job.document_id})
+
+    def _update(self, job_id: int, statement: str, parameters: tuple) -> None:
+        with closing(self._connect()) as connection:
+            connection.execute(statement, parameters)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Conexión por operación, cerrada por quien la abre (`closing`): el `with` de sqlite3 no la cierra
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
@@ -0,0 +1,134 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.infrastructure.persistence.caches.redis_client import RedisClient
+
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCacheStore(ABC):
+    @abstractmethod
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Devuelve los vectores presentes en el almacén para las claves dadas."""
+        pass
+
+    @abstractmethod
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        """Guarda los vectores indicados."""
+        pass
+
+
+class FileEmbeddingCacheStore(EmbeddingCacheStore):
+    def __init__(self, root: Path):
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        for key in keys:
+            path = self._path(key)
+            try:
+                found[key] = np.fromfile(path, dtype=np.float32)
+            except FileNotFoundError:
+                continue
+            except Exception:
+                logger.warning("Failed reading embedding cache entry", extra={"path": str(path)})
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        for key, vector in items.items():
+            path = self._path(key)
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(np.asarray(vector, dtype=np.float32).tobytes())
+                os.replace(tmp_path, path)
+            except Exception:
+                logger.warning("Failed writing embedding cache entry", extra={"path": str(path)})
+
+    def _path(self, key: str) -> Path:
+        model_name, _, text_hash = key.rpartition(":")
+        model_dir = hashlib.sha256(model_name.encode("utf-8")).hexdigest()[:16]
+        return self.root / model_dir / text_hash[:2] / f"{text_hash}.f32"
+
+
+class MemoryEmbeddingCacheStore(EmbeddingCacheStore):
+    """Sustituto local de Redis: mismo contrato y expiración, compartido sólo dentro del proceso.
+
+    Acotado como una LRU de `max_entries` entradas, igual que Redis con `maxmemory-policy allkeys-lru`.
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds or None
+        self.max_entries = max_entries
+        self._items: "OrderedDict[str, tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        now = time.monotonic()
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for key in keys:
+                entry = self._items.get(key)
+                if entry is None:
+                    continue
+                expires_at, value = entry
+                if expires_at and expires_at < now:
+                    del self._items[key]
+                    continue
+                self._items.move_to_end(key)
+                found[key] = np.frombuffer(value, dtype=np.float32)
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else 0.0
+        with self._lock:
+            for key, vector in items.items():
+                self._items[key] = (expires_at, np.asarray(vector, dtype=np.float32).tobytes())
+                self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+
+class RedisEmbeddingCacheStore(EmbeddingCacheStore):
+    def __init__(self, client: RedisClient, prefix: str = "embedding:", ttl_seconds: Optional[int] = None):
+        self.client = client.client
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds or None
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        if not keys:
+            return {}
+        try:
+            values = self.client.mget([self.prefix + key for key in keys])
+        except Exception:
+            logger.warning("Failed reading embedding cache from Redis", exc_info=True)
+            return {}
+        return {
+            key: np.frombuffer(value, dtype=np.float32)
+            for key, value in zip(keys, values)
+            if value is not None
+        }
+
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        if not items:
+            return
+        try:
+            pipeline = self.client.pipeline(transaction=False)
+            for key, vector in items.items():
+                pipeline.set(self.prefix + key, np.asarray(vector, dtype=np.float32).tobytes(), ex=self.ttl_seconds)
+            pipeline.execute()
+        except Exception:
+            logger.warning("Failed writing embedding cache to Redis", exc_info=True)
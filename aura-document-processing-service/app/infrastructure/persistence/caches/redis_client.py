@@ -0,0 +1,47 @@
+import logging
+import threading
+from typing import Optional
+
+from app.configuration.environment_variables import environment_variables
+from app.application.exceptions.exceptions import ConfigError, StorageError
+
+
+logger = logging.getLogger(__name__)
+
+
+class RedisClient:
+    _instance: Optional["RedisClient"] = None
+    _lock = threading.Lock()
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        if self._initialized:
+            return
+
+        try:
+            import redis
+        except ImportError as e:
+            raise ConfigError("The redis package is required for Redis-backed caches") from e
+
+        try:
+            self.client = redis.Redis(
+                host=environment_variables.redis_host,
+                port=environment_variables.redis_port,
+                db=environment_variables.redis_db,
+                password=environment_variables.redis_password,
+            )
+            logger.info("Redis client initialized", extra={
+                "host": environment_variables.redis_host,
+                "port": environment_variables.redis_port
+            })
+            self._initialized = True
+        except Exception as e:
+            logger.exception("Failed to initialize Redis client")
+            raise StorageError("Failed to initialize Redis connection") from e
@@ -1,7 +1,7 @@
 import logging
 import threading
 from typing import Optional, Generator
-from sqlalchemy import create_engine, Engine, text
+from sqlalchemy import create_engine, event, Engine, text
 from sqlalchemy.orm import sessionmaker, Session
 
 from app.configuration.environment_variables import environment_variables
@@ -53,6 +53,8 @@ class DatabaseClient:
                 echo=False,
             )
 
+            event.listen(self.engine, "connect", self._configure_connection)
+
             self.SessionLocal = sessionmaker(
                 autocommit=False,
                 autoflush=False,
@@ -72,6 +74,22 @@ class DatabaseClient:
             logger.exception("Failed to initialize database connection")
             raise DatabaseError("Failed to initialize database connection") from e
 
+    @staticmethod
+    def _configure_connection(dbapi_connection, connection_record) -> None:
+        settings = {
+            "hnsw.ef_search": environment_variables.hnsw_ef_search,
+            "hnsw.iterative_scan": environment_variables.hnsw_iterative_scan,
+            "ivfflat.probes": environment_variables.ivfflat_probes,
+            "ivfflat.iterative_scan": environment_variables.ivfflat_iterative_scan,
+        }
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in settings.items():
+                cursor.execute("SELECT set_config(%s, %s, false)", (name, str(value)))
+        finally:
+            cursor.close()
+        dbapi_connection.commit()
+
     def get_session(self) -> Generator[Session, None, None]:
         if self.SessionLocal is None:
             raise DatabaseError("Database client not initialized")
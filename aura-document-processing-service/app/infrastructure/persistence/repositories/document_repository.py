@@ -1,7 +1,10 @@
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from typing import Optional
+from datetime import datetime
 import logging
 
+from app.domain.constants.document_status import DocumentStatus
 from app.domain.models.document import Document
 from app.application.exceptions.exceptions import DatabaseError
 
@@ -79,6 +82,39 @@ class DocumentRepository:
             logger.exception("Failed to fetch documents")
             raise DatabaseError("Failed to fetch documents from database") from e
 
+    def get_ingested_by_content(self,
+                                content_sha256: str,
+                                pipeline_key: str,
+                                db: Session) -> Optional[Document]:
+        try:
+            logger.debug("Fetching ingested document by content", extra={
+                "content_sha256": content_sha256,
+                "pipeline_key": pipeline_key
+            })
+
+            document = (
+                db.query(Document)
+                .filter(
+                    Document.content_sha256 == content_sha256,
+                    Document.pipeline_key == pipeline_key,
+                    Document.status == DocumentStatus.done,
+                    Document.deleted_at.is_(None)
+                )
+                .order_by(Document.id.desc())
+                .first()
+            )
+
+            logger.debug("Ingested document lookup completed", extra={
+                "content_sha256": content_sha256,
+                "document_id": document.id if document else None
+            })
+
+            return document
+
+        except Exception as e:
+            logger.exception("Failed to fetch ingested document by content")
+            raise DatabaseError("Failed to fetch document from database") from e
+
     def update(self, document: Document, db: Session) -> Document:
         try:
             logger.debug(
@@ -102,6 +138,28 @@ class DocumentRepository:
             logger.exception("Failed to update document")
             raise DatabaseError("Failed to update document in database") from e
 
+    def mark_pending(self, document_id: int, db: Session) -> bool:
+        try:
+            logger.debug("Marking document as pending", extra={"document_id": document_id})
+
+            # Comprobación y cambio en una sola sentencia: de dos peticiones concurrentes sólo una la gana
+            result = db.execute(
+                update(Document)
+                .where(Document.id == document_id, Document.status != DocumentStatus.pending)
+                .values(status=DocumentStatus.pending, updated_at=datetime.now())
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+
+            claimed = result.rowcount == 1
+            logger.debug("Document pending mark completed", extra={"document_id": document_id, "claimed": claimed})
+            return claimed
+
+        except Exception as e:
+            db.rollback()
+            logger.exception("Failed to mark document as pending")
+            raise DatabaseError("Failed to update document in database") from e
+
     def delete(self, document_id: int, db: Session) -> bool:
         try:
             logger.debug(
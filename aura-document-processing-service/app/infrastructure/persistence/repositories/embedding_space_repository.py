@@ -0,0 +1,156 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from typing import Iterable, Optional, List, Tuple
+import logging
+
+from app.domain.constants.embedding_space_status import EmbeddingSpaceStatus
+from app.domain.models.embedding_space import EmbeddingSpace
+from app.application.exceptions.exceptions import DatabaseError
+
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingSpaceRepository:
+    def get_by_model(self, embedding_model: str, db: Session) -> Optional[EmbeddingSpace]:
+        try:
+            logger.debug("Fetching embedding space", extra={"embedding_model": embedding_model})
+            return db.query(EmbeddingSpace).filter(EmbeddingSpace.embedding_model == embedding_model).first()
+        except Exception as e:
+            logger.exception("Failed to fetch embedding space")
+            raise DatabaseError("Failed to fetch embedding space from database") from e
+
+    def get_all(self, db: Session) -> List[EmbeddingSpace]:
+        try:
+            return db.query(EmbeddingSpace).order_by(EmbeddingSpace.embedding_model).all()
+        except Exception as e:
+            logger.exception("Failed to fetch embedding spaces")
+            raise DatabaseError("Failed to fetch embedding spaces from database") from e
+
+    def get_models_by_status(self, statuses: Iterable[EmbeddingSpaceStatus], db: Session) -> List[str]:
+        try:
+            rows = (
+                db.query(EmbeddingSpace.embedding_model)
+                .filter(EmbeddingSpace.status.in_(list(statuses)))
+                .order_by(EmbeddingSpace.embedding_model)
+                .all()
+            )
+            return [row.embedding_model for row in rows]
+        except Exception as e:
+            logger.exception("Failed to fetch embedding spaces by status")
+            raise DatabaseError("Failed to fetch embedding spaces by status from database") from e
+
+    def get_active_model(self, db: Session) -> Optional[str]:
+        try:
+            return db.execute(text("SELECT embedding_model FROM embedding_space WHERE active")).scalar()
+        except Exception as e:
+            logger.exception("Failed to fetch active embedding space")
+            raise DatabaseError("Failed to fetch active embedding space from database") from e
+
+    def ensure_active(self, embedding_model: str, db: Session) -> None:
+        try:
+            # El espacio en uso antes de cualquier migración no tiene fila; se registra como activo
+            db.execute(text("""
+                INSERT INTO embedding_space (embedding_model, status, active, processed_fragments, finished_at, activated_at)
+                SELECT :embedding_model, 'ready', true, 0, now(), now()
+                WHERE NOT EXISTS (SELECT 1 FROM embedding_space WHERE active)
+                ON CONFLICT DO NOTHING
+            """), {"embedding_model": embedding_model})
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.exception("Failed to ensure active embedding space")
+            raise DatabaseError("Failed to ensure active embedding space") from e
+
+    def start_building(self, embedding_model: str, db: Session) -> Optional[EmbeddingSpace]:
+        try:
+            # El espacio activo o uno que ya se está llenando no se reinicia: devuelve None
+            started = db.execute(text("""
+                INSERT INTO embedding_space (embedding_model, status, active, processed_fragments, started_at, updated_at)
+                VALUES (:embedding_model, 'building', false, 0, now(), now())
+                ON CONFLICT (embedding_model) DO UPDATE
+                SET status = 'building', processed_fragments = 0, started_at = now(), updated_at = now(), finished_at = NULL
+                WHERE embedding_space.status <> 'building' AND NOT embedding_space.active
+            """), {"embedding_model": embedding_model}).rowcount
+            db.commit()
+            if not started:
+                return None
+            space = self.get_by_model(embedding_model, db)
+            db.refresh(space)
+            logger.info("Embedding space building", extra={"embedding_model": embedding_model})
+            return space
+        except Exception as e:
+            db.rollback()
+            logger.exception("Failed to start embedding space")
+            raise DatabaseError("Failed to start embedding space") from e
+
+    def record_progress(self, embedding_model: str, processed: int, db: Session) -> None:
+        try:
+            db.execute(text("""
+                UPDATE embedding_space
+                SET processed_fragments = processed_fragments + :processed, updated_at = now()
+                WHERE embedding_model = :embedding_model
+            """), {"embedding_model": embedding_model, "processed": processed})
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.exception("Failed to record embedding space progress")
+            raise DatabaseError("Failed to record embedding space progress") from e
+
+    def finish(self, embedding_model: str, status: EmbeddingSpaceStatus, db: Session) -> None:
+        try:
+            db.execute(text("""
+                UPDATE embedding_space
+                SET status = :status, updated_at = now(), finished_at = now()
+                WHERE embedding_model = :embedding_model
+            """), {"embedding_model": embedding_model, "status": status.value})
+            db.commit()
+            logger.info("Embedding space finished", extra={"embedding_model": embedding_model, "status": status.value})
+        except Exception as e:
+            db.rollback()
+            logger.exception("Failed to finish embedding space")
+            raise DatabaseError("Failed to finish embedding space") from e
+
+    def activate(self, embedding_model: str, db: Session) -> None:
+        try:
+            # Dos sentencias en una transacción: las consultas ven el espacio anterior o el nuevo, nunca
+            # ninguno. El índice único parcial sobre `active` se valida fila a fila, por eso no va en una sola
+            db.execute(text("UPDATE embedding_space SET active = false WHERE active"))
+            db.execute(text("""
+                UPDATE embedding_space SET active = true, activated_at = now()
+                WHERE embedding_model = :embedding_model
+            """), {"embedding_model": embedding_model})
+            db.commit()
+            logger.info("Embedding space activated", extra={"embedding_model": embedding_model})
+        except Exception as e:
+            db.rollback()
+            logger.exception("Failed to activate embedding space")
+            raise DatabaseError("Failed to activate embedding space") from e
+
+    def count_progress(self, embedding_model: str, db: Session) -> Tuple[int, int]:
+        try:
+            row = db.execute(text("""
+                SELECT (SELECT count(*) FROM fragment WHERE deleted_at IS NULL) AS total,
+                       (SELECT count(*) FROM fragment
+                        WHERE deleted_at IS NULL AND embedding_model = :embedding_model AND vector IS NOT NULL)
+                     + (SELECT count(*) FROM fragment_embedding e
+                        JOIN fragment f ON f.id = e.fragment_id
+                        WHERE f.deleted_at IS NULL AND e.embedding_model = :embedding_model) AS embedded
+            """), {"embedding_model": embedding_model}).one()
+            return row.total, row.embedded
+        except Exception as e:
+            logger.exception("Failed to count embedding space progress")
+            raise DatabaseError("Failed to count embedding space progress") from e
+
+    def try_lock(self, embedding_model: str, connection) -> bool:
+        # Lock de sesión sobre una conexión dedicada: un único job de re-vectorización por espacio en todo el cluster
+        return bool(connection.execute(
+            text("SELECT pg_try_advisory_lock(hashtext(:key))"),
+            {"key": f"embedding_space:{embedding_model}"}
+        ).scalar())
+
+    def unlock(self, embedding_model: str, connection) -> None:
+        connection.execute(
+            text("SELECT pg_advisory_unlock(hashtext(:key))"),
+            {"key": f"embedding_space:{embedding_model}"}
+        )
@@ -1,14 +1,33 @@
-from sqlalchemy import text, select
+from sqlalchemy import text, select, insert
 from sqlalchemy.orm import Session
 from typing import Optional, List, Any
+from datetime import datetime, timedelta
+import io
 import logging
+import struct
 
+import numpy as np
+
+from app.configuration.environment_variables import environment_variables
+from app.domain.constants.embedding_dimensions import EMBEDDING_DIMENSIONS
+from app.domain.constants.retrieval_mode import RetrievalMode
+from app.domain.dtos.retrieval_scope import RetrievalScope
 from app.domain.models.fragment import Fragment
 from app.application.exceptions.exceptions import DatabaseError
 
 
 logger = logging.getLogger(__name__)
 
+# Debe coincidir con la configuración de la columna generada `fragment.content_tsv`
+TEXT_SEARCH_CONFIG = "spanish"
+COPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+COPY_TRAILER = struct.pack(">h", -1)
+POSTGRES_EPOCH = datetime(2000, 1, 1)
+COPY_COLUMNS = (
+    "id", "document_id", "vector", "embedding_model", "content",
+    "fragment_index", "chunk_size", "page_number", "start_offset", "created_by", "created_at"
+)
+
 
 class FragmentRepository:
     def create(self, fragment: Fragment, db: Session) -> Fragment:
@@ -24,6 +43,100 @@ class FragmentRepository:
             logger.exception("Failed to create fragment in database")
             raise DatabaseError("Failed to create fragment in database") from e
 
+    def create_many(self, fragments: List[Fragment], db: Session, commit: bool = True) -> List[int]:
+        if not fragments:
+            return []
+
+        try:
+            logger.debug("Creating fragments in bulk", extra={
+                "document_id": fragments[0].document_id,
+                "count": len(fragments)
+            })
+
+            if len(fragments) >= environment_variables.fragment_copy_threshold:
+                ids = self._copy_fragments(fragments, db)
+            else:
+                ids = self._insert_fragments(fragments, db)
+
+            if commit:
+                db.commit()
+            logger.info("Fragments created successfully", extra={
+                "document_id": fragments[0].document_id,
+                "count": len(ids)
+            })
+            return ids
+        except Exception as e:
+            db.rollback()
+            logger.exception("Failed to create fragments in database")
+            raise DatabaseError("Failed to create fragments in database") from e
+
+    def _insert_fragments(self, fragments: List[Fragment], db: Session) -> List[int]:
+        rows = [
+            {column: getattr(fragment, column) for column in COPY_COLUMNS if column != "id"}
+            for fragment in fragments
+        ]
+        result = db.execute(insert(Fragment).returning(Fragment.id, sort_by_parameter_order=True), rows)
+        return list(result.scalars().all())
+
+    def _copy_fragments(self, fragments: List[Fragment], db: Session) -> List[int]:
+        ids = list(db.execute(
+            text("SELECT nextval(pg_get_serial_sequence('fragment', 'id')) FROM generate_series(1, :n)"),
+            {"n": len(fragments)}
+        ).scalars().all())
+
+        buffer = io.BytesIO()
+        buffer.write(COPY_SIGNATURE)
+        for fragment_id, fragment in zip(ids, fragments):
+            buffer.write(self._encode_copy_row(fragment_id, fragment))
+        buffer.write(COPY_TRAILER)
+        buffer.seek(0)
+
+        cursor = db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY fragment ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT binary)",
+                buffer
+            )
+        finally:
+            cursor.close()
+
+        return ids
+
+    @staticmethod
+    def _encode_copy_row(fragment_id: int, fragment: Fragment) -> bytes:
+        def field(value: bytes | None) -> bytes:
+            if value is None:
+                return struct.pack(">i", -1)
+            return struct.pack(">i", len(value)) + value
+
+        def int4(value: int | None) -> bytes | None:
+            return None if value is None else struct.pack(">i", value)
+
+        vector = None
+        if fragment.vector is not None:
+            # Con filas float32 de la ingesta es un único byteswap en C; las listas de floats se convierten elemento a elemento
+            values = np.asarray(fragment.vector, dtype=">f4")
+            vector = struct.pack(">HH", values.shape[0], 0) + values.tobytes()
+
+        embedding_model = fragment.embedding_model.encode("utf-8") if fragment.embedding_model else None
+        created_at = fragment.created_at or datetime.now()
+        created_at_micros = (created_at - POSTGRES_EPOCH) // timedelta(microseconds=1)
+
+        return b"".join((
+            struct.pack(">h", len(COPY_COLUMNS)),
+            field(struct.pack(">i", fragment_id)),
+            field(struct.pack(">q", fragment.document_id)),
+            field(vector),
+            field(embedding_model),
+            field(fragment.content.encode("utf-8")),
+            field(struct.pack(">i", fragment.fragment_index)),
+            field(struct.pack(">i", fragment.chunk_size)),
+            field(int4(fragment.page_number)),
+            field(int4(fragment.start_offset)),
+            field(struct.pack(">q", fragment.created_by)),
+            field(struct.pack(">q", created_at_micros)),
+        ))
+
     def get_by_id(self, fragment_id: int, db: Session) -> Optional[Fragment]:
         try:
             logger.debug("Fetching fragment by ID", extra={"fragment_id": fragment_id})
@@ -59,30 +172,189 @@ class FragmentRepository:
             logger.exception("Failed to fetch fragments by document ID")
             raise DatabaseError("Failed to fetch fragments by document ID") from e
 
+    def delete_by_document_id(self, document_id: int, db: Session, commit: bool = True) -> int:
+        try:
+            logger.debug("Deleting fragments by document ID", extra={"document_id": document_id})
+            deleted = db.query(Fragment).filter(Fragment.document_id == document_id).delete(synchronize_session=False)
+            if commit:
+                db.commit()
+            logger.info("Fragments deleted", extra={"document_id": document_id, "count": deleted})
+            return deleted
+        except Exception as e:
+            db.rollback()
+            logger.exception("Failed to delete fragments by document ID")
+            raise DatabaseError("Failed to delete fragments by document ID") from e
+
+    def clone_document_fragments(self,
+                                 source_document_id: int,
+                                 target_document_id: int,
+                                 created_by: int,
+                                 db: Session,
+                                 commit: bool = True) -> int:
+        try:
+            logger.debug("Cloning fragments between documents", extra={
+                "source_document_id": source_document_id,
+                "target_document_id": target_document_id
+            })
+            # Copia en el servidor: ni el contenido ni los vectores pasan por la aplicación
+            cloned = db.execute(text("""
+                INSERT INTO fragment (
+                    document_id, vector, embedding_model, content, fragment_index,
+                    chunk_size, page_number, start_offset, created_by, created_at
+                )
+                SELECT :target_document_id, vector, embedding_model, content, fragment_index,
+                       chunk_size, page_number, start_offset, :created_by, now()
+                FROM fragment
+                WHERE document_id = :source_document_id AND deleted_at IS NULL
+                ORDER BY fragment_index
+            """), {
+                "source_document_id": source_document_id,
+                "target_document_id": target_document_id,
+                "created_by": created_by
+            }).rowcount
+            # Los vectores de los demás espacios van en la misma transacción: el documento nunca queda
+            # con fragmentos sin vector en un espacio en construcción o recién activado
+            cloned_embeddings = db.execute(text("""
+                INSERT INTO fragment_embedding (embedding_model, fragment_id, vector, created_at)
+                SELECT e.embedding_model, t.id, e.vector, now()
+                FROM fragment s
+                JOIN fragment_embedding e ON e.fragment_id = s.id
+                JOIN fragment t ON t.document_id = :target_document_id AND t.fragment_index = s.fragment_index
+                WHERE s.document_id = :source_document_id AND s.deleted_at IS NULL AND t.deleted_at IS NULL
+                ON CONFLICT DO NOTHING
+            """), {
+                "source_document_id": source_document_id,
+                "target_document_id": target_document_id
+            }).rowcount
+            if commit:
+                db.commit()
+            logger.info("Fragments cloned", extra={
+                "source_document_id": source_document_id,
+                "target_document_id": target_document_id,
+                "count": cloned,
+                "embeddings": cloned_embeddings
+            })
+            return cloned
+        except Exception as e:
+            db.rollback()
+            logger.exception("Failed to clone fragments")
+            raise DatabaseError("Failed to clone fragments between documents") from e
+
+    def get_contents_by_document_id(self, document_id: int, db: Session) -> list:
+        try:
+            logger.debug("Fetching fragment contents by document ID", extra={"document_id": document_id})
+            return db.execute(text("""
+                SELECT id, content FROM fragment
+                WHERE document_id = :document_id AND deleted_at IS NULL
+                ORDER BY id
+            """), {"document_id": document_id}).fetchall()
+        except Exception as e:
+            logger.exception("Failed to fetch fragment contents by document ID")
+            raise DatabaseError("Failed to fetch fragment contents by document ID") from e
+
+    def get_pending_embeddings(self,
+                               embedding_model: str,
+                               after_id: int,
+                               limit: int,
+                               db: Session) -> list:
+        try:
+            logger.debug("Fetching fragments pending embedding", extra={
+                "embedding_model": embedding_model,
+                "after_id": after_id,
+                "limit": limit
+            })
+            # Recorrido por id (keyset): cada lote cuesta lo mismo sin importar cuánto se avanzó
+            return db.execute(text("""
+                SELECT f.id, f.content
+                FROM fragment f
+                WHERE f.id > :after_id
+                  AND f.deleted_at IS NULL
+                  AND f.embedding_model IS DISTINCT FROM :embedding_model
+                  AND NOT EXISTS (
+                      SELECT 1 FROM fragment_embedding e
+                      WHERE e.embedding_model = :embedding_model AND e.fragment_id = f.id
+                  )
+                ORDER BY f.id
+                LIMIT :limit
+            """), {"embedding_model": embedding_model, "after_id": after_id, "limit": limit}).fetchall()
+        except Exception as e:
+            logger.exception("Failed to fetch fragments pending embedding")
+            raise DatabaseError("Failed to fetch fragments pending embedding") from e
+
+    def create_embeddings(self,
+                          embedding_model: str,
+                          fragment_ids: List[int],
+                          vectors: np.ndarray,
+                          db: Session,
+                          commit: bool = True) -> int:
+        if not fragment_ids:
+            return 0
+
+        try:
+            # Una sola sentencia por lote; el JOIN descarta fragmentos borrados mientras se vectorizaban
+            # y ON CONFLICT los que otra pasada ya escribió
+            created = db.execute(text("""
+                INSERT INTO fragment_embedding (embedding_model, fragment_id, vector, created_at)
+                SELECT :embedding_model, v.fragment_id, CAST(v.vector AS vector), :created_at
+                FROM unnest(CAST(:fragment_ids AS bigint[]), CAST(:vectors AS text[])) AS v(fragment_id, vector)
+                JOIN fragment f ON f.id = v.fragment_id
+                ON CONFLICT DO NOTHING
+            """), {
+                "embedding_model": embedding_model,
+                "fragment_ids": list(fragment_ids),
+                "vectors": [self._vector_literal(vector) for vector in vectors],
+                "created_at": datetime.now()
+            }).rowcount
+            if commit:
+                db.commit()
+            logger.info("Fragment embeddings created", extra={"embedding_model": embedding_model, "count": created})
+            return created
+        except Exception as e:
+            db.rollback()
+            logger.exception("Failed to create fragment embeddings")
+            raise DatabaseError("Failed to create fragment embeddings") from e
+
     def get_most_similar(
             self,
-            query_vector: list[float],
+            query_vector: Optional[list[float]],
             k: int,
-            db: Session
+            db: Session,
+            embedding_model: str = "huggingface",
+            scope: Optional[RetrievalScope] = None,
+            query_text: Optional[str] = None,
+            mode: RetrievalMode = RetrievalMode.vector
     ) -> List[Fragment]:
         try:
-            logger.debug("Ejecutando búsqueda vectorial", extra={"k": k})
-
-            query_vector_str = "[" + ",".join(map(str, query_vector)) + "]"
-
-            sql = text(f"""
-               SELECT id,
-                      document_id,
-                      content,
-                      1 - (vector <=> '{query_vector_str}') AS cosine_similarity
-               FROM fragment
-               WHERE vector IS NOT NULL
-               ORDER BY cosine_similarity DESC LIMIT :k
-            """)
+            logger.debug("Ejecutando búsqueda", extra={"k": k, "embedding_model": embedding_model, "mode": mode.value})
 
-            results = db.execute(sql, {"k": k}).fetchall()
+            if scope is not None and not scope.is_empty():
+                results = self._search_in_scope(query_vector, query_text, k, embedding_model, scope, mode, db)
+            elif mode == RetrievalMode.lexical:
+                statement = self._prepare_lexical_statement(db)
+                results = db.execute(
+                    text(f"EXECUTE {statement}(:query_text, :k)"),
+                    {"query_text": query_text, "k": k}
+                ).fetchall()
+            elif mode == RetrievalMode.hybrid:
+                statement = self._prepare_hybrid_statement(embedding_model, db)
+                results = db.execute(
+                    text(f"EXECUTE {statement}(:query_vector, :query_text, :candidates, :k, :rrf_k)"),
+                    {
+                        "query_vector": self._vector_literal(query_vector),
+                        "query_text": query_text,
+                        "candidates": max(k, environment_variables.hybrid_candidates),
+                        "k": k,
+                        "rrf_k": environment_variables.hybrid_rrf_k
+                    }
+                ).fetchall()
+            else:
+                statement = self._prepare_knn_statement(embedding_model, db)
+                results = db.execute(
+                    text(f"EXECUTE {statement}(:query_vector, :k)"),
+                    {"query_vector": self._vector_literal(query_vector), "k": k}
+                ).fetchall()
 
-            logger.info("Búsqueda vectorial completada", extra={"count": len(results)})
+            logger.info("Búsqueda completada", extra={"count": len(results), "mode": mode.value})
 
             fragments = [
                 Fragment(
@@ -96,9 +368,218 @@ class FragmentRepository:
             return fragments
 
         except Exception as e:
-            logger.exception("Error durante la búsqueda vectorial")
+            logger.exception("Error durante la búsqueda")
             raise DatabaseError("Error al ejecutar búsqueda vectorial en pgvector") from e
 
+    def _search_in_scope(
+            self,
+            query_vector: Optional[list[float]],
+            query_text: Optional[str],
+            k: int,
+            embedding_model: str,
+            scope: RetrievalScope,
+            mode: RetrievalMode,
+            db: Session
+    ) -> list:
+        dimension = EMBEDDING_DIMENSIONS[embedding_model]
+
+        candidates = db.execute(text("""
+            WITH scope AS (
+                SELECT document_id FROM document_in_individual_chat
+                WHERE individual_chat_id = :individual_chat_id AND deleted_at IS NULL
+                UNION
+                SELECT document_id FROM document_in_group_chat
+                WHERE group_chat_id = :group_chat_id AND deleted_at IS NULL
+                UNION
+                SELECT document_id FROM document_in_document_collection
+                WHERE document_collection_id = :document_collection_id AND deleted_at IS NULL
+                UNION
+                SELECT unnest(CAST(:document_ids AS bigint[]))
+            )
+            SELECT (SELECT array_agg(document_id) FROM scope) AS document_ids,
+                   (SELECT count(*) FROM fragment
+                    WHERE document_id IN (SELECT document_id FROM scope)
+                      AND embedding_model = :embedding_model
+                      AND vector IS NOT NULL)
+                 + (SELECT count(*) FROM fragment_embedding e
+                    JOIN fragment f ON f.id = e.fragment_id
+                    WHERE f.document_id IN (SELECT document_id FROM scope)
+                      AND e.embedding_model = :embedding_model) AS fragments
+        """), {
+            "individual_chat_id": scope.individual_chat_id,
+            "group_chat_id": scope.group_chat_id,
+            "document_collection_id": scope.document_collection_id,
+            "document_ids": scope.document_ids or [],
+            "embedding_model": embedding_model
+        }).one()
+
+        if not candidates.document_ids:
+            return []
+
+        parameters = {"document_ids": candidates.document_ids, "k": k}
+        if mode == RetrievalMode.lexical:
+            parameters["query_text"] = query_text
+            return db.execute(text(self._lexical_candidates(":query_text", ":k", ":document_ids")), parameters).fetchall()
+
+        if not candidates.fragments and mode == RetrievalMode.vector:
+            return []
+
+        exact = candidates.fragments <= environment_variables.scoped_exact_search_threshold
+        logger.debug("Búsqueda acotada", extra={
+            "documents": len(candidates.document_ids),
+            "fragments": candidates.fragments,
+            "strategy": "exact" if exact else "index",
+            "mode": mode.value
+        })
+
+        parameters["query_vector"] = self._vector_literal(query_vector)
+        vector_candidates = self._vector_candidates(
+            embedding_model, dimension, f"CAST(:query_vector AS vector({dimension}))", ":k", ":document_ids", exact
+        )
+        if mode == RetrievalMode.vector:
+            return db.execute(text(vector_candidates), parameters).fetchall()
+
+        parameters.update({
+            "query_text": query_text,
+            "candidates": max(k, environment_variables.hybrid_candidates),
+            "rrf_k": environment_variables.hybrid_rrf_k
+        })
+        return db.execute(text(self._hybrid_query(
+            self._vector_candidates(
+                embedding_model, dimension, f"CAST(:query_vector AS vector({dimension}))", ":candidates", ":document_ids", exact
+            ),
+            self._lexical_candidates(":query_text", ":candidates", ":document_ids"),
+            ":k",
+            ":rrf_k"
+        )), parameters).fetchall()
+
+    @staticmethod
+    def _vector_candidates(
+            embedding_model: str,
+            dimension: int,
+            query_vector: str,
+            limit: str,
+            document_ids: Optional[str] = None,
+            exact: bool = False
+    ) -> str:
+        # The exact path orders by similarity instead of distance so the planner cannot
+        # pick the ANN index: it reads the candidates through the document_id btree and
+        # sorts them, which is exact and cheap for small scopes. The index path keeps the
+        # distance ordering and relies on iterative index scans to fill the limit after
+        # filtering; the outer ORDER BY restores strict order after a relaxed iterative scan.
+        # Vectors of the model live either on the fragment itself or, for a space filled by
+        # re-embedding, in fragment_embedding; each branch uses its own partial index.
+        distance = f"vector::vector({dimension}) <=> {query_vector}"
+        shadow_distance = f"e.vector::vector({dimension}) <=> {query_vector}"
+        document_filter = f"AND document_id = ANY({document_ids})" if document_ids else ""
+        shadow_document_filter = f"AND f.document_id = ANY({document_ids})" if document_ids else ""
+        return f"""
+            SELECT * FROM (
+                (SELECT id,
+                        document_id,
+                        content,
+                        1 - ({distance}) AS cosine_similarity
+                 FROM fragment
+                 WHERE embedding_model = '{embedding_model}'
+                   AND vector IS NOT NULL
+                   {document_filter}
+                 ORDER BY {"cosine_similarity DESC" if exact else distance} LIMIT {limit})
+                UNION ALL
+                (SELECT f.id,
+                        f.document_id,
+                        f.content,
+                        1 - ({shadow_distance}) AS cosine_similarity
+                 FROM fragment_embedding e
+                 JOIN fragment f ON f.id = e.fragment_id
+                 WHERE e.embedding_model = '{embedding_model}'
+                   {shadow_document_filter}
+                 ORDER BY {"cosine_similarity DESC" if exact else shadow_distance} LIMIT {limit})
+            ) AS nearest
+            ORDER BY cosine_similarity DESC LIMIT {limit}
+        """
+
+    @staticmethod
+    def _lexical_candidates(query_text: str, limit: str, document_ids: Optional[str] = None) -> str:
+        # plainto_tsquery combina los términos con AND, demasiado estricto para una pregunta en
+        # lenguaje natural; con OR cualquier término (p. ej. un código o número de artículo) basta
+        # para ser candidato y ts_rank_cd premia a los fragmentos que reúnen más términos
+        document_filter = f"AND fragment.document_id = ANY({document_ids})" if document_ids else ""
+        return f"""
+            SELECT id,
+                   document_id,
+                   content,
+                   ts_rank_cd(content_tsv, lexical.query) AS lexical_rank
+            FROM fragment,
+                 (SELECT replace(plainto_tsquery('{TEXT_SEARCH_CONFIG}', {query_text})::text, '&', '|')::tsquery AS query) AS lexical
+            WHERE content_tsv @@ lexical.query
+              {document_filter}
+            ORDER BY lexical_rank DESC LIMIT {limit}
+        """
+
+    @staticmethod
+    def _hybrid_query(vector_candidates: str, lexical_candidates: str, limit: str, rrf_k: str) -> str:
+        # Reciprocal rank fusion: cada lista aporta 1 / (rrf_k + posición); no hace falta
+        # normalizar escalas tan distintas como la similitud coseno y ts_rank_cd
+        return f"""
+            WITH vector_ranked AS (
+                SELECT id, document_id, content, row_number() OVER (ORDER BY cosine_similarity DESC) AS rank
+                FROM ({vector_candidates}) AS nearest
+            ),
+            lexical_ranked AS (
+                SELECT id, document_id, content, row_number() OVER (ORDER BY lexical_rank DESC) AS rank
+                FROM ({lexical_candidates}) AS matches
+            )
+            SELECT id, document_id, content, sum(1.0 / ({rrf_k} + rank)) AS rrf_score
+            FROM (
+                SELECT * FROM vector_ranked
+                UNION ALL
+                SELECT * FROM lexical_ranked
+            ) AS candidates
+            GROUP BY id, document_id, content
+            ORDER BY rrf_score DESC LIMIT {limit}
+        """
+
+    @staticmethod
+    def _prepare_statement(name: str, signature: str, query: str, db: Session) -> str:
+        connection_info = db.connection().connection.info
+        prepared = connection_info.setdefault("prepared_statements", set())
+        if name not in prepared:
+            db.execute(text(f"PREPARE {name} ({signature}) AS {query}"))
+            prepared.add(name)
+            logger.debug("Prepared search statement", extra={"statement": name})
+        return name
+
+    def _prepare_knn_statement(self, embedding_model: str, db: Session) -> str:
+        dimension = EMBEDDING_DIMENSIONS[embedding_model]
+        return self._prepare_statement(
+            f"fragment_knn_{embedding_model}",
+            f"vector({dimension}), integer",
+            self._vector_candidates(embedding_model, dimension, "$1", "$2"),
+            db
+        )
+
+    def _prepare_lexical_statement(self, db: Session) -> str:
+        return self._prepare_statement("fragment_lexical", "text, integer", self._lexical_candidates("$1", "$2"), db)
+
+    def _prepare_hybrid_statement(self, embedding_model: str, db: Session) -> str:
+        # Candidatos léxicos y ANN en una sola ida y vuelta; $3 candidatos por lista, $4 resultados
+        dimension = EMBEDDING_DIMENSIONS[embedding_model]
+        return self._prepare_statement(
+            f"fragment_hybrid_{embedding_model}",
+            f"vector({dimension}), text, integer, integer, integer",
+            self._hybrid_query(
+                self._vector_candidates(embedding_model, dimension, "$1", "$3"),
+                self._lexical_candidates("$2", "$3"),
+                "$4",
+                "$5"
+            ),
+            db
+        )
+
+    @staticmethod
+    def _vector_literal(vector) -> str:
+        return "[" + ",".join(map(str, np.asarray(vector, dtype=np.float32))) + "]"
+
     def update(self, fragment: Fragment, db: Session) -> Fragment:
         try:
             logger.debug("Updating fragment in database", extra={"fragment_id": fragment.id})
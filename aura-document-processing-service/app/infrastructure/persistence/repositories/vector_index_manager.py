@@ -0,0 +1,208 @@
+import logging
+import re
+import time
+from typing import List, Optional
+
+from sqlalchemy import text
+
+from app.application.exceptions.exceptions import ConfigError, DatabaseError, NotFoundError
+from app.configuration.environment_variables import environment_variables
+from app.domain.constants.embedding_dimensions import EMBEDDING_DIMENSIONS
+from app.infrastructure.persistence.repositories.database_client import DatabaseClient
+
+
+logger = logging.getLogger(__name__)
+
+INDEX_TYPES = ("hnsw", "ivfflat")
+VECTOR_TABLES = {
+    "fragment": "ix_fragment_vector",
+    "fragment_embedding": "ix_fragment_embedding_vector",
+}
+SUPPORTING_INDEXES = {
+    "ix_fragment_document_id": "fragment (document_id)",
+    "ix_fragment_content_tsv": "fragment USING gin (content_tsv)",
+    "ix_document_in_individual_chat_individual_chat_id": "document_in_individual_chat (individual_chat_id, document_id)",
+    "ix_document_in_group_chat_group_chat_id": "document_in_group_chat (group_chat_id, document_id)",
+    "ix_fragment_embedding_fragment_id": "fragment_embedding (fragment_id)",
+}
+EMBEDDING_MODEL_PATTERN = re.compile(r"^[a-z0-9_]+$")
+
+
+class VectorIndexManager:
+    """Creates and rebuilds the per-embedding-model ANN indexes on ``fragment.vector``.
+
+    Each embedding model gets a partial index over ``vector::vector(dim)`` restricted to
+    ``embedding_model = '<model>'``, so models with different dimensions can share the
+    column and every index only covers the rows it can answer for. The same applies to
+    ``fragment_embedding.vector``, where re-embedding jobs store the vectors of a new
+    embedding space. DDL runs with ``CONCURRENTLY`` on an autocommit connection so
+    ingestion and search keep working. The btree indexes that scoped retrieval filters
+    on are ensured alongside.
+
+    IVFFlat trains its lists on the rows present when the index is built, so an IVFFlat
+    index is only created once the model has ``ivfflat_min_rows`` rows (and at least one
+    per list); until then queries fall back to an exact scan. Every ensure pass (startup,
+    end of a re-embedding run, rebuild) re-checks the row count.
+    """
+
+    def __init__(self, database_client: DatabaseClient):
+        self.database_client = database_client
+
+    @staticmethod
+    def index_name(embedding_model: str, table: str = "fragment") -> str:
+        return f"{VECTOR_TABLES[table]}_{embedding_model}"
+
+    @staticmethod
+    def configured_models() -> List[str]:
+        return [m.strip() for m in environment_variables.vector_index_models.split(",") if m.strip()]
+
+    def ensure_indexes(self) -> None:
+        for name, target in SUPPORTING_INDEXES.items():
+            self._execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {target}")
+
+        if environment_variables.vector_index_type == "none":
+            logger.info("Vector index management disabled")
+            return
+        for embedding_model in self.configured_models():
+            self.ensure_model_indexes(embedding_model)
+
+    def ensure_model_indexes(self, embedding_model: str) -> None:
+        if environment_variables.vector_index_type == "none":
+            return
+        for table in VECTOR_TABLES:
+            if not self._has_enough_rows(embedding_model, table):
+                continue
+            self._execute(self._create_statement(
+                embedding_model, self.index_name(embedding_model, table), table, if_not_exists=True
+            ))
+        logger.info("Vector index ensured", extra={
+            "embedding_model": embedding_model,
+            "index_type": environment_variables.vector_index_type
+        })
+
+    def rebuild_index(self, embedding_model: str) -> float:
+        """Builds fresh indexes next to the current ones and swaps them in, returning the build seconds."""
+        start = time.perf_counter()
+        for table in VECTOR_TABLES:
+            if not self._has_enough_rows(embedding_model, table):
+                continue
+            name = self.index_name(embedding_model, table)
+            new_name = f"{name}_new"
+            old_name = f"{name}_old"
+
+            logger.info("Rebuilding vector index", extra={"embedding_model": embedding_model, "index": name})
+            self._execute(f"DROP INDEX CONCURRENTLY IF EXISTS {new_name}")
+            self._execute(f"DROP INDEX CONCURRENTLY IF EXISTS {old_name}")
+            self._execute(self._create_statement(embedding_model, new_name, table, if_not_exists=False))
+            # Intercambio en una sola transacción: las consultas ven el índice anterior o el nuevo, nunca ninguno
+            self._execute_transaction([
+                f"ALTER INDEX IF EXISTS {name} RENAME TO {old_name}",
+                f"ALTER INDEX {new_name} RENAME TO {name}",
+                f"DROP INDEX IF EXISTS {old_name}",
+            ])
+
+        elapsed = time.perf_counter() - start
+        logger.info("Vector index rebuilt", extra={
+            "embedding_model": embedding_model,
+            "index": self.index_name(embedding_model),
+            "seconds": round(elapsed, 2)
+        })
+        return elapsed
+
+    def list_indexes(self) -> List[dict]:
+        try:
+            with self.database_client.engine.connect() as connection:
+                rows = connection.execute(text("""
+                    SELECT c.relname AS name,
+                           am.amname AS method,
+                           i.indisvalid AS valid,
+                           pg_relation_size(c.oid) AS size_bytes,
+                           pg_get_indexdef(c.oid) AS definition
+                    FROM pg_index i
+                    JOIN pg_class c ON c.oid = i.indexrelid
+                    JOIN pg_am am ON am.oid = c.relam
+                    WHERE i.indrelid IN ('fragment'::regclass, 'fragment_embedding'::regclass)
+                      AND am.amname IN ('hnsw', 'ivfflat')
+                    ORDER BY c.relname
+                """)).mappings().all()
+            return [dict(row) for row in rows]
+        except Exception as e:
+            logger.exception("Failed to list vector indexes")
+            raise DatabaseError("Failed to list vector indexes") from e
+
+    def _create_statement(self, embedding_model: str, name: str, table: str, if_not_exists: bool) -> str:
+        dimension = self._dimension(embedding_model)
+        index_type = environment_variables.vector_index_type
+        if index_type not in INDEX_TYPES:
+            raise ConfigError(f"Unsupported vector index type: {index_type}")
+
+        if index_type == "hnsw":
+            options = f"m = {environment_variables.hnsw_m}, ef_construction = {environment_variables.hnsw_ef_construction}"
+        else:
+            options = f"lists = {environment_variables.ivfflat_lists}"
+
+        return (
+            f"CREATE INDEX CONCURRENTLY {'IF NOT EXISTS ' if if_not_exists else ''}{name} "
+            f"ON {table} USING {index_type} ((vector::vector({dimension})) vector_cosine_ops) "
+            f"WITH ({options}) "
+            f"WHERE embedding_model = '{embedding_model}'"
+        )
+
+    def _has_enough_rows(self, embedding_model: str, table: str) -> bool:
+        if environment_variables.vector_index_type != "ivfflat":
+            return True
+
+        min_rows = max(environment_variables.ivfflat_min_rows, environment_variables.ivfflat_lists)
+        rows = self._count_rows(embedding_model, table, min_rows)
+        if rows < min_rows:
+            logger.info("IVFFlat index deferred until the model has enough rows", extra={
+                "embedding_model": embedding_model,
+                "index": self.index_name(embedding_model, table),
+                "rows": rows,
+                "min_rows": min_rows
+            })
+            return False
+        return True
+
+    def _count_rows(self, embedding_model: str, table: str, limit: int) -> int:
+        self._dimension(embedding_model)
+        try:
+            with self.database_client.engine.connect() as connection:
+                # Basta con saber si se alcanza el mínimo: no se recorre la tabla entera
+                return connection.execute(text(f"""
+                    SELECT count(*) FROM (
+                        SELECT 1 FROM {table}
+                        WHERE embedding_model = :embedding_model AND vector IS NOT NULL
+                        LIMIT :limit
+                    ) AS sample
+                """), {"embedding_model": embedding_model, "limit": limit}).scalar()
+        except Exception as e:
+            logger.exception("Failed to count vector rows", extra={"embedding_model": embedding_model, "table": table})
+            raise DatabaseError("Failed to count vector rows") from e
+
+    @staticmethod
+    def _dimension(embedding_model: str) -> int:
+        if not EMBEDDING_MODEL_PATTERN.match(embedding_model):
+            raise ConfigError(f"Invalid embedding model name: {embedding_model}")
+        dimension: Optional[int] = EMBEDDING_DIMENSIONS.get(embedding_model)
+        if dimension is None:
+            raise NotFoundError(f"Unknown embedding model: {embedding_model}")
+        return dimension
+
+    def _execute(self, statement: str) -> None:
+        try:
+            engine = self.database_client.engine.execution_options(isolation_level="AUTOCOMMIT")
+            with engine.connect() as connection:
+                connection.execute(text(statement))
+        except Exception as e:
+            logger.exception("Vector index DDL failed", extra={"statement": statement})
+            raise DatabaseError("Failed to manage vector index") from e
+
+    def _execute_transaction(self, statements: List[str]) -> None:
+        try:
+            with self.database_client.engine.begin() as connection:
+                for statement in statements:
+                    connection.execute(text(statement))
+        except Exception as e:
+            logger.exception("Vector index DDL failed", extra={"statements": statements})
+            raise DatabaseError("Failed to manage vector index") from e
@@ -0,0 +1,83 @@
+import gzip
+import io
+import json
+import logging
+from typing import List, Optional
+
+from minio.error import S3Error
+
+from app.application.exceptions.exceptions import StorageError
+from app.infrastructure.persistence.storages.minio_client import MinioClient
+
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_VERSION = 1
+
+
+def encode_artifact(cleaner_type: str, pages: List[str]) -> bytes:
+    # El índice de cada página en la lista es su número de página (mapa de páginas de los fragmentos)
+    artifact = {"version": ARTIFACT_VERSION, "cleaner_type": cleaner_type, "pages": pages}
+    return gzip.compress(json.dumps(artifact, ensure_ascii=False).encode("utf-8"), compresslevel=6)
+
+
+def decode_artifact(payload: bytes) -> Optional[List[str]]:
+    artifact = json.loads(gzip.decompress(payload))
+    if artifact.get("version") != ARTIFACT_VERSION:
+        return None
+    return artifact["pages"]
+
+
+class ExtractionArtifactRepository:
+    def __init__(self, client: MinioClient):
+        self.client = client.client
+        self.bucket_name = "documents"
+        self.client_wrapper = client
+        self.client_wrapper.ensure_bucket(self.bucket_name)
+
+    def save(self, content_sha256: str, cleaner_type: str, pages: List[str]) -> str:
+        key = self._key(content_sha256, cleaner_type)
+        payload = encode_artifact(cleaner_type, pages)
+        try:
+            self.client.put_object(
+                bucket_name=self.bucket_name,
+                object_name=key,
+                data=io.BytesIO(payload),
+                length=len(payload),
+                content_type="application/gzip"
+            )
+            logger.info("Extraction artifact stored", extra={"key": key, "pages": len(pages), "bytes": len(payload)})
+            return key
+        except S3Error as e:
+            logger.exception("Failed storing extraction artifact")
+            raise StorageError("Failed storing extraction artifact") from e
+
+    def load(self, content_sha256: str, cleaner_type: str) -> Optional[List[str]]:
+        key = self._key(content_sha256, cleaner_type)
+        try:
+            response = self.client.get_object(self.bucket_name, key)
+            try:
+                payload = response.read()
+            finally:
+                response.close()
+                response.release_conn()
+        except S3Error as e:
+            if e.code in ("NoSuchKey", "NoSuchObject"):
+                return None
+            logger.exception("Failed reading extraction artifact")
+            raise StorageError("Failed reading extraction artifact") from e
+
+        try:
+            pages = decode_artifact(payload)
+        except (OSError, ValueError) as e:
+            raise StorageError("Corrupted extraction artifact") from e
+        if pages is None:
+            logger.warning("Ignoring extraction artifact with unknown version", extra={"key": key})
+            return None
+        logger.debug("Extraction artifact loaded", extra={"key": key, "pages": len(pages)})
+        return pages
+
+    @staticmethod
+    def _key(content_sha256: str, cleaner_type: str) -> str:
+        # Junto al original (`<sha256><sufijo>`): el mismo contenido con el mismo limpiador comparte artefacto
+        return f"{content_sha256}.{cleaner_type}.pages.json.gz"
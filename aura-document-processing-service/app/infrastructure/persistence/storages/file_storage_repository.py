@@ -1,13 +1,12 @@
 import logging
-import uuid
-import os
 from pathlib import Path
-from typing import BinaryIO
-from fastapi import UploadFile
+from typing import BinaryIO, Optional
 from minio.error import S3Error
 
 from app.application.exceptions.exceptions import StorageError
+from app.configuration.environment_variables import environment_variables
 from app.infrastructure.persistence.storages.minio_client import MinioClient
+from app.infrastructure.persistence.storages.streaming_upload import StreamingUpload
 
 
 logger = logging.getLogger(__name__)
@@ -20,29 +19,17 @@ class FileStorageRepository:
         self.client_wrapper = client
         self.client_wrapper.ensure_bucket(self.bucket_name)
 
-    def upload(self, file: UploadFile, local_path: Path) -> str:
-        file_key = f"{uuid.uuid4()}{Path(file.filename).suffix}"
-        file_size = os.path.getsize(local_path)
-
-        try:
-            with open(local_path, "rb") as f:
-                self.client.put_object(
-                    bucket_name=self.bucket_name,
-                    object_name=file_key,
-                    data=f,
-                    length=file_size,
-                    content_type=file.content_type,
-                )
-
-            logger.info(f"File uploaded: {file_key}")
-            return file_key
-
-        except S3Error as e:
-            logger.exception("Failed uploading file to MinIO")
-            raise StorageError("Failed uploading file to storage") from e
-        except Exception as e:
-            logger.exception("Unexpected error uploading file")
-            raise StorageError("Unexpected error uploading file") from e
+    def start_upload(self, file_name: str, content_type: str, local_path: Optional[Path] = None) -> StreamingUpload:
+        return StreamingUpload(
+            self.client,
+            self.bucket_name,
+            Path(file_name).suffix,
+            content_type,
+            max_bytes=environment_variables.max_file_size_mb * 1024 * 1024,
+            part_size=environment_variables.upload_part_size_mb * 1024 * 1024,
+            max_parallel_parts=environment_variables.upload_max_parallel_parts,
+            local_path=local_path
+        )
 
     def download(self, file_key: str) -> BinaryIO:
         try:
@@ -50,6 +37,15 @@ class FileStorageRepository:
         except S3Error:
             raise StorageError("Failed to download file from storage")
 
+    def download_to(self, file_key: str, local_path: Path) -> Path:
+        try:
+            self.client.fget_object(self.bucket_name, file_key, str(local_path))
+            logger.info(f"File downloaded: {file_key}")
+            return local_path
+        except S3Error as e:
+            logger.exception("Failed downloading file from MinIO")
+            raise StorageError("Failed to download file from storage") from e
+
     def delete(self, file_key: str):
         try:
             self.client.remove_object(self.bucket_name, file_key)
@@ -0,0 +1,192 @@
+import hashlib
+import io
+import logging
+import uuid
+from collections import deque
+from concurrent.futures import Future
+from pathlib import Path
+from typing import BinaryIO, Deque, List, Optional
+
+from minio import Minio
+from minio.commonconfig import CopySource
+from minio.datatypes import Part
+from minio.error import S3Error
+
+from app.application.exceptions.exceptions import StorageError, ValidationError
+from app.infrastructure.executors.executors import get_upload_part_executor
+
+
+logger = logging.getLogger(__name__)
+
+# S3 exige partes de al menos 5 MiB, salvo la última
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+class StreamingUpload:
+    """Subida a MinIO que se alimenta por trozos a medida que llega el cuerpo de la petición.
+
+    `feed` calcula el sha256 y controla el tamaño máximo sin hacer I/O; cuando
+    junta una parte completa la devuelve para que el llamador la envíe con
+    `upload_part` (fuera del event loop). Las partes se suben en paralelo, con
+    como mucho `max_parallel_parts` en vuelo por subida. Un archivo que no llega
+    a completar una parte se sube con un único `put_object` al final.
+
+    El objeto final se guarda bajo su sha256 (`<sha256><sufijo>`), que sólo se
+    conoce al terminar: las subidas multipart van a una clave temporal en
+    `staging/` y al completar se copian en el servidor a la clave definitiva,
+    salvo que ese contenido ya exista, en cuyo caso sólo se borra la temporal.
+
+    Si se indica `local_path`, los bytes también se escriben en ese archivo
+    para que la ingesta pueda leerlos sin descargarlos de nuevo.
+    """
+
+    def __init__(self,
+                 client: Minio,
+                 bucket_name: str,
+                 suffix: str,
+                 content_type: str,
+                 max_bytes: int,
+                 part_size: int,
+                 max_parallel_parts: int,
+                 local_path: Optional[Path] = None):
+        self.client = client
+        self.bucket_name = bucket_name
+        self.suffix = suffix
+        self.staging_key = f"staging/{uuid.uuid4()}{suffix}"
+        self.file_key: Optional[str] = None
+        self.content_type = content_type
+        self.max_bytes = max_bytes
+        self.part_size = max(part_size, MIN_PART_SIZE)
+        self.max_parallel_parts = max(1, max_parallel_parts)
+        self.local_path = local_path
+        self.size = 0
+
+        self._hash = hashlib.sha256()
+        self._buffer = bytearray()
+        self._upload_id: Optional[str] = None
+        self._parts: List[Part] = []
+        self._in_flight: Deque[Future] = deque()
+        self._local_file: Optional[BinaryIO] = local_path.open("wb") if local_path else None
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    def feed(self, chunk: bytes) -> Optional[bytes]:
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise ValidationError(f"File exceeds max size ({self.max_bytes // (1024 * 1024)} MB)")
+
+        self._hash.update(chunk)
+        self._buffer += chunk
+        if len(self._buffer) < self.part_size:
+            return None
+
+        part = bytes(self._buffer[:self.part_size])
+        del self._buffer[:self.part_size]
+        return part
+
+    def upload_part(self, data: bytes) -> None:
+        try:
+            if self._upload_id is None:
+                # API de bajo nivel del SDK: `put_object` no permite alimentar las partes desde un stream asíncrono
+                self._upload_id = self.client._create_multipart_upload(
+                    self.bucket_name, self.staging_key, {"Content-Type": self.content_type}
+                )
+            self._write_local(data)
+
+            part_number = len(self._parts) + len(self._in_flight) + 1
+            self._in_flight.append(get_upload_part_executor().submit(self._send_part, data, part_number))
+            while len(self._in_flight) >= self.max_parallel_parts:
+                self._parts.append(self._in_flight.popleft().result())
+        except S3Error as e:
+            logger.exception("Failed uploading part to MinIO", extra={"file_key": self.staging_key})
+            raise StorageError("Failed uploading file to storage") from e
+        except StorageError:
+            raise
+        except Exception as e:
+            logger.exception("Unexpected error uploading part", extra={"file_key": self.staging_key})
+            raise StorageError("Unexpected error uploading file") from e
+
+    def complete(self) -> str:
+        tail = bytes(self._buffer)
+        self._buffer.clear()
+        file_key = f"{self.sha256}{self.suffix}"
+        try:
+            if self._upload_id is None:
+                self._write_local(tail)
+                deduplicated = self._exists(file_key)
+                if not deduplicated:
+                    self.client.put_object(
+                        bucket_name=self.bucket_name,
+                        object_name=file_key,
+                        data=io.BytesIO(tail),
+                        length=len(tail),
+                        content_type=self.content_type,
+                    )
+            else:
+                if tail:
+                    self.upload_part(tail)
+                while self._in_flight:
+                    self._parts.append(self._in_flight.popleft().result())
+                self.client._complete_multipart_upload(self.bucket_name, self.staging_key, self._upload_id, self._parts)
+                self._upload_id = None
+
+                deduplicated = self._exists(file_key)
+                if not deduplicated:
+                    self.client.copy_object(self.bucket_name, file_key, CopySource(self.bucket_name, self.staging_key))
+                self.client.remove_object(self.bucket_name, self.staging_key)
+            self._close_local()
+
+            self.file_key = file_key
+            logger.info("File uploaded", extra={
+                "file_key": file_key,
+                "size": self.size,
+                "parts": len(self._parts) or 1,
+                "deduplicated": deduplicated
+            })
+            return file_key
+        except S3Error as e:
+            logger.exception("Failed completing upload to MinIO", extra={"file_key": file_key})
+            raise StorageError("Failed uploading file to storage") from e
+        except StorageError:
+            raise
+        except Exception as e:
+            logger.exception("Unexpected error completing upload", extra={"file_key": file_key})
+            raise StorageError("Unexpected error uploading file") from e
+
+    def abort(self) -> None:
+        self._close_local()
+        for future in self._in_flight:
+            future.cancel()
+        self._in_flight.clear()
+        if self._upload_id is None:
+            return
+        try:
+            self.client._abort_multipart_upload(self.bucket_name, self.staging_key, self._upload_id)
+            logger.info("Upload aborted", extra={"file_key": self.staging_key})
+        except S3Error:
+            logger.warning("Failed aborting multipart upload", extra={"file_key": self.staging_key}, exc_info=True)
+
+    def _exists(self, file_key: str) -> bool:
+        try:
+            self.client.stat_object(self.bucket_name, file_key)
+            return True
+        except S3Error as e:
+            if e.code in ("NoSuchKey", "NoSuchObject"):
+                return False
+            raise
+
+    def _send_part(self, data: bytes, part_number: int) -> Part:
+        etag = self.client._upload_part(self.bucket_name, self.staging_key, data, None, self._upload_id, part_number)
+        return Part(part_number, etag)
+
+    def _write_local(self, data: bytes) -> None:
+        if self._local_file is not None and data:
+            self._local_file.write(data)
+
+    def _close_local(self) -> None:
+        if self._local_file is not None:
+            self._local_file.close()
+            self._local_file = None
+
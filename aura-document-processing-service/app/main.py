@@ -1,13 +1,20 @@
 from fastapi import FastAPI
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
+import asyncio
 import logging
+import threading
 from fastapi.responses import JSONResponse
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api import router
 from app.configuration.logging_configuration import configure_logging
 from app.application.exceptions.exceptions import AppError
+from app.application.processors.embeddings.embedding_model_registry import EmbeddingModelRegistry
+from app.configuration.dependencies import get_embedding_migration_service, get_ingestion_job_service, get_ingestion_queue
+from app.configuration.environment_variables import environment_variables
+from app.infrastructure.executors.executors import shutdown_executors
 from app.infrastructure.persistence.repositories.database_client import DatabaseClient
+from app.infrastructure.persistence.repositories.vector_index_manager import VectorIndexManager
 
 
 configure_logging(level=logging.INFO)
@@ -15,6 +22,26 @@ configure_logging(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+async def unload_idle_embedding_models() -> None:
+    registry = EmbeddingModelRegistry()
+    while True:
+        await asyncio.sleep(environment_variables.embedding_model_sweep_interval_seconds)
+        unloaded = registry.unload_idle(environment_variables.embedding_model_idle_seconds)
+        if unloaded:
+            logger.info("Idle embedding models unloaded", extra={"count": unloaded})
+
+
+async def fill_embedding_spaces(stop: threading.Event) -> None:
+    # Sólo con la cola en proceso (inline): si no, los espacios los llena el worker de ingesta
+    migration_service = get_embedding_migration_service()
+    while True:
+        try:
+            await asyncio.to_thread(migration_service.run_pending, stop)
+        except Exception:
+            logger.exception("Failed filling embedding spaces")
+        await asyncio.sleep(environment_variables.embedding_migration_poll_seconds)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting application...")
@@ -24,12 +51,42 @@ async def lifespan(app: FastAPI):
         logger.error("Database health check failed!")
         raise Exception("Cannot start application: Database is not available")
 
+    if environment_variables.vector_index_ensure_on_startup:
+        try:
+            await asyncio.to_thread(VectorIndexManager(db_client).ensure_indexes)
+        except AppError:
+            logger.exception("Failed to ensure vector indexes")
+
+    sweeper = None
+    if environment_variables.embedding_model_idle_seconds > 0:
+        sweeper = asyncio.create_task(unload_idle_embedding_models())
+
+    backfill = None
+    backfill_stop = threading.Event()
+    if environment_variables.ingestion_queue_backend == "inline":
+        backfill = asyncio.create_task(fill_embedding_spaces(backfill_stop))
+
     logger.info("Application startup complete")
 
     yield
 
     logger.info("Shutting down application...")
 
+    # La pasada en curso corre en otro hilo: cancelar la tarea no la detiene
+    backfill_stop.set()
+    for task in (sweeper, backfill):
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+    if get_ingestion_queue.cache_info().currsize:
+        get_ingestion_queue().close()
+    # Con la cola en proceso (inline) el pipeline de ingesta vive en la API
+    if get_ingestion_job_service.cache_info().currsize:
+        get_ingestion_job_service().ingestion_service.close()
+
+    shutdown_executors()
     db_client.close()
 
     logger.info("Application shutdown complete")
@@ -0,0 +1,82 @@
+"""Worker de ingesta.
+
+Consume los trabajos publicados por la API en la cola configurada
+(`INGESTION_QUEUE_BACKEND`) y ejecuta lectura, limpieza, división, embeddings
+y persistencia fuera del proceso web. En un hilo aparte llena los espacios de
+embeddings en construcción (cada `EMBEDDING_MIGRATION_POLL_SECONDS`).
+
+Uso:
+    python -m app.worker
+"""
+import logging
+import signal
+import sys
+import threading
+
+from app.application.services.embedding_migration_service import EmbeddingMigrationService
+from app.configuration.dependencies import (
+    get_database_client,
+    get_embedding_migration_service,
+    get_ingestion_job_service,
+    get_ingestion_queue
+)
+from app.configuration.environment_variables import environment_variables
+from app.configuration.logging_configuration import configure_logging
+from app.infrastructure.executors.executors import shutdown_executors
+
+
+configure_logging(level=logging.INFO)
+
+logger = logging.getLogger(__name__)
+
+
+def fill_embedding_spaces(migration_service: EmbeddingMigrationService, stop: threading.Event) -> None:
+    # La primera pasada retoma al arrancar lo que otro worker dejó a medias
+    while not stop.is_set():
+        try:
+            migration_service.run_pending(stop)
+        except Exception:
+            logger.exception("Failed filling embedding spaces")
+        stop.wait(environment_variables.embedding_migration_poll_seconds)
+
+
+def main() -> None:
+    db_client = get_database_client()
+    if not db_client.health_check():
+        logger.error("Database health check failed!")
+        sys.exit(1)
+
+    queue = get_ingestion_queue()
+    job_service = get_ingestion_job_service()
+
+    def stop(signum, _frame):
+        logger.info("Stopping ingestion worker", extra={"signal": signum})
+        queue.close()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    backfill_stop = threading.Event()
+    backfill = threading.Thread(
+        target=fill_embedding_spaces,
+        args=(get_embedding_migration_service(), backfill_stop),
+        name="embedding-space-backfill",
+        daemon=True
+    )
+    backfill.start()
+
+    logger.info("Ingestion worker started")
+    try:
+        queue.consume(job_service.handle)
+    finally:
+        # Un espacio interrumpido sigue en construcción y se retoma en el próximo arranque
+        backfill_stop.set()
+        backfill.join()
+        job_service.ingestion_service.close()
+        shutdown_executors()
+        db_client.close()
+        logger.info("Ingestion worker stopped")
+
+
+if __name__ == "__main__":
+    main()
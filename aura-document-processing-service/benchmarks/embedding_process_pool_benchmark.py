@@ -0,0 +1,65 @@
+"""Throughput de `ProcessPoolEmbedding` frente al modelo en el proceso actual.
+
+Vectoriza el mismo corpus con el proveedor cargado en este proceso y con pools
+de distinta cantidad de workers, y reporta documentos por segundo, speedup y
+la diferencia máxima entre vectores (deben coincidir salvo ruido numérico).
+
+Uso:
+    python -m benchmarks.embedding_process_pool_benchmark --method huggingface --texts 4096 --workers 2 4 8
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from app.application.processors.embeddings.embeddings_factory import EmbeddingsFactory
+from app.application.processors.embeddings.process_pool_embedding import ProcessPoolEmbedding
+
+
+WORDS = (
+    "contrato plazo entrega proveedor cláusula rescisión obligación factura pago "
+    "artículo partes vigencia garantía penalidad servicio documento anexo firma"
+).split()
+
+
+def build_corpus(count: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(WORDS, k=rng.randint(20, 200))) for _ in range(count)]
+
+
+def docs_per_second(embed, texts: list[str]) -> tuple[np.ndarray, float]:
+    embed(texts[:64])
+    start = time.perf_counter()
+    vectors = np.asarray(embed(texts), dtype=np.float32)
+    return vectors, len(texts) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--method", default="huggingface")
+    parser.add_argument("--texts", type=int, default=4096)
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    texts = build_corpus(args.texts, args.seed)
+    factory = EmbeddingsFactory()
+    model_name = factory._embeddings[args.method][0]
+    local = factory.get_embedding(args.method, model_name, in_process=True)
+    reference, reference_rate = docs_per_second(local.embed_documents, texts)
+
+    print(f"method={args.method} texts={args.texts}")
+    print(f"{'workers':<10}{'docs/s':>10}{'speedup':>10}{'max diff':>12}")
+    print(f"{'local':<10}{reference_rate:>10.1f}{1.0:>9.2f}x{0.0:>12.2e}")
+    for workers in args.workers:
+        pool = ProcessPoolEmbedding(args.method, model_name, None, workers)
+        try:
+            vectors, rate = docs_per_second(pool.embed_documents, texts)
+        finally:
+            pool.close()
+        print(f"{workers:<10}{rate:>10.1f}{rate / reference_rate:>9.2f}x{float(np.abs(vectors - reference).max()):>12.2e}")
+
+
+if __name__ == "__main__":
+    main()
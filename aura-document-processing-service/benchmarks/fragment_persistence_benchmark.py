@@ -0,0 +1,82 @@
+"""Benchmark de persistencia de fragmentos.
+
+Compara la inserción fila a fila (`FragmentRepository.create`) con la escritura
+masiva (`FragmentRepository.create_many`) contra la base de datos configurada en
+`.env`, y reporta fragmentos por segundo para cada camino.
+
+Uso:
+    python -m benchmarks.fragment_persistence_benchmark --count 2000 --dim 384
+"""
+import argparse
+import random
+import time
+from datetime import datetime
+
+from sqlalchemy import delete
+
+from app.domain.constants.document_type import DocumentType
+from app.domain.models.document import Document
+from app.domain.models.fragment import Fragment
+from app.infrastructure.persistence.repositories.database_client import DatabaseClient
+from app.infrastructure.persistence.repositories.document_repository import DocumentRepository
+from app.infrastructure.persistence.repositories.fragment_repository import FragmentRepository
+
+
+def build_fragments(document_id: int, count: int, dim: int) -> list[Fragment]:
+    created_at = datetime.now()
+    return [
+        Fragment(
+            document_id=document_id,
+            vector=[random.random() for _ in range(dim)],
+            embedding_model="benchmark",
+            content=f"Fragmento de prueba {idx} " * 20,
+            fragment_index=idx,
+            chunk_size=500,
+            created_by=0,
+            created_at=created_at,
+        )
+        for idx in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--dim", type=int, default=384)
+    args = parser.parse_args()
+
+    db = next(DatabaseClient().get_session())
+    document_repository = DocumentRepository()
+    fragment_repository = FragmentRepository()
+
+    document = document_repository.create(Document(
+        file_name="benchmark.pdf",
+        type=DocumentType.pdf,
+        created_by=0,
+        created_at=datetime.now()
+    ), db)
+
+    try:
+        fragments = build_fragments(document.id, args.count, args.dim)
+        start = time.perf_counter()
+        for fragment in fragments:
+            fragment_repository.create(fragment, db)
+        row_by_row = time.perf_counter() - start
+
+        fragments = build_fragments(document.id, args.count, args.dim)
+        start = time.perf_counter()
+        fragment_repository.create_many(fragments, db)
+        bulk = time.perf_counter() - start
+
+        print(f"fragments={args.count} dim={args.dim}")
+        print(f"create      : {args.count / row_by_row:10.1f} fragments/s ({row_by_row:.2f}s)")
+        print(f"create_many : {args.count / bulk:10.1f} fragments/s ({bulk:.2f}s)")
+    finally:
+        db.execute(delete(Fragment).where(Fragment.document_id == document.id))
+        db.execute(delete(Document).where(Document.id == document.id))
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
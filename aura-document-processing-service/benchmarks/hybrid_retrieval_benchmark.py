@@ -0,0 +1,105 @@
+"""Benchmark de recall y latencia de la búsqueda vectorial, léxica e híbrida.
+
+Toma `--queries` fragmentos al azar de la tabla `fragment` y construye dos
+juegos de consultas cuya respuesta esperada es el propio fragmento:
+
+  - identificadores: un término con dígitos del fragmento (número de
+    artículo, código de producto...) dentro de una pregunta genérica;
+  - contenido: una ventana de `--window` palabras consecutivas del fragmento.
+
+Para cada juego y cada modo (`vector`, `lexical`, `hybrid`) reporta recall@k
+(fracción de consultas que recuperan su fragmento) y la latencia media y p95
+de `FragmentRepository.get_most_similar`. Los vectores de consulta se calculan
+antes de medir, así que la latencia es sólo la de la base de datos.
+
+Uso:
+    python -m benchmarks.hybrid_retrieval_benchmark --embedding-model huggingface --k 5 \
+        --queries 200 --window 12 --candidates 50 --rrf-k 60
+"""
+import argparse
+import random
+import re
+import statistics
+import time
+
+from sqlalchemy import text
+
+from app.application.processors.embeddings.embeddings_factory import EmbeddingsFactory
+from app.configuration.environment_variables import environment_variables
+from app.domain.constants.retrieval_mode import RetrievalMode
+from app.infrastructure.persistence.repositories.database_client import DatabaseClient
+from app.infrastructure.persistence.repositories.fragment_repository import FragmentRepository
+
+
+IDENTIFIER = re.compile(r"\b(?=[\w./-]*\d)[\w./-]{3,}\b")
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def build_queries(fragments: list, window: int, rng: random.Random) -> dict[str, list[tuple[int, str]]]:
+    identifiers, contents = [], []
+    for fragment_id, content in fragments:
+        tokens = IDENTIFIER.findall(content)
+        if tokens:
+            identifiers.append((fragment_id, f"¿Qué se indica sobre {rng.choice(tokens)}?"))
+        words = content.split()
+        if len(words) >= window:
+            start = rng.randrange(0, len(words) - window + 1)
+            contents.append((fragment_id, " ".join(words[start:start + window])))
+    return {"identifiers": identifiers, "content": contents}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--embedding-model", default="huggingface")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--window", type=int, default=12)
+    parser.add_argument("--candidates", type=int, default=environment_variables.hybrid_candidates)
+    parser.add_argument("--rrf-k", type=int, default=environment_variables.hybrid_rrf_k)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    environment_variables.hybrid_candidates = args.candidates
+    environment_variables.hybrid_rrf_k = args.rrf_k
+
+    db = next(DatabaseClient().get_session())
+    repository = FragmentRepository()
+    embedding = EmbeddingsFactory().get_embedding(args.embedding_model)
+
+    fragments = db.execute(text("""
+        SELECT id, content FROM fragment
+        WHERE embedding_model = :embedding_model AND vector IS NOT NULL
+        ORDER BY random() LIMIT :n
+    """), {"embedding_model": args.embedding_model, "n": args.queries}).fetchall()
+    query_sets = build_queries(fragments, args.window, random.Random(args.seed))
+
+    print(f"fragments={len(fragments)} k={args.k} candidates={args.candidates} rrf_k={args.rrf_k} "
+          f"index={environment_variables.vector_index_type}")
+    print(f"{'queries':<14}{'mode':<10}{'n':>6}{'recall@k':>10}{'mean ms':>10}{'p95 ms':>10}")
+    for name, queries in query_sets.items():
+        if not queries:
+            continue
+        vectors = embedding.embed_queries([question for _, question in queries])
+        for mode in RetrievalMode:
+            # Una consulta de calentamiento prepara la sentencia en la conexión
+            repository.get_most_similar(vectors[0], args.k, db, args.embedding_model,
+                                        query_text=queries[0][1], mode=mode)
+            hits, latencies = [], []
+            for (expected_id, question), vector in zip(queries, vectors):
+                start = time.perf_counter()
+                results = repository.get_most_similar(vector, args.k, db, args.embedding_model,
+                                                      query_text=question, mode=mode)
+                latencies.append(time.perf_counter() - start)
+                hits.append(any(fragment.id == expected_id for fragment in results))
+            print(f"{name:<14}{mode.value:<10}{len(queries):>6}{statistics.mean(hits):>10.3f}"
+                  f"{statistics.mean(latencies) * 1000:>10.2f}{percentile(latencies, 0.95) * 1000:>10.2f}")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
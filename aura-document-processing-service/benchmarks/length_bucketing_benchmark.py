@@ -0,0 +1,75 @@
+"""Throughput de `embed_documents` con y sin agrupación por longitud.
+
+Vectoriza corpus con distintas distribuciones de longitud de fragmento (cortos,
+largos y mezclados) con el proveedor tal cual y envuelto en
+`LengthBucketedEmbedding`, y reporta los documentos por segundo de cada
+variante. Verifica además que ambas devuelvan los mismos vectores en el mismo
+orden.
+
+Uso:
+    python -m benchmarks.length_bucketing_benchmark --method onnx --texts 1024 --budget 8192
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from app.application.processors.embeddings.embedding_model_registry import EmbeddingModelRegistry
+from app.application.processors.embeddings.embeddings_factory import EmbeddingsFactory
+from app.application.processors.embeddings.length_bucketed_embedding import LengthBucketedEmbedding
+
+
+WORDS = (
+    "contrato plazo entrega proveedor cláusula rescisión obligación factura pago "
+    "artículo partes vigencia garantía penalidad servicio documento anexo firma"
+).split()
+
+DISTRIBUTIONS = {
+    "short": (8, 40),
+    "long": (150, 250),
+    "mixed": (8, 250),
+}
+
+
+def build_corpus(count: int, min_words: int, max_words: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(WORDS, k=rng.randint(min_words, max_words))) for _ in range(count)]
+
+
+def docs_per_second(embed, texts: list[str], repeats: int) -> tuple[np.ndarray, float]:
+    embed(texts[:8])
+    start = time.perf_counter()
+    for _ in range(repeats):
+        vectors = np.asarray(embed(texts), dtype=np.float32)
+    return vectors, len(texts) * repeats / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--method", default="onnx")
+    parser.add_argument("--texts", type=int, default=1024)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--budget", type=int, default=8192)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    factory = EmbeddingsFactory()
+    default_model_name, builder = factory._embeddings[args.method]
+    provider = EmbeddingModelRegistry().get(args.method, default_model_name, None, builder)
+    bucketed = LengthBucketedEmbedding(provider, default_model_name, args.budget)
+
+    print(f"method={args.method} texts={args.texts} budget={args.budget}")
+    print(f"{'lengths':<8}{'p50 tok':>9}{'max tok':>9}{'plain/s':>10}{'bucketed/s':>12}{'speedup':>9}{'max diff':>10}")
+    for name, (min_words, max_words) in DISTRIBUTIONS.items():
+        texts = build_corpus(args.texts, min_words, max_words, args.seed)
+        lengths = provider.token_lengths(texts)
+        plain_vectors, plain_rate = docs_per_second(provider.embed_documents, texts, args.repeats)
+        bucketed_vectors, bucketed_rate = docs_per_second(bucketed.embed_documents, texts, args.repeats)
+        max_diff = float(np.abs(plain_vectors - bucketed_vectors).max())
+        print(f"{name:<8}{int(np.median(lengths)):>9}{max(lengths):>9}{plain_rate:>10.1f}{bucketed_rate:>12.1f}"
+              f"{bucketed_rate / plain_rate:>8.2f}x{max_diff:>10.2e}")
+
+
+if __name__ == "__main__":
+    main()
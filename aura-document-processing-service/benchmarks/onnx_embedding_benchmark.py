@@ -0,0 +1,62 @@
+"""Throughput del backend ONNX frente a PyTorch.
+
+Vectoriza el mismo corpus con `HuggingfaceBasedEmbedding` (PyTorch fp32) y con
+`OnnxBasedEmbedding` en fp32 e int8 y reporta los textos por segundo de cada
+backend. La paridad numérica la verifica `tests/test_onnx_embedding_parity.py`.
+
+Uso:
+    python -m benchmarks.onnx_embedding_benchmark --texts 512 --threads 4
+"""
+import argparse
+import time
+
+from app.application.processors.embeddings.huggingface_based_embedding import HuggingfaceBasedEmbedding
+from app.application.processors.embeddings.onnx_based_embedding import OnnxBasedEmbedding
+
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def build_corpus(count: int) -> list[str]:
+    templates = [
+        "El artículo {i} establece que el plazo de entrega es de {i} días hábiles.",
+        "La cláusula {i} regula la rescisión anticipada del contrato por cualquiera de las partes.",
+        "¿Qué sucede si el proveedor incumple la obligación número {i}?",
+        "Invoice {i} must be paid within thirty days of the issue date.",
+    ]
+    return [templates[i % len(templates)].format(i=i) * (1 + i % 5) for i in range(count)]
+
+
+def throughput(embed, texts: list[str], repeats: int) -> float:
+    embed(texts[:8])
+    start = time.perf_counter()
+    for _ in range(repeats):
+        embed(texts)
+    return len(texts) * repeats / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--texts", type=int, default=512)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=0)
+    args = parser.parse_args()
+
+    texts = build_corpus(args.texts)
+    backends = {
+        "torch fp32": HuggingfaceBasedEmbedding(model_name=MODEL_NAME, device="cpu").embed_documents,
+        "onnx fp32": OnnxBasedEmbedding(MODEL_NAME, quantize=False, intra_op_threads=args.threads).embed_documents,
+        "onnx int8": OnnxBasedEmbedding(MODEL_NAME, quantize=True, intra_op_threads=args.threads).embed_documents,
+    }
+
+    reference_rate = None
+    print(f"texts={args.texts} repeats={args.repeats} threads={args.threads or 'auto'}")
+    print(f"{'backend':<12}{'texts/s':>10}{'speedup':>10}")
+    for name, embed in backends.items():
+        rate = throughput(embed, texts, args.repeats)
+        reference_rate = reference_rate or rate
+        print(f"{name:<12}{rate:>10.1f}{rate / reference_rate:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark de micro-batching de consultas.
+
+Lanza `--concurrency` consultas concurrentes contra el proveedor de embeddings
+y compara consultas por segundo entre llamar a `embed_query` una a una y pasar
+por `QueryEmbeddingBatcher`.
+
+Uso:
+    python -m benchmarks.query_batching_benchmark --requests 512 --concurrency 64
+"""
+import argparse
+import asyncio
+import time
+
+from app.application.processors.embeddings.embeddings_factory import EmbeddingsFactory
+from app.application.processors.embeddings.query_embedding_batcher import QueryEmbeddingBatcher
+
+
+async def run(requests: int, concurrency: int, embed) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+    questions = [f"¿Cuál es el plazo previsto en el artículo {i}?" for i in range(requests)]
+
+    async def one(question: str) -> None:
+        async with semaphore:
+            await embed(question)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(question) for question in questions))
+    return requests / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=512)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=3.0)
+    args = parser.parse_args()
+
+    embedding = EmbeddingsFactory().get_embedding("huggingface")
+    embedding.embed_query("warm up")
+    loop = asyncio.get_running_loop()
+
+    async def unbatched(question: str):
+        return await loop.run_in_executor(None, embedding.embed_query, question)
+
+    batcher = QueryEmbeddingBatcher(lambda: embedding, args.max_batch_size, args.max_wait_ms)
+
+    unbatched_qps = await run(args.requests, args.concurrency, unbatched)
+    batched_qps = await run(args.requests, args.concurrency, batcher.embed_query)
+    await batcher.close()
+
+    print(f"requests={args.requests} concurrency={args.concurrency} "
+          f"max_batch_size={args.max_batch_size} max_wait_ms={args.max_wait_ms}")
+    print(f"embed_query : {unbatched_qps:10.1f} queries/s")
+    print(f"batched     : {batched_qps:10.1f} queries/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+"""Benchmark de re-división desde el artefacto de extracción frente al original.
+
+Para un archivo dado, mide el tiempo de volver a dividirlo con otra
+configuración partiendo del archivo original (lector + OCR si corresponde +
+limpiador + splitter) contra partir del artefacto de extracción comprimido
+(descompresión + splitter). Informa además el tamaño del artefacto frente al
+del original. No vectoriza ni necesita base de datos ni MinIO.
+
+Uso:
+    python -m benchmarks.rechunk_benchmark --file documento.pdf --cleaner basic \
+        --splitter recursive --size 500 --overlap 50 --repeats 3
+"""
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+from app.application.processors.readers.reader_factory import ReaderFactory
+from app.application.processors.text_cleaners.text_cleaner_factory import TextCleanerFactory
+from app.application.processors.text_splitters.text_splitter_factory import TextSplitterFactory
+from app.infrastructure.persistence.storages.extraction_artifact_repository import decode_artifact, encode_artifact
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file", type=Path, required=True)
+    parser.add_argument("--cleaner", default="basic")
+    parser.add_argument("--splitter", default="recursive")
+    parser.add_argument("--size", type=int, default=500)
+    parser.add_argument("--overlap", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    cleaner = TextCleanerFactory().get_cleaner(args.cleaner)
+    splitter = TextSplitterFactory().get_splitter(args.splitter)
+    reader_factory = ReaderFactory()
+
+    raw, raw_chunks = [], []
+    for _ in range(args.repeats):
+        start = time.perf_counter()
+        reader = reader_factory.get_reader(args.file)
+        pages = list(cleaner.clean_pages(reader.iter_pages(args.file)))
+        raw_chunks = [chunk.text for chunk in splitter.split_pages(pages, size=args.size, overlap=args.overlap)]
+        raw.append(time.perf_counter() - start)
+
+    payload = encode_artifact(args.cleaner, pages)
+
+    from_artifact, artifact_chunks = [], []
+    for _ in range(args.repeats):
+        start = time.perf_counter()
+        artifact_pages = decode_artifact(payload)
+        artifact_chunks = [chunk.text for chunk in splitter.split_pages(artifact_pages, size=args.size, overlap=args.overlap)]
+        from_artifact.append(time.perf_counter() - start)
+
+    raw_ms = statistics.median(raw) * 1000
+    artifact_ms = statistics.median(from_artifact) * 1000
+    print(f"file={args.file.name} pages={len(pages)} chunks={len(raw_chunks)} "
+          f"splitter={args.splitter} size={args.size} overlap={args.overlap}")
+    print(f"original={args.file.stat().st_size / 1024:.1f} KiB artifact={len(payload) / 1024:.1f} KiB")
+    print(f"{'source':<12}{'ms/rechunk':>14}")
+    print(f"{'original':<12}{raw_ms:>14.2f}")
+    print(f"{'artifact':<12}{artifact_ms:>14.2f}")
+    print(f"speedup={raw_ms / max(artifact_ms, 1e-9):.1f}x identical_chunks={raw_chunks == artifact_chunks}")
+
+
+if __name__ == "__main__":
+    main()
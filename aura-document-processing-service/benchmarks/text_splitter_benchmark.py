@@ -0,0 +1,90 @@
+"""Benchmark del costo por documento de los text splitters.
+
+Para cada método, compara el tiempo por documento reconstruyendo el splitter
+(y su tokenizador/modelo) en cada llamada, como hacían antes los splitters,
+contra el splitter cacheado que entrega `TextSplitterFactory`.
+
+Uso:
+    python -m benchmarks.text_splitter_benchmark --documents 20 --size 500 --overlap 50 \
+        --methods token,recursive,huggingface,char_tiktoken,char,spacy,sentence_transformer,semantic
+"""
+import argparse
+import importlib
+import statistics
+import time
+
+from langchain_text_splitters import split_text_on_tokens
+
+from app.application.processors.embeddings.embedding_model_registry import EmbeddingModelRegistry
+from app.application.processors.text_splitters.text_splitter_factory import TextSplitterFactory
+
+
+MODULES = {
+    "token": "token_based_text_splitter",
+    "spacy": "spacy_based_text_splitter",
+    "sentence_transformer": "sentence_transformer_based_text_splitter",
+    "semantic": "semantic_based_text_splitter",
+    "recursive": "recursive_based_text_splitter",
+    "huggingface": "huggingface_based_text_splitter",
+    "char_tiktoken": "char_tiktoken_based_text_splitter",
+    "char": "char_based_text_splitter",
+}
+
+
+def build_documents(count: int) -> list[str]:
+    paragraph = (
+        "El contrato establece las obligaciones de ambas partes durante la vigencia del acuerdo. "
+        "Las modificaciones deberán comunicarse por escrito con treinta días de antelación.\n"
+    )
+    return [f"Documento {i}.\n" + paragraph * 40 for i in range(count)]
+
+
+def uncached_split(method: str, text: str, size: int, overlap: int) -> list[str]:
+    module = importlib.import_module(f"app.application.processors.text_splitters.{MODULES[method]}")
+    if method == "semantic":
+        EmbeddingModelRegistry().unload("huggingface", module.MODEL_NAME)
+        return module.SemanticBasedTextSplitter().split_text(text)
+    if method == "huggingface":
+        module._load_tokenizer.cache_clear()
+    if method == "sentence_transformer":
+        module._load_tokenizer.cache_clear()
+        module._max_seq_length.cache_clear()
+        return split_text_on_tokens(text=text, tokenizer=module._build_tokenizer.__wrapped__(size, overlap))
+    return module._build_splitter.__wrapped__(size, overlap).split_text(text)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--documents", type=int, default=20)
+    parser.add_argument("--size", type=int, default=500)
+    parser.add_argument("--overlap", type=int, default=50)
+    parser.add_argument("--methods", default="token,recursive,huggingface,char_tiktoken,char")
+    args = parser.parse_args()
+
+    documents = build_documents(args.documents)
+    factory = TextSplitterFactory()
+
+    print(f"documents={args.documents} size={args.size} overlap={args.overlap}")
+    print(f"{'method':<22}{'rebuilt ms/doc':>16}{'cached ms/doc':>16}{'speedup':>10}")
+    for method in args.methods.split(","):
+        rebuilt = []
+        for document in documents:
+            start = time.perf_counter()
+            uncached_split(method, document, args.size, args.overlap)
+            rebuilt.append(time.perf_counter() - start)
+
+        splitter = factory.get_splitter(method)
+        splitter.split_text(documents[0], size=args.size, overlap=args.overlap)
+        cached = []
+        for document in documents:
+            start = time.perf_counter()
+            splitter.split_text(document, size=args.size, overlap=args.overlap)
+            cached.append(time.perf_counter() - start)
+
+        rebuilt_ms = statistics.mean(rebuilt) * 1000
+        cached_ms = statistics.mean(cached) * 1000
+        print(f"{method:<22}{rebuilt_ms:>16.2f}{cached_ms:>16.2f}{rebuilt_ms / max(cached_ms, 1e-9):>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark de recall vs. latencia de los índices ANN.
+
+Toma `--queries` vectores existentes de la tabla `fragment` como consultas y,
+para cada valor de `hnsw.ef_search` / `ivfflat.probes` indicado, compara el
+top-k devuelto por el índice con el de la búsqueda exacta (índices
+deshabilitados), reportando recall@k y latencia media y p95.
+
+Uso:
+    python -m benchmarks.vector_index_recall_benchmark --embedding-model huggingface --k 5 \
+        --search-values 10,20,40,80,160
+"""
+import argparse
+import statistics
+import time
+
+from sqlalchemy import text
+
+from app.configuration.environment_variables import environment_variables
+from app.domain.constants.embedding_dimensions import EMBEDDING_DIMENSIONS
+from app.infrastructure.persistence.repositories.database_client import DatabaseClient
+
+
+def search(db, vector: str, dimension: int, embedding_model: str, k: int) -> tuple[list[int], float]:
+    sql = text(f"""
+        SELECT id FROM fragment
+        WHERE embedding_model = :embedding_model AND vector IS NOT NULL
+        ORDER BY vector::vector({dimension}) <=> CAST(:vector AS vector({dimension})) LIMIT :k
+    """)
+    start = time.perf_counter()
+    ids = list(db.execute(sql, {"vector": vector, "embedding_model": embedding_model, "k": k}).scalars().all())
+    return ids, time.perf_counter() - start
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--embedding-model", default="huggingface")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--search-values", default="10,20,40,80,160")
+    args = parser.parse_args()
+
+    dimension = EMBEDDING_DIMENSIONS[args.embedding_model]
+    setting = "hnsw.ef_search" if environment_variables.vector_index_type == "hnsw" else "ivfflat.probes"
+    db = next(DatabaseClient().get_session())
+
+    queries = list(db.execute(text("""
+        SELECT vector::text FROM fragment
+        WHERE embedding_model = :embedding_model AND vector IS NOT NULL
+        ORDER BY random() LIMIT :n
+    """), {"embedding_model": args.embedding_model, "n": args.queries}).scalars().all())
+
+    exact_ids, exact_latencies = [], []
+    for vector in queries:
+        db.execute(text("SET LOCAL enable_indexscan = off"))
+        ids, elapsed = search(db, vector, dimension, args.embedding_model, args.k)
+        db.rollback()
+        exact_ids.append(set(ids))
+        exact_latencies.append(elapsed)
+
+    print(f"queries={len(queries)} k={args.k} index={environment_variables.vector_index_type}")
+    print(f"{'mode':<24}{'recall@k':>10}{'mean ms':>10}{'p95 ms':>10}")
+    print(f"{'exact':<24}{1.0:>10.3f}{statistics.mean(exact_latencies) * 1000:>10.2f}"
+          f"{percentile(exact_latencies, 0.95) * 1000:>10.2f}")
+
+    for value in args.search_values.split(","):
+        recalls, latencies = [], []
+        for vector, expected in zip(queries, exact_ids):
+            db.execute(text("SELECT set_config(:setting, :value, true)"), {"setting": setting, "value": value})
+            ids, elapsed = search(db, vector, dimension, args.embedding_model, args.k)
+            db.rollback()
+            recalls.append(len(expected.intersection(ids)) / max(len(expected), 1))
+            latencies.append(elapsed)
+        print(f"{setting + '=' + value:<24}{statistics.mean(recalls):>10.3f}"
+              f"{statistics.mean(latencies) * 1000:>10.2f}{percentile(latencies, 0.95) * 1000:>10.2f}")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
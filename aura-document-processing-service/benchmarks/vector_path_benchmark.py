@@ -0,0 +1,71 @@
+"""Memoria y throughput de vectores como listas frente a matrices float32.
+
+Simula el tramo embeddings → fragmentos → COPY binario sin base de datos: parte
+de la matriz float32 que devuelve el modelo y recorre el camino con listas
+(`.tolist()`, como hacían los proveedores) y el camino con filas de la matriz
+(`embed_documents_array`). Para cada uno reporta fragmentos por segundo, el pico
+de memoria asignada (tracemalloc) y verifica que los bytes del COPY coincidan.
+
+Uso:
+    python -m benchmarks.vector_path_benchmark --count 20000 --dim 384
+"""
+import argparse
+import io
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+from app.domain.models.fragment import Fragment
+from app.infrastructure.persistence.repositories.fragment_repository import FragmentRepository
+
+
+def encode(vectors, count: int) -> bytes:
+    created_at = datetime.now()
+    buffer = io.BytesIO()
+    for idx, vector in zip(range(count), vectors):
+        fragment = Fragment(
+            document_id=1,
+            vector=vector,
+            embedding_model="benchmark",
+            content=f"Fragmento de prueba {idx}",
+            fragment_index=idx,
+            chunk_size=500,
+            created_by=0,
+            created_at=created_at,
+        )
+        buffer.write(FragmentRepository._encode_copy_row(idx + 1, fragment))
+    return buffer.getvalue()
+
+
+def run(name: str, matrix: np.ndarray, as_lists: bool) -> bytes:
+    tracemalloc.start()
+    start = time.perf_counter()
+    vectors = matrix.tolist() if as_lists else matrix
+    payload = encode(vectors, matrix.shape[0])
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<10}{matrix.shape[0] / elapsed:>14.1f}{peak / (1024 * 1024):>14.1f}")
+    return payload
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=384)
+    args = parser.parse_args()
+
+    matrix = np.random.default_rng(7).random((args.count, args.dim), dtype=np.float32)
+
+    print(f"count={args.count} dim={args.dim}")
+    print(f"{'path':<10}{'fragments/s':>14}{'peak MiB':>14}")
+    lists = run("lists", matrix, as_lists=True)
+    arrays = run("ndarray", matrix, as_lists=False)
+    if lists != arrays:
+        raise SystemExit("COPY payloads differ between paths")
+
+
+if __name__ == "__main__":
+    main()
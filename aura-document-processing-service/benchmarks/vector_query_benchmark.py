@@ -0,0 +1,69 @@
+"""Micro-benchmark de la consulta vectorial.
+
+Compara, para el mismo vector de consulta, la latencia de la SQL con el vector
+formateado e incrustado en el texto (comportamiento anterior) contra la
+sentencia preparada por conexión con el vector como parámetro tipado que usa
+`FragmentRepository.get_most_similar`.
+
+Uso:
+    python -m benchmarks.vector_query_benchmark --iterations 500 --k 5
+"""
+import argparse
+import random
+import statistics
+import time
+
+from sqlalchemy import text
+
+from app.domain.constants.embedding_dimensions import EMBEDDING_DIMENSIONS
+from app.infrastructure.persistence.repositories.database_client import DatabaseClient
+from app.infrastructure.persistence.repositories.fragment_repository import FragmentRepository
+
+
+def inline_query(db, query_vector: list[float], k: int, embedding_model: str, dimension: int) -> None:
+    query_vector_str = "[" + ",".join(map(str, query_vector)) + "]"
+    sql = text(f"""
+       SELECT id, document_id, content,
+              1 - (vector::vector({dimension}) <=> '{query_vector_str}') AS cosine_similarity
+       FROM fragment
+       WHERE embedding_model = :embedding_model AND vector IS NOT NULL
+       ORDER BY vector::vector({dimension}) <=> '{query_vector_str}' LIMIT :k
+    """)
+    db.execute(sql, {"k": k, "embedding_model": embedding_model}).fetchall()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--embedding-model", default="huggingface")
+    args = parser.parse_args()
+
+    dimension = EMBEDDING_DIMENSIONS[args.embedding_model]
+    repository = FragmentRepository()
+    db = next(DatabaseClient().get_session())
+    vectors = [[random.uniform(-1, 1) for _ in range(dimension)] for _ in range(args.iterations)]
+
+    repository.get_most_similar(vectors[0], args.k, db, args.embedding_model)
+    inline_query(db, vectors[0], args.k, args.embedding_model, dimension)
+
+    inline, prepared = [], []
+    for vector in vectors:
+        start = time.perf_counter()
+        inline_query(db, vector, args.k, args.embedding_model, dimension)
+        inline.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        repository.get_most_similar(vector, args.k, db, args.embedding_model)
+        prepared.append(time.perf_counter() - start)
+
+    db.close()
+
+    print(f"iterations={args.iterations} k={args.k} dim={dimension}")
+    print(f"inline SQL text   : mean {statistics.mean(inline) * 1000:.3f} ms, median {statistics.median(inline) * 1000:.3f} ms")
+    print(f"prepared + bound  : mean {statistics.mean(prepared) * 1000:.3f} ms, median {statistics.median(prepared) * 1000:.3f} ms")
+    print(f"saved per query   : {(statistics.mean(inline) - statistics.mean(prepared)) * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+import os
+
+# `environment_variables` se instancia al importar la app y exige la conexión a la base y a MinIO;
+# los tests no las usan, así que bastan valores de relleno si no vienen del entorno
+for name, value in {
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_NAME": "aura",
+    "DB_USER": "aura",
+    "DB_PASSWORD": "aura",
+    "MINIO_ENDPOINT": "localhost:9000",
+    "MINIO_ACCESS_KEY": "aura",
+    "MINIO_SECRET_KEY": "aura",
+}.items():
+    os.environ.setdefault(name, value)
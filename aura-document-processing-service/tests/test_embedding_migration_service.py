@@ -0,0 +1,144 @@
+import threading
+from types import SimpleNamespace
+from typing import Dict, List
+
+import numpy as np
+import pytest
+
+from app.application.exceptions.exceptions import ValidationError
+from app.application.services.embedding_migration_service import EmbeddingMigrationService
+from app.domain.constants.embedding_space_status import EmbeddingSpaceStatus
+
+
+class FakeSession:
+    def close(self) -> None:
+        pass
+
+
+class FakeDatabaseClient:
+    def get_session(self):
+        yield FakeSession()
+
+
+class FakeSpaceRepository:
+    def __init__(self, spaces: Dict[str, SimpleNamespace]):
+        self.spaces = spaces
+
+    def ensure_active(self, embedding_model, db) -> None:
+        pass
+
+    def get_by_model(self, embedding_model, db):
+        return self.spaces.get(embedding_model)
+
+    def get_models_by_status(self, statuses, db) -> List[str]:
+        return sorted(model for model, space in self.spaces.items() if space.status in statuses)
+
+    def start_building(self, embedding_model, db):
+        space = self.spaces.get(embedding_model)
+        if space is not None and (space.active or space.status == EmbeddingSpaceStatus.building):
+            return None
+        self.spaces[embedding_model] = SimpleNamespace(
+            embedding_model=embedding_model,
+            status=EmbeddingSpaceStatus.building,
+            active=False
+        )
+        return self.spaces[embedding_model]
+
+
+class FakeFragmentRepository:
+    def __init__(self, rows):
+        self.rows = rows
+        self.embeddings: Dict[str, List[int]] = {}
+
+    def get_contents_by_document_id(self, document_id, db):
+        return self.rows
+
+    def create_embeddings(self, embedding_model, fragment_ids, vectors, db) -> int:
+        assert len(fragment_ids) == len(vectors)
+        self.embeddings.setdefault(embedding_model, []).extend(fragment_ids)
+        return len(fragment_ids)
+
+
+class FakeEmbedding:
+    def embed_documents_array(self, texts: List[str]) -> np.ndarray:
+        return np.ones((len(texts), 3), dtype=np.float32)
+
+
+class FakeEmbeddingsFactory:
+    def get_embedding(self, method: str) -> FakeEmbedding:
+        return FakeEmbedding()
+
+
+def _space(model: str, status: EmbeddingSpaceStatus, active: bool = False) -> SimpleNamespace:
+    return SimpleNamespace(embedding_model=model, status=status, active=active)
+
+
+def _service(spaces, rows=()) -> EmbeddingMigrationService:
+    service = EmbeddingMigrationService(
+        database_client=FakeDatabaseClient(),
+        space_repository=FakeSpaceRepository(spaces),
+        fragment_repository=FakeFragmentRepository(list(rows)),
+        index_manager=None
+    )
+    service.embedding_factory = FakeEmbeddingsFactory()
+    service._describe = lambda space, db: space
+    return service
+
+
+@pytest.mark.parametrize("space, message", [
+    (_space("onnx", EmbeddingSpaceStatus.ready, active=True), "is active"),
+    (_space("onnx", EmbeddingSpaceStatus.building), "already building"),
+])
+def test_start_rejects_active_or_building_space(space, message):
+    service = _service({"onnx": space})
+
+    with pytest.raises(ValidationError, match=message):
+        service.start("onnx", FakeSession())
+
+
+def test_start_restarts_a_failed_space():
+    service = _service({"onnx": _space("onnx", EmbeddingSpaceStatus.failed)})
+
+    space = service.start("onnx", FakeSession())
+
+    assert space.status == EmbeddingSpaceStatus.building
+
+
+def test_run_pending_fills_only_building_spaces():
+    service = _service({
+        "huggingface": _space("huggingface", EmbeddingSpaceStatus.ready, active=True),
+        "onnx": _space("onnx", EmbeddingSpaceStatus.building),
+        "ollama": _space("ollama", EmbeddingSpaceStatus.failed),
+    })
+    ran = []
+    service.run = lambda model, stop=None: ran.append(model)
+
+    service.run_pending()
+
+    assert ran == ["onnx"]
+
+
+def test_run_pending_stops_when_asked():
+    service = _service({"onnx": _space("onnx", EmbeddingSpaceStatus.building)})
+    ran = []
+    service.run = lambda model, stop=None: ran.append(model)
+    stop = threading.Event()
+    stop.set()
+
+    service.run_pending(stop)
+
+    assert ran == []
+
+
+def test_embed_document_writes_into_other_building_and_ready_spaces():
+    rows = [SimpleNamespace(id=i, content=f"fragment {i}") for i in range(1, 4)]
+    service = _service({
+        "huggingface": _space("huggingface", EmbeddingSpaceStatus.ready, active=True),
+        "onnx": _space("onnx", EmbeddingSpaceStatus.building),
+        "ollama": _space("ollama", EmbeddingSpaceStatus.failed),
+        "spacy": _space("spacy", EmbeddingSpaceStatus.ready),
+    }, rows)
+
+    service.embed_document(7, "huggingface", FakeSession())
+
+    assert service.fragment_repository.embeddings == {"onnx": [1, 2, 3], "spacy": [1, 2, 3]}
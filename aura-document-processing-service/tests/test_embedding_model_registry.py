@@ -0,0 +1,65 @@
+import uuid
+from typing import List
+
+from app.application.processors.embeddings.embedding_model_registry import EmbeddingModelRegistry
+from app.application.processors.embeddings.interfaces.embedding_interface import EmbeddingInterface
+
+
+class FakeEmbedding(EmbeddingInterface):
+    def __init__(self):
+        self.closed = False
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [[1.0] for _ in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return [1.0]
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _model_name() -> str:
+    # El registro es un singleton de proceso: cada test usa su propia clave
+    return f"fake-{uuid.uuid4()}"
+
+
+def test_get_builds_once_and_shares_the_instance():
+    registry = EmbeddingModelRegistry()
+    model_name = _model_name()
+    built = []
+
+    def build(name, device):
+        built.append(name)
+        return FakeEmbedding()
+
+    first = registry.get("fake", model_name, None, build)
+    second = EmbeddingModelRegistry().get("fake", model_name, None, build)
+
+    assert first is second
+    assert built == [model_name]
+
+
+def test_unload_closes_the_instance():
+    registry = EmbeddingModelRegistry()
+    model_name = _model_name()
+    embedding = registry.get("fake", model_name, None, lambda name, device: FakeEmbedding())
+
+    assert registry.unload("fake", model_name)
+    assert embedding.closed
+    assert ("fake", model_name, None) not in registry.loaded()
+    assert not registry.unload("fake", model_name)
+
+
+def test_unload_idle_closes_only_idle_instances():
+    registry = EmbeddingModelRegistry()
+    idle_name, busy_name = _model_name(), _model_name()
+    idle = registry.get("fake", idle_name, None, lambda name, device: FakeEmbedding())
+    registry._entries[("fake", idle_name, None)].last_used -= 120
+    busy = registry.get("fake", busy_name, None, lambda name, device: FakeEmbedding())
+
+    registry.unload_idle(60)
+
+    assert idle.closed
+    assert not busy.closed
+    registry.unload("fake", busy_name)
@@ -0,0 +1,105 @@
+import logging
+import threading
+import time
+
+import pytest
+
+from app.application.exceptions.exceptions import NotFoundError
+from app.configuration.environment_variables import environment_variables
+from app.domain.dtos.ingestion_job import IngestionJob
+from app.infrastructure.messaging.inline_ingestion_queue import InlineIngestionQueue
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(environment_variables, "ingestion_retry_base_seconds", 0.0)
+    monkeypatch.setattr(environment_variables, "ingestion_max_retries", 1)
+
+
+def _job(document_id: int = 1) -> IngestionJob:
+    return IngestionJob(document_id=document_id, file_key=f"documents/{document_id}.pdf")
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+def _failed_permanently(caplog) -> bool:
+    return any(record.getMessage() == "Ingestion job failed permanently" for record in caplog.records)
+
+
+def test_published_job_runs_once():
+    done = threading.Event()
+    handled = []
+
+    def handler(job: IngestionJob) -> None:
+        handled.append(job)
+        done.set()
+
+    queue = InlineIngestionQueue(handler)
+    try:
+        queue.publish(_job(3))
+        assert done.wait(5)
+    finally:
+        queue.close()
+
+    assert [(job.document_id, job.attempt) for job in handled] == [(3, 0)]
+
+
+def test_failed_job_is_retried_with_the_next_attempt():
+    done = threading.Event()
+    attempts = []
+
+    def handler(job: IngestionJob) -> None:
+        attempts.append(job.attempt)
+        if job.attempt == 0:
+            raise RuntimeError("boom")
+        done.set()
+
+    queue = InlineIngestionQueue(handler)
+    try:
+        queue.publish(_job())
+        assert done.wait(5)
+    finally:
+        queue.close()
+
+    assert attempts == [0, 1]
+
+
+def test_job_exhausting_its_retries_is_dropped(caplog):
+    caplog.set_level(logging.ERROR)
+    attempts = []
+
+    def handler(job: IngestionJob) -> None:
+        attempts.append(job.attempt)
+        raise RuntimeError("boom")
+
+    queue = InlineIngestionQueue(handler)
+    try:
+        queue.publish(_job())
+        _wait_for(lambda: _failed_permanently(caplog))
+    finally:
+        queue.close()
+
+    assert attempts == [0, 1]
+
+
+def test_missing_document_is_not_retried(caplog):
+    caplog.set_level(logging.ERROR)
+    attempts = []
+
+    def handler(job: IngestionJob) -> None:
+        attempts.append(job.attempt)
+        raise NotFoundError(f"Document {job.document_id} not found")
+
+    queue = InlineIngestionQueue(handler)
+    try:
+        queue.publish(_job())
+        _wait_for(lambda: _failed_permanently(caplog))
+    finally:
+        queue.close()
+
+    assert attempts == [0]
@@ -0,0 +1,72 @@
+"""Paridad numérica de `OnnxBasedEmbedding` (fp32 e int8) frente a `HuggingfaceBasedEmbedding`.
+
+Se omite si faltan las dependencias o si el modelo no puede cargarse (sin red
+ni caché local de Hugging Face).
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("onnxruntime")
+pytest.importorskip("onnx")
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+pytest.importorskip("langchain_huggingface")
+
+from app.configuration.environment_variables import environment_variables  # noqa: E402
+
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+MIN_COSINE = 0.99
+
+CORPUS = [
+    "El artículo 12 establece que el plazo de entrega es de 30 días hábiles.",
+    "La cláusula de rescisión permite terminar el contrato con un preaviso de dos meses.",
+    "¿Qué sucede si el proveedor incumple la obligación número 7?",
+    "Invoice INV-2024-0042 must be paid within thirty days of the issue date.",
+    "Las modificaciones deberán comunicarse por escrito con treinta días de antelación. " * 8,
+    "Código de producto XJ-200B",
+    "a",
+]
+
+
+@pytest.fixture(scope="module")
+def reference() -> "np.ndarray":
+    from app.application.processors.embeddings.huggingface_based_embedding import HuggingfaceBasedEmbedding
+
+    try:
+        embedding = HuggingfaceBasedEmbedding(model_name=MODEL_NAME, device="cpu")
+    except Exception as e:
+        pytest.skip(f"Embedding model not available: {e}")
+    return np.asarray(embedding.embed_documents(CORPUS), dtype=np.float32)
+
+
+@pytest.fixture(scope="module")
+def onnx_model_dir(tmp_path_factory):
+    # Un directorio por módulo: la variante int8 se cuantiza a partir del fp32 exportado en el primer test
+    model_dir = tmp_path_factory.mktemp("onnx-models")
+    previous = environment_variables.onnx_model_dir
+    environment_variables.onnx_model_dir = str(model_dir)
+    yield model_dir
+    environment_variables.onnx_model_dir = previous
+
+
+def _cosine(a: "np.ndarray", b: "np.ndarray") -> "np.ndarray":
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return np.sum(a * b, axis=1)
+
+
+@pytest.mark.parametrize("quantize", [False, True], ids=["fp32", "int8"])
+def test_onnx_matches_torch(reference, onnx_model_dir, quantize):
+    from app.application.processors.embeddings.onnx_based_embedding import OnnxBasedEmbedding
+
+    embedding = OnnxBasedEmbedding(MODEL_NAME, quantize=quantize, intra_op_threads=1)
+    vectors = embedding.embed_documents_array(CORPUS)
+
+    expected_file = "model.int8.onnx" if quantize else "model.onnx"
+    assert (onnx_model_dir / MODEL_NAME.replace("/", "__") / expected_file).exists()
+    assert vectors.shape == reference.shape
+    assert vectors.dtype == np.float32
+    assert _cosine(vectors, reference).min() >= MIN_COSINE
+    # `embed_query` comparte el pooling y la normalización con el camino por lotes
+    assert _cosine(np.asarray([embedding.embed_query(CORPUS[0])]), reference[:1]).min() >= MIN_COSINE
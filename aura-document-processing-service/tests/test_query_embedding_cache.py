@@ -0,0 +1,115 @@
+import asyncio
+from typing import List
+
+import numpy as np
+
+from app.application.processors.embeddings.embeddings_factory import EmbeddingsFactory
+from app.application.processors.embeddings.query_embedding_cache import QueryEmbeddingCache, normalize_question
+from app.configuration.environment_variables import environment_variables
+from app.infrastructure.persistence.caches.embedding_cache_store import MemoryEmbeddingCacheStore
+
+
+MODEL = "huggingface/sentence-transformers/all-MiniLM-L6-v2@1"
+
+
+class CountingEmbed:
+    def __init__(self):
+        self.calls: List[str] = []
+
+    async def __call__(self, question: str) -> List[float]:
+        self.calls.append(question)
+        return [float(len(self.calls)), 0.5, -0.25]
+
+
+def _get(cache: QueryEmbeddingCache, question: str, embed: CountingEmbed, model: str = MODEL) -> List[float]:
+    return asyncio.run(cache.get_or_embed(model, question, embed))
+
+
+def test_normalize_question_ignores_case_spacing_and_edge_punctuation():
+    assert normalize_question("¿Qué   es X?") == normalize_question("qué es x")
+    assert normalize_question("qué es x") != normalize_question("qué es y")
+
+
+def test_miss_embeds_and_hit_reuses_the_vector():
+    cache = QueryEmbeddingCache(store=None)
+    embed = CountingEmbed()
+
+    first = _get(cache, "¿Qué es el plazo de entrega?", embed)
+    second = _get(cache, "qué es el plazo de entrega", embed)
+
+    assert embed.calls == ["¿Qué es el plazo de entrega?"]
+    assert second == first
+
+
+def test_shared_tier_serves_other_processes():
+    store = MemoryEmbeddingCacheStore()
+    embed = CountingEmbed()
+
+    vector = _get(QueryEmbeddingCache(store), "plazo de entrega", embed)
+    # Otra instancia (otro worker) con la memoria vacía lo encuentra en el nivel compartido
+    shared = _get(QueryEmbeddingCache(store), "plazo de entrega", embed)
+
+    assert len(embed.calls) == 1
+    assert np.allclose(shared, vector)
+
+
+def test_model_change_invalidates_cached_vectors():
+    store = MemoryEmbeddingCacheStore()
+    cache = QueryEmbeddingCache(store)
+    embed = CountingEmbed()
+
+    _get(cache, "plazo de entrega", embed, model=MODEL)
+    _get(cache, "plazo de entrega", embed, model="huggingface/intfloat/multilingual-e5-small@1")
+    _get(QueryEmbeddingCache(store), "plazo de entrega", embed, model=MODEL.replace("@1", "@2"))
+
+    assert len(embed.calls) == 3
+
+
+def test_memory_entries_expire_after_ttl(monkeypatch):
+    cache = QueryEmbeddingCache(store=None, ttl_seconds=60)
+    embed = CountingEmbed()
+    now = [1000.0]
+    monkeypatch.setattr("app.application.processors.embeddings.query_embedding_cache.time.monotonic", lambda: now[0])
+
+    _get(cache, "plazo", embed)
+    now[0] += 30
+    _get(cache, "plazo", embed)
+    now[0] += 61
+    _get(cache, "plazo", embed)
+
+    assert len(embed.calls) == 2
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = QueryEmbeddingCache(store=None, max_entries=2)
+    embed = CountingEmbed()
+
+    _get(cache, "a", embed)
+    _get(cache, "b", embed)
+    _get(cache, "a", embed)
+    _get(cache, "c", embed)
+    _get(cache, "a", embed)
+    _get(cache, "b", embed)
+
+    assert embed.calls == ["a", "b", "c", "b"]
+
+
+def test_memory_store_is_bounded_lru():
+    store = MemoryEmbeddingCacheStore(max_entries=2)
+    vector = np.ones(3, dtype=np.float32)
+
+    store.put_many({"a": vector, "b": vector})
+    assert set(store.get_many(["a"])) == {"a"}
+    store.put_many({"c": vector})
+
+    assert set(store.get_many(["a", "b", "c"])) == {"a", "c"}
+
+
+def test_model_version_resolves_the_default_model(monkeypatch):
+    factory = EmbeddingsFactory()
+    monkeypatch.setattr(environment_variables, "query_cache_version", "7")
+    monkeypatch.setattr(environment_variables, "onnx_quantize", True)
+
+    assert factory.model_version("huggingface") == "huggingface/sentence-transformers/all-MiniLM-L6-v2@7"
+    assert factory.model_version("huggingface", "intfloat/multilingual-e5-small") != factory.model_version("huggingface")
+    assert factory.model_version("onnx").endswith("/int8@7")
@@ -0,0 +1,130 @@
+import json
+import sqlite3
+import threading
+from contextlib import closing
+
+import pytest
+
+from app.application.exceptions.exceptions import NotFoundError
+from app.configuration.environment_variables import environment_variables
+from app.domain.dtos.ingestion_job import IngestionJob
+from app.infrastructure.messaging.sqlite_ingestion_queue import SQLiteIngestionQueue
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(environment_variables, "ingestion_retry_base_seconds", 0.0)
+    monkeypatch.setattr(environment_variables, "ingestion_max_retries", 1)
+    monkeypatch.setattr(environment_variables, "ingestion_job_timeout_seconds", 3600)
+    return SQLiteIngestionQueue(tmp_path / "queue.sqlite3", poll_interval_seconds=0.01)
+
+
+def _job(document_id: int = 1) -> IngestionJob:
+    return IngestionJob(document_id=document_id, file_key=f"documents/{document_id}.pdf")
+
+
+def _rows(queue: SQLiteIngestionQueue) -> list:
+    with closing(sqlite3.connect(queue.path)) as connection:
+        return connection.execute(
+            "SELECT status, payload, last_error FROM ingestion_job ORDER BY id"
+        ).fetchall()
+
+
+def _work_once(queue: SQLiteIngestionQueue, handler) -> None:
+    # `_work` vuelve a comprobar la parada tras cada trabajo: cerrar la cola desde el handler procesa uno solo
+    def handle(job: IngestionJob) -> None:
+        queue.close()
+        handler(job)
+
+    worker = threading.Thread(target=queue._work, args=(handle,))
+    worker.start()
+    worker.join(timeout=5)
+    assert not worker.is_alive()
+    queue._stopped.clear()
+
+
+def test_publish_persists_a_queued_job(queue):
+    queue.publish(_job(7))
+
+    [(status, payload, last_error)] = _rows(queue)
+    assert status == "queued"
+    assert IngestionJob.model_validate_json(payload).document_id == 7
+    assert last_error is None
+
+
+def test_claimed_job_is_invisible_until_its_lock_expires(queue):
+    queue.publish(_job())
+
+    job_id, job = queue._claim()
+    assert job.document_id == 1
+    assert _rows(queue)[0][0] == "processing"
+    assert queue._claim() is None
+
+    # Un worker caído deja el trabajo bloqueado; al vencer el lock otro consumidor lo recoge
+    queue._update(job_id, "UPDATE ingestion_job SET locked_until = 0 WHERE id = ?", (job_id,))
+    reclaimed_id, _ = queue._claim()
+    assert reclaimed_id == job_id
+
+
+def test_successful_job_is_acknowledged(queue):
+    queue.publish(_job())
+    handled = []
+
+    _work_once(queue, handled.append)
+
+    assert [job.document_id for job in handled] == [1]
+    assert _rows(queue)[0][0] == "done"
+    assert queue._claim() is None
+
+
+def test_failed_job_is_retried_then_dead_lettered(queue):
+    queue.publish(_job())
+    attempts = []
+
+    def fail(job: IngestionJob) -> None:
+        attempts.append(job.attempt)
+        raise RuntimeError("boom")
+
+    _work_once(queue, fail)
+    [(status, payload, last_error)] = _rows(queue)
+    assert status == "queued"
+    assert json.loads(payload)["attempt"] == 1
+    assert last_error == "boom"
+
+    _work_once(queue, fail)
+    assert attempts == [0, 1]
+    assert _rows(queue)[0][0] == "failed"
+    assert queue._claim() is None
+
+
+def test_missing_document_fails_without_retry(queue):
+    queue.publish(_job())
+
+    def missing(job: IngestionJob) -> None:
+        raise NotFoundError(f"Document {job.document_id} not found")
+
+    _work_once(queue, missing)
+
+    [(status, payload, last_error)] = _rows(queue)
+    assert status == "failed"
+    assert json.loads(payload)["attempt"] == 0
+    assert last_error == "Document 1 not found"
+
+
+def test_operations_close_their_connections(queue, monkeypatch):
+    opened = []
+    connect = queue._connect
+
+    def tracking_connect() -> sqlite3.Connection:
+        connection = connect()
+        opened.append(connection)
+        return connection
+
+    monkeypatch.setattr(queue, "_connect", tracking_connect)
+    queue.publish(_job())
+    _work_once(queue, lambda job: None)
+
+    assert opened
+    for connection in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            connection.execute("SELECT 1")
@@ -0,0 +1,210 @@
+import random
+import threading
+import time
+
+import pytest
+
+from app.infrastructure.executors.staged_pipeline import PipelineStage, StagedPipeline
+
+
+@pytest.fixture
+def make_pipeline():
+    pipelines = []
+
+    def make(stages, max_in_flight=4, source_workers=1):
+        pipeline = StagedPipeline("test", stages, max_in_flight=max_in_flight, source_stage="read", source_workers=source_workers)
+        pipelines.append(pipeline)
+        return pipeline
+
+    yield make
+    for pipeline in pipelines:
+        pipeline.shutdown()
+
+
+def _jitter(value):
+    time.sleep(random.uniform(0, 0.005))
+    return value
+
+
+def test_results_keep_source_order_across_stages(make_pipeline):
+    pipeline = make_pipeline([
+        PipelineStage("double", lambda x: _jitter(x * 2), workers=4),
+        PipelineStage("inc", lambda x: _jitter(x + 1), workers=4),
+    ])
+
+    assert list(pipeline.run(range(50))) == [x * 2 + 1 for x in range(50)]
+
+
+def test_each_stage_and_the_source_run_on_their_own_pool(make_pipeline):
+    threads = {}
+
+    def source():
+        for i in range(5):
+            threads.setdefault("read", set()).add(threading.current_thread().name)
+            yield i
+
+    def record(stage):
+        def fn(value):
+            threads.setdefault(stage, set()).add(threading.current_thread().name)
+            return value
+        return fn
+
+    pipeline = make_pipeline([PipelineStage("embed", record("embed")), PipelineStage("persist", record("persist"))])
+    list(pipeline.run(source()))
+
+    assert all(name.startswith("test-read") for name in threads["read"])
+    assert all(name.startswith("test-embed") for name in threads["embed"])
+    assert all(name.startswith("test-persist") for name in threads["persist"])
+
+
+def test_ordered_stage_runs_one_item_at_a_time_in_source_order(make_pipeline):
+    seen = []
+    active = []
+    lock = threading.Lock()
+
+    def persist(value):
+        with lock:
+            active.append(value)
+            assert len(active) == 1
+        _jitter(None)
+        seen.append(value)
+        with lock:
+            active.remove(value)
+        return value
+
+    pipeline = make_pipeline([
+        PipelineStage("embed", lambda x: _jitter(x), workers=8),
+        PipelineStage("persist", persist, workers=4, ordered=True),
+    ], max_in_flight=8)
+
+    assert list(pipeline.run(range(40))) == list(range(40))
+    assert seen == list(range(40))
+
+
+def test_ordered_stage_serialises_per_run_only(make_pipeline):
+    both_started = threading.Barrier(2, timeout=5)
+
+    def persist(value):
+        # Dos ejecuciones distintas pueden estar a la vez en la etapa ordenada
+        if value == 0:
+            both_started.wait()
+        return value
+
+    pipeline = make_pipeline([PipelineStage("persist", persist, workers=2, ordered=True)], source_workers=2)
+    results = []
+    runs = [threading.Thread(target=lambda: results.append(list(pipeline.run(range(3))))) for _ in range(2)]
+    for run in runs:
+        run.start()
+    for run in runs:
+        run.join(timeout=5)
+
+    assert results == [[0, 1, 2], [0, 1, 2]]
+
+
+def test_source_is_bounded_by_max_in_flight(make_pipeline):
+    produced = []
+
+    def source():
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    pipeline = make_pipeline([PipelineStage("noop", lambda x: x)], max_in_flight=3)
+    iterator = pipeline.run(source())
+    assert next(iterator) == 0
+    time.sleep(0.2)
+
+    # Devueltos + en vuelo + cola de la fuente + el que espera para entrar en ella
+    assert len(produced) <= 1 + 3 + 3 + 1
+    iterator.close()
+
+
+def test_stage_failure_is_raised_in_source_order(make_pipeline):
+    def fail_on_three(value):
+        if value == 3:
+            raise ValueError("boom")
+        return value
+
+    pipeline = make_pipeline([
+        PipelineStage("check", fail_on_three, workers=2),
+        PipelineStage("persist", lambda x: x, ordered=True),
+    ])
+    results = []
+    with pytest.raises(ValueError, match="boom"):
+        for value in pipeline.run(range(10)):
+            results.append(value)
+
+    assert results == [0, 1, 2]
+
+
+def test_source_failure_is_raised_to_the_caller(make_pipeline):
+    def source():
+        yield 1
+        raise RuntimeError("read failed")
+
+    pipeline = make_pipeline([PipelineStage("noop", lambda x: x)])
+
+    with pytest.raises(RuntimeError, match="read failed"):
+        list(pipeline.run(source()))
+
+
+def test_abandoned_run_closes_its_source(make_pipeline):
+    closed = threading.Event()
+
+    def source():
+        try:
+            for i in range(1000):
+                yield i
+        finally:
+            closed.set()
+
+    pipeline = make_pipeline([PipelineStage("noop", lambda x: x)], max_in_flight=2)
+    iterator = pipeline.run(source())
+    next(iterator)
+    iterator.close()
+
+    assert closed.wait(5)
+
+
+def test_shutdown_rejects_new_runs(make_pipeline):
+    pipeline = make_pipeline([PipelineStage("noop", lambda x: x)])
+    pipeline.shutdown()
+
+    with pytest.raises(RuntimeError):
+        list(pipeline.run(range(3)))
+
+
+def test_source_failure_waits_for_submitted_items(make_pipeline):
+    finished = []
+
+    def source():
+        yield from range(3)
+        raise RuntimeError("read failed")
+
+    def persist(value):
+        time.sleep(0.05)
+        finished.append(value)
+        return value
+
+    pipeline = make_pipeline([PipelineStage("persist", persist, ordered=True)])
+
+    with pytest.raises(RuntimeError, match="read failed"):
+        list(pipeline.run(source()))
+    assert finished == [0, 1, 2]
+
+
+def test_ordered_stage_failure_stops_later_items(make_pipeline):
+    persisted = []
+
+    def persist(value):
+        if value == 2:
+            raise ValueError("boom")
+        persisted.append(value)
+        return value
+
+    pipeline = make_pipeline([PipelineStage("persist", persist, ordered=True)], max_in_flight=8)
+
+    with pytest.raises(ValueError, match="boom"):
+        list(pipeline.run(range(8)))
+    time.sleep(0.1)
+    assert persisted == [0, 1]
@@ -10,6 +10,8 @@ CREATE TABLE document (
     type document_type NOT NULL,
     status document_status NOT NULL,
     path VARCHAR(255),
+    content_sha256 CHAR(64),
+    pipeline_key VARCHAR(255),
     created_by BIGINT NOT NULL,
     created_at TIMESTAMP NOT NULL,
     updated_by BIGINT,
@@ -18,14 +20,19 @@ CREATE TABLE document (
     deleted_at TIMESTAMP
 );
 
+CREATE INDEX ix_document_content ON document (content_sha256, pipeline_key) WHERE status = 'done' AND deleted_at IS NULL;
+
 CREATE TABLE fragment (
     id SERIAL PRIMARY KEY,
     document_id BIGINT NOT NULL,
     vector VECTOR,
     embedding_model VARCHAR(255),
     content TEXT NOT NULL,
+    content_tsv TSVECTOR GENERATED ALWAYS AS (to_tsvector('spanish', content)) STORED,
     fragment_index INT NOT NULL,
     chunk_size INT NOT NULL,
+    page_number INT,
+    start_offset INT,
     created_by BIGINT NOT NULL,
     created_at TIMESTAMP NOT NULL,
     updated_by BIGINT,
@@ -35,6 +42,35 @@ CREATE TABLE fragment (
     CONSTRAINT fk_fragment_document_id FOREIGN KEY (document_id) REFERENCES "document"(id)
 );
 
+CREATE INDEX ix_fragment_document_id ON fragment (document_id);
+CREATE INDEX ix_fragment_content_tsv ON fragment USING gin (content_tsv);
+
+CREATE TYPE embedding_space_status AS ENUM ('building', 'ready', 'failed');
+
+CREATE TABLE embedding_space (
+    embedding_model VARCHAR(255) PRIMARY KEY,
+    status embedding_space_status NOT NULL,
+    active BOOLEAN NOT NULL DEFAULT false,
+    processed_fragments BIGINT NOT NULL DEFAULT 0,
+    started_at TIMESTAMP,
+    updated_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    activated_at TIMESTAMP
+);
+
+CREATE UNIQUE INDEX ux_embedding_space_active ON embedding_space (active) WHERE active;
+
+CREATE TABLE fragment_embedding (
+    fragment_id BIGINT NOT NULL,
+    embedding_model VARCHAR(255) NOT NULL,
+    vector VECTOR NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (embedding_model, fragment_id),
+    CONSTRAINT fk_fragment_embedding_fragment_id FOREIGN KEY (fragment_id) REFERENCES fragment(id) ON DELETE CASCADE
+);
+
+CREATE INDEX ix_fragment_embedding_fragment_id ON fragment_embedding (fragment_id);
+
 CREATE TYPE notification_type AS ENUM ('system', 'admin');
 
 CREATE TABLE notification (
@@ -73,6 +109,8 @@ CREATE TABLE document_in_individual_chat (
     CONSTRAINT fk_document_in_individual_chat_individual_chat_id FOREIGN KEY (individual_chat_id) REFERENCES "individual_chat"(id)
 );
 
+CREATE INDEX ix_document_in_individual_chat_individual_chat_id ON document_in_individual_chat (individual_chat_id, document_id);
+
 CREATE TYPE individual_chat_message_sender_type AS ENUM ('system', 'user');
 
 CREATE TABLE individual_chat_message (
@@ -111,6 +149,8 @@ CREATE TABLE document_in_group_chat (
     CONSTRAINT fk_document_in_group_chat_group_chat_id FOREIGN KEY (group_chat_id) REFERENCES "group_chat"(id)
 );
 
+CREATE INDEX ix_document_in_group_chat_group_chat_id ON document_in_group_chat (group_chat_id, document_id);
+
 CREATE TYPE group_chat_message_sender_type AS ENUM ('system', 'user');
 
 CREATE TABLE group_chat_message (